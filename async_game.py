@@ -0,0 +1,412 @@
+"""
+Copyright 2025 Renz Jared Rolle.
+
+Licensed under the GNU General Public License, Version 3 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://github.com/renzjared/egg-roll/blob/main/LICENSE
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+@author Renz Jared Rolle <rgrolle@up.edu.ph>
+"""
+
+import asyncio
+import os
+import sys
+
+from concurrent.futures import Executor
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, TextIO
+
+from egg_roll import EndReason, GameState, validate_moves
+from game_utils import Grid, Move
+from leaderboard_utils import Leaderboard, LeaderboardStore
+from level_format import open_level
+from terminal_utils import (
+    CLEAR_SCREEN, FrameRenderer, FrameScheduler, center_text, color_text, load_localization, merge_changes
+)
+
+EggRollLocalization = dict[str, str | list[str]]
+Tilt = list[dict[tuple[int, int], str]]    # The delta frames of one tilt
+
+
+class InputLines:
+    """The lines typed by a player, read ahead by a task as soon as they arrive.
+
+    Reading ahead lets the game notice input while it is busy animating a tilt.
+
+    Attributes:
+        reader (asyncio.StreamReader): Where the player's input is read from.
+        pending (asyncio.Event): Set while typed lines are waiting to be handled.
+    """
+
+    def __init__(self, reader: asyncio.StreamReader) -> None:
+        """Initializes the input. Reading starts with `start`.
+
+        Args:
+            reader (asyncio.StreamReader): Where the player's input is read from.
+        """
+        self.reader = reader
+        self.pending = asyncio.Event()
+        self._lines: asyncio.Queue[str | None] = asyncio.Queue()
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        """Starts reading lines in the background, if not started yet."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._read())
+
+    def close(self) -> None:
+        """Stops reading lines."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def readline(self) -> str | None:
+        """Waits for the next line typed by the player.
+
+        Returns:
+            str | None: The line, without its line ending, or None once the input has ended.
+        """
+        line = await self._lines.get()
+        if line is None:
+            self._lines.put_nowait(None)    # Every later read also sees the end of the input
+        elif self._lines.empty():
+            self.pending.clear()
+        return line
+
+    async def _read(self) -> None:
+        """Queues every line the player types, marking that input is waiting."""
+        while True:
+            try:
+                data = await self.reader.readline()
+            except (ConnectionError, ValueError):     # Reset connection, or a line too long
+                data = b""
+            line = data.decode("utf-8", errors="replace").rstrip("\r\n") if data else None
+            self._lines.put_nowait(line)
+            self.pending.set()
+            if line is None:
+                return
+
+
+class GameSession:
+    """One game of Egg Roll, played on an asyncio event loop.
+
+    The session runs as three cooperating tasks: one reads the player's input, one
+    steps the engine through the moves entered, and the session itself draws the
+    frames of each tilt as they come. Lines typed during an animation are queued
+    right away and skip the rest of it, like `FrameScheduler.play` does on a terminal.
+    Nothing blocks the event loop, so many sessions can share one: the leaderboard
+    store, which locks and syncs files, is only called from `store_executor`.
+
+    Attributes:
+        filename (str): The path to the level file.
+        input (InputLines): The lines typed by the player.
+        stream (TextIO): Where the game is drawn.
+        renderer (FrameRenderer): Draws the grid on the stream.
+        scheduler (FrameScheduler): Paces the animation of each tilt.
+        loc (EggRollLocalization): The localization of the session.
+        store (LeaderboardStore | None): Where scores are saved. Defaults to `default_store()`.
+        store_executor (Executor | None): Runs the calls to the store, off the event loop.
+            Defaults to the event loop's default executor.
+        opener (Callable[[str], Grid]): Opens the level at the start of every game.
+        game (Grid | None): The game being played, once the session has started.
+    """
+
+    def __init__(
+            self,
+            filename: str,
+            reader: asyncio.StreamReader | InputLines,
+            stream: TextIO | None = None,
+            scheduler: FrameScheduler | None = None,
+            loc: EggRollLocalization | None = None,
+            store: LeaderboardStore | None = None,
+            width: int | None = None,
+            height: int | None = None,
+            opener: Callable[[str], Grid] = open_level,
+            store_executor: Executor | None = None
+    ) -> None:
+        """Initializes the session.
+
+        Args:
+            filename (str): The path to the level file.
+            reader (asyncio.StreamReader | InputLines): Where the player's input is read
+                from. Lines already read ahead are kept when given as InputLines, so one
+                player can go through several sessions.
+            stream (TextIO | None): Where the game is drawn. Defaults to sys.stdout.
+            scheduler (FrameScheduler | None): Paces the animation of each tilt.
+            loc (EggRollLocalization | None): The localization of the session.
+                Defaults to the game's language.
+            store (LeaderboardStore | None): Where scores are saved.
+            width (int | None): The width of the screen. Defaults to the terminal width.
+            height (int | None): The height of the screen. Defaults to the terminal height.
+            opener (Callable[[str], Grid]): Opens the level. Defaults to reading the file.
+            store_executor (Executor | None): Runs the calls to the store. Use a single
+                thread to keep them in order when sessions share a store.
+        """
+        self.filename = filename
+        self.input = reader if isinstance(reader, InputLines) else InputLines(reader)
+        self._owns_input = not isinstance(reader, InputLines)
+        self.stream = stream or sys.stdout
+        self.renderer = FrameRenderer(self.stream, width, height)
+        self.scheduler = scheduler or FrameScheduler()
+        self.loc = loc if loc is not None else load_localization()
+        self.store = store
+        self.opener = opener
+        self.store_executor = store_executor
+        self.game: Grid | None = None
+
+    @property
+    def game_in_progress(self) -> Grid | None:
+        """Grid | None: The game being played, if the player left it before it ended."""
+        game = self.game
+        if game is None or not game.is_present('🥚') or len(game.moves) >= game.max_moves:
+            return None
+        return game
+
+    async def run(self) -> GameState:
+        """Plays the level until the player leaves it.
+
+        Returns:
+            GameState: RETURN if the player asked for the main menu (or declined to play
+            again), or TERMINATE if they asked to exit or their input ended.
+        """
+        self.input.start()
+        try:
+            while True:
+                outcome = await self._play_level()
+                if isinstance(outcome, EndReason):
+                    outcome = await self._finish(outcome)
+                if outcome != GameState.RESTART:
+                    return outcome
+        finally:
+            if self._owns_input:
+                self.input.close()
+
+    async def _play_level(self) -> EndReason | GameState:
+        """Plays the level once, from its initial state.
+
+        Returns:
+            EndReason | GameState: Why the game ended, or the command the player entered.
+        """
+        game = self.game = self.opener(self.filename)
+        self._draw_grid()
+        while len(game.moves) < game.max_moves:
+            self._write_stats()
+            self._write(str(self.loc["prompt_enter_moves_or_cmd"]))
+            line = await self._read_line()
+            if line is None:
+                return GameState.TERMINATE
+            moveset = validate_moves(line, game.max_moves - len(game.moves))
+            if isinstance(moveset, GameState):
+                return moveset
+
+            if moveset == "u":
+                if game.moves:
+                    game.moves.pop()
+                    game.level_states.undo()
+                self._draw_grid()
+                continue
+
+            self._draw_grid()
+            tilts: asyncio.Queue[Tilt | None] = asyncio.Queue()
+            stepping = asyncio.create_task(self._step(game, moveset, tilts))
+            try:
+                while (tilt := await tilts.get()) is not None:
+                    await self.scheduler.play_async(tilt, self.renderer.update, merge_changes, self.input.pending)
+                await stepping     # Raises any error of the engine
+            finally:
+                stepping.cancel()
+            if not game.is_present('🥚'):
+                return EndReason.NO_MORE_EGGS
+        return EndReason.RAN_OUT_OF_MOVES
+
+    async def _step(self, game: Grid, moveset: str, tilts: "asyncio.Queue[Tilt | None]") -> None:
+        """Rolls the eggs of each move, handing the frames of every tilt to be drawn.
+
+        The engine yields to the event loop after every frame, so other sessions keep
+        running, and hands over each tilt as soon as it is resolved, so the next tilt is
+        rolled while the previous one is being drawn.
+
+        Args:
+            game (Grid): The game being played.
+            moveset (str): The validated moves to play.
+            tilts (asyncio.Queue[Tilt | None]): Receives the frames of each tilt, then None.
+        """
+        try:
+            for m in moveset:
+                game.moves.append(Move(m))
+                tilt: Tilt = []
+                for frame in game.iter_roll(frames="delta"):
+                    tilt.append(frame)
+                    await asyncio.sleep(0)
+                tilts.put_nowait(tilt)
+                if not game.is_present('🥚'):
+                    break
+        finally:
+            tilts.put_nowait(None)
+
+    async def _finish(self, end_reason: EndReason) -> GameState:
+        """Shows the end of the game, saves the player's score and asks to play again.
+
+        Args:
+            end_reason (EndReason): Why the game ended.
+
+        Returns:
+            GameState: RESTART to play again, RETURN for the main menu, or TERMINATE if
+            the player's input ended.
+        """
+        assert self.game is not None
+        width = self.renderer.width
+        self._write_stats(end_reason)
+        self._write(center_text(str(self.loc["prompt_name_leaderboard"]), pad_right=False, width=width))
+        player_name = await self._read_line()
+        if player_name is None:
+            return GameState.TERMINATE
+
+        loop = asyncio.get_running_loop()
+        table = await loop.run_in_executor(self.store_executor, self._save_score, player_name)
+        self._write(f"{CLEAR_SCREEN}{table}\n")
+
+        while True:     # Ask again until the player responds with a valid answer: [y,Y,n,N]
+            self._write(center_text(str(self.loc["prompt_play_again"]), pad_right=False, width=width))
+            response = await self._read_line()
+            if response is None:
+                return GameState.TERMINATE
+            if response.upper() == 'Y':
+                return GameState.RESTART
+            if response.upper() == 'N':
+                return GameState.RETURN
+
+    def _save_score(self, player_name: str) -> str:
+        """Saves the player's score, blocking until the store has recorded it.
+
+        Args:
+            player_name (str): The name the player entered.
+
+        Returns:
+            str: The leaderboard of the level, including the new score.
+        """
+        assert self.game is not None
+        leaderboard = Leaderboard(self.game.name, self.store)
+        leaderboard.update(player_name, self.game.points)
+        return leaderboard.text(self.renderer.width, self.loc)
+
+    async def _read_line(self) -> str | None:
+        """Waits for the next line typed by the player.
+
+        Returns:
+            str | None: The line, or None once the input has ended.
+        """
+        return await self.input.readline()
+
+    def _draw_grid(self) -> None:
+        """Draws the current state of the grid in full."""
+        assert self.game is not None
+        self.renderer.draw(self.game.level_state, f" {self.loc['game_level']}: " + self.filename)
+
+    def _write_stats(self, end_reason: EndReason | None = None) -> None:
+        """Writes the current game statistics below the grid.
+
+        Args:
+            end_reason (EndReason | None): Why the game ended, if it has.
+        """
+        assert self.game is not None
+        game = self.game
+        lines = [
+            str(self.loc["game_previous_moves"]) + ''.join(str(mv) for mv in game.moves),
+            str(self.loc["game_remaining_moves"]) + str(game.max_moves - len(game.moves)),
+            str(self.loc["game_points"]) + str(game.points),
+        ]
+        text = '\n'.join(color_text(line, ["light_yellow"]) for line in lines) + '\n'
+        if end_reason:
+            ended = center_text(str(self.loc[f"game_ended_{end_reason.value}"]), width=self.renderer.width)
+            text += color_text(ended, ["light_yellow"]) + '\n'
+        self._write(text)
+
+    def _write(self, text: str) -> None:
+        """Writes text to the stream in one call, then flushes it."""
+        self.stream.write(text)
+        self.stream.flush()
+
+
+async def run_sessions(sessions: list[GameSession]) -> list[GameState]:
+    """Runs several games at once on the current event loop.
+
+    Args:
+        sessions (list[GameSession]): The games to run.
+
+    Returns:
+        list[GameState]: How each game was left, in the same order.
+    """
+    return list(await asyncio.gather(*(session.run() for session in sessions)))
+
+
+@asynccontextmanager
+async def stdin_reader() -> AsyncIterator[asyncio.StreamReader]:
+    """Reads standard input without blocking the event loop.
+
+    Pipes and terminals are read by the event loop itself. Anything else (a regular
+    file, or a Windows console) is read line by line in a worker thread instead.
+
+    Yields:
+        asyncio.StreamReader: The lines of standard input.
+    """
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader()
+    fd = sys.stdin.fileno()
+    try:
+        transport, _ = await loop.connect_read_pipe(
+            lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+    except (NotImplementedError, ValueError, OSError):
+        async def pump() -> None:
+            while line := await asyncio.to_thread(sys.stdin.readline):
+                reader.feed_data(line.encode("utf-8"))
+            reader.feed_eof()
+
+        pumping = asyncio.create_task(pump())
+        try:
+            yield reader
+        finally:
+            pumping.cancel()
+        return
+
+    try:
+        yield reader
+    finally:
+        transport.close()
+        os.set_blocking(fd, True)   # The pipe transport leaves standard input non-blocking
+
+
+async def play_in_terminal(
+        filename: str,
+        scheduler: FrameScheduler | None = None,
+        game: Grid | None = None
+) -> tuple[GameState, Grid | None]:
+    """Plays a level on the terminal with the asyncio game loop.
+
+    Args:
+        filename (str): The path to the level file.
+        scheduler (FrameScheduler | None): Paces the animation of each tilt.
+        game (Grid | None): A game to continue (e.g. a resumed save), instead of
+            opening the level for the first game.
+
+    Returns:
+        tuple[GameState, Grid | None]: How the player left the game, and the game in
+        progress if they left it before it ended, so that it can be saved.
+    """
+    resumed = [game] if game is not None else []
+
+    def opener(path: str) -> Grid:
+        return resumed.pop() if resumed else open_level(path)
+
+    async with stdin_reader() as reader:
+        session = GameSession(filename, reader, scheduler=scheduler, opener=opener)
+        gamestate = await session.run()
+    return gamestate, session.game_in_progress
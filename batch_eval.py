@@ -0,0 +1,250 @@
+"""
+Copyright 2025 Renz Jared Rolle.
+
+Licensed under the GNU General Public License, Version 3 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://github.com/renzjared/egg-roll/blob/main/LICENSE
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+@author Renz Jared Rolle <rgrolle@up.edu.ph>
+"""
+
+import re
+
+from typing import Any, Sequence
+
+from game_utils import (
+    CompactGrid, EggRollGrid, Grid, Move, calculate_points,
+    GRASS, EGG, EMPTY_NEST, FULL_NEST, PAN
+)
+
+# NumPy is optional. Without it, candidates are scored one by one with the compact engine.
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+BACKENDS: tuple[str, ...] = ("auto", "numpy", "python")
+MOVE_CODES = {"f": 0, "b": 1, "l": 2, "r": 3}
+
+# What an egg runs into while sliding, as tracked by the NumPy sweep
+_BLOCK, _NEST, _PAN = 0, 1, 2
+
+
+def evaluate_many(
+        level: Grid | str,
+        move_strings: Sequence[str],
+        backend: str = "auto"
+) -> tuple[list[int], list[EggRollGrid]]:
+    """Scores many candidate move strings against the same level.
+
+    Each move string is played the way the game would play it: invalid characters are
+    ignored, moves beyond the level's remaining moves are dropped, and play stops once
+    there are no more eggs. The results match playing the moves with `Grid.roll`.
+
+    Args:
+        level (Grid | str): The grid to start from (moves already played on it are kept),
+            or the path to a level file.
+        move_strings (Sequence[str]): The candidate move strings.
+        backend (str): 'numpy' to tilt all candidates at once, 'python' to play them one
+            by one, or 'auto' to use NumPy when it is installed.
+
+    Returns:
+        tuple[list[int], list[EggRollGrid]]: The final points and final grid of each candidate.
+
+    Raises:
+        ValueError: If the backend is unknown, or 'numpy' is requested without NumPy installed.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend: {backend}")
+    if backend == "numpy" and np is None:
+        raise ValueError("The 'numpy' backend requires NumPy to be installed.")
+
+    grid = Grid(filename=level) if isinstance(level, str) else level
+    template = CompactGrid(grid_data=(list(grid._rows()), grid.max_moves))
+    template.points = grid.points
+    template.moves = list(grid.moves)
+
+    remaining = grid.max_moves - len(grid.moves)
+    candidates = [normalize_moves(moves, remaining) for moves in move_strings]
+    if backend == "python" or (backend == "auto" and np is None):
+        return _evaluate_python(template, candidates)
+    return _evaluate_numpy(template, candidates)
+
+
+def normalize_moves(moves: str, remaining_moves: int) -> str:
+    """Keeps the valid moves of a move string, in lowercase, up to the remaining moves.
+
+    Args:
+        moves (str): The move string to normalize.
+        remaining_moves (int): The number of moves that can still be played.
+
+    Returns:
+        str: The normalized move string.
+    """
+    return re.sub(r'[^FfBbLlRr]', '', moves).lower()[:max(remaining_moves, 0)]
+
+
+def _evaluate_python(
+        template: CompactGrid,
+        candidates: list[str]
+) -> tuple[list[int], list[EggRollGrid]]:
+    """Scores each candidate by replaying it on a compact grid.
+
+    Args:
+        template (CompactGrid): The grid every candidate starts from.
+        candidates (list[str]): The normalized move strings.
+
+    Returns:
+        tuple[list[int], list[EggRollGrid]]: The final points and final grid of each candidate.
+    """
+    initial_board = bytes(template.board)
+    initial_moves = template.moves
+    scores, states = [], []
+    for moves in candidates:
+        grid = template
+        grid.board[:] = initial_board
+        grid.moves = list(initial_moves)
+        points = template.points
+        for m in moves:
+            if EGG not in grid.board:
+                break
+            move = Move(m)
+            grid.moves.append(move)
+            points += grid._slide_to_rest(move)[0]
+        scores.append(points)
+        states.append(grid.copy_grid())     # The board is reused by the next candidate
+    template.board[:] = initial_board
+    template.moves = initial_moves
+    return scores, states
+
+
+def _evaluate_numpy(
+        template: CompactGrid,
+        candidates: list[str]
+) -> tuple[list[int], list[EggRollGrid]]:
+    """Scores all candidates at once, holding every board in a single NumPy array.
+
+    At each move index, the candidates are grouped by tilt direction. Each group is
+    oriented so that it tilts towards row 0, then swept once from the leading edge,
+    which moves every egg of every board in the group straight to where it stops.
+
+    Args:
+        template (CompactGrid): The grid every candidate starts from.
+        candidates (list[str]): The normalized move strings.
+
+    Returns:
+        tuple[list[int], list[EggRollGrid]]: The final points and final grid of each candidate.
+    """
+    count = len(candidates)
+    initial = np.frombuffer(bytes(template.board), dtype=np.uint8)
+    boards = np.tile(initial.reshape(1, template.rows, template.cols), (count, 1, 1))
+    points = np.full(count, template.points, dtype=np.int64)
+
+    longest = max((len(moves) for moves in candidates), default=0)
+    move_codes = np.full((count, longest), -1, dtype=np.int8)
+    for i, moves in enumerate(candidates):
+        move_codes[i, :len(moves)] = [MOVE_CODES[m] for m in moves]
+
+    scoring_moves = list(template.moves)
+    for t in range(longest):
+        scoring_moves.append(Move('f'))    # Only the number of moves matters for scoring
+        nest_points = calculate_points(template.max_moves, scoring_moves)
+        has_eggs = (boards == EGG).any(axis=(1, 2))
+        for code in range(4):
+            group = np.nonzero(has_eggs & (move_codes[:, t] == code))[0]
+            if group.size == 0:
+                continue
+            group_boards = boards[group]
+            tilted = _orient(group_boards, code)
+            groups, length, lines = tilted.shape
+            # Lay every line of every board side by side, with the tilt axis first
+            swept = np.ascontiguousarray(tilted.transpose(1, 0, 2)).reshape(length, groups * lines)
+            line_points = _sweep(swept, nest_points)
+            points[group] += line_points.reshape(groups, lines).sum(axis=1)
+            tilted[...] = swept.reshape(length, groups, lines).transpose(1, 0, 2)
+            boards[group] = group_boards
+
+    # Many candidates end on the same board, so each distinct board is only rendered once
+    palette = template.palette
+    rendered: dict[bytes, EggRollGrid] = {}
+    states = []
+    for board in boards:
+        key = board.tobytes()
+        if key not in rendered:
+            rendered[key] = [[palette[code] for code in row] for row in board.tolist()]
+        states.append([row[:] for row in rendered[key]])
+    return points.tolist(), states
+
+
+def _orient(boards: Any, move_code: int) -> Any:
+    """Returns a view of the boards in which the tilt goes towards row 0.
+
+    Args:
+        boards (numpy.ndarray): The boards, shaped (candidates, rows, cols).
+        move_code (int): The tilt direction, as a value of MOVE_CODES.
+
+    Returns:
+        numpy.ndarray: A writable view of the boards.
+    """
+    if move_code == MOVE_CODES["f"]:
+        return boards
+    if move_code == MOVE_CODES["b"]:
+        return boards[:, ::-1, :]
+    if move_code == MOVE_CODES["l"]:
+        return boards.transpose(0, 2, 1)
+    return boards.transpose(0, 2, 1)[:, ::-1, :]
+
+
+def _sweep(lines: Any, nest_points: int) -> Any:
+    """Tilts lines of cells towards index 0, moving every egg straight to where it stops.
+
+    Cells are visited from the leading edge, so eggs are resolved in the same collision
+    order as `Grid._find_eggs`. For every line, the sweep keeps track of the nearest cell
+    an egg would run into: a blocker (wall, full nest, resting egg, or the edge of the
+    grid), an empty nest, or a frying pan.
+
+    Args:
+        lines (numpy.ndarray): The lines to tilt, shaped (length, lines). Updated in place.
+        nest_points (int): The points earned by each egg that fills a nest.
+
+    Returns:
+        numpy.ndarray: The change in points of each line.
+    """
+    length, count = lines.shape
+    stop = np.full(count, -1, dtype=np.int64)
+    kind = np.full(count, _BLOCK, dtype=np.uint8)
+    points = np.zeros(count, dtype=np.int64)
+
+    for i in range(length):
+        cell = lines[i]
+        eggs = cell == EGG
+        static = ~eggs & (cell != GRASS)
+        nests = cell == EMPTY_NEST
+        pans = cell == PAN
+
+        if eggs.any():
+            cell[eggs] = GRASS
+            fill = np.nonzero(eggs & (kind == _NEST))[0]
+            lines[stop[fill], fill] = FULL_NEST
+            kind[fill] = _BLOCK
+            points[fill] += nest_points
+            points[eggs & (kind == _PAN)] -= 5
+            rest = np.nonzero(eggs & (kind == _BLOCK))[0]
+            rest = rest[~np.isin(rest, fill)]
+            stop[rest] += 1
+            lines[stop[rest], rest] = EGG
+
+        stop[static] = i
+        kind[static] = _BLOCK
+        kind[nests] = _NEST
+        kind[pans] = _PAN
+
+    return points
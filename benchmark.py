@@ -0,0 +1,297 @@
+"""
+Copyright 2025 Renz Jared Rolle.
+
+Licensed under the GNU General Public License, Version 3 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://github.com/renzjared/egg-roll/blob/main/LICENSE
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+@author Renz Jared Rolle <rgrolle@up.edu.ph>
+"""
+
+import argparse
+import json
+import platform
+import random
+import subprocess
+import time
+import tracemalloc
+
+from datetime import datetime, timezone
+from typing import Any, Callable
+
+from game_utils import ENGINES, Grid, Move
+from terminal_utils import create_table
+
+SIZES: tuple[int, ...] = (15, 50, 100, 250, 500, 1000)
+DENSITIES: tuple[float, ...] = (0.02, 0.1, 0.4)    # Share of cells holding an egg
+OPERATIONS: tuple[str, ...] = ("roll_step", "roll_slide", "apply_move", "find_eggs", "copy_grid")
+BenchmarkResult = dict[str, Any]
+
+
+def generate_level(rows: int, cols: int, egg_density: float, seed: int = 0) -> list[str]:
+    """Generates a reproducible level for benchmarking.
+
+    The level is surrounded by walls. Inside, each cell is an egg with probability
+    `egg_density`; nests, pans and walls are scattered among the remaining cells.
+
+    Args:
+        rows (int): The number of rows of the level.
+        cols (int): The number of columns of the level.
+        egg_density (float): The probability that an inner cell holds an egg.
+        seed (int): The seed of the random generator.
+
+    Returns:
+        list[str]: The rows of the level.
+    """
+    rng = random.Random(f"{rows}x{cols}:{egg_density}:{seed}")
+    others = ['🟩'] * 14 + ['🪹', '🍳', '🧱', '🪺']
+    level = ['🧱' * cols]
+    for _ in range(rows - 2):
+        inner = ''.join(
+            '🥚' if rng.random() < egg_density else rng.choice(others)
+            for _ in range(cols - 2)
+        )
+        level.append('🧱' + inner + '🧱')
+    level.append('🧱' * cols)
+    return level
+
+
+def run_benchmarks(
+        sizes: tuple[int, ...] = SIZES,
+        densities: tuple[float, ...] = DENSITIES,
+        engines: tuple[str, ...] = ENGINES,
+        operations: tuple[str, ...] = OPERATIONS,
+        time_budget: float = 1.0,
+        max_step_cells: int = 250_000,
+) -> list[BenchmarkResult]:
+    """Measures the throughput and peak memory of the grid engine operations.
+
+    Args:
+        sizes (tuple[int, ...]): The side lengths of the square levels to generate.
+        densities (tuple[float, ...]): The egg densities of the generated levels.
+        engines (tuple[str, ...]): The grid engines to measure.
+        operations (tuple[str, ...]): The operations to measure (see OPERATIONS).
+        time_budget (float): The number of seconds to spend repeating each operation.
+        max_step_cells (int): The largest level (in cells) on which step-by-step rolls
+            are measured. A single step-by-step roll on larger levels takes minutes.
+
+    Returns:
+        list[BenchmarkResult]: One result per level, engine and operation.
+    """
+    results = []
+    for size in sizes:
+        for density in densities:
+            level = generate_level(size, size, density)
+            eggs = sum(row.count('🥚') for row in level)
+            for engine in engines:
+                for operation in operations:
+                    result: BenchmarkResult = {
+                        "size": size, "density": density, "eggs": eggs,
+                        "engine": engine, "operation": operation,
+                    }
+                    if operation == "roll_step" and size * size > max_step_cells:
+                        result["skipped"] = True
+                    else:
+                        result.update(_measure(level, engine, operation, time_budget))
+                    results.append(result)
+    return results
+
+
+def _measure(level: list[str], engine: str, operation: str, time_budget: float) -> BenchmarkResult:
+    """Times an operation on a fresh grid, then measures its peak memory separately.
+
+    Args:
+        level (list[str]): The rows of the level.
+        engine (str): The grid engine to use.
+        operation (str): The operation to measure.
+        time_budget (float): The number of seconds to spend repeating the operation.
+
+    Returns:
+        BenchmarkResult: The iterations, time spent, rates and peak memory of the operation.
+        Moves per second are only reported for rolls, and steps per second for rolls and
+        single steps.
+    """
+    grid = Grid(grid_data=(level, 10**6), engine=engine)
+    run = _operation(grid, operation)
+
+    iterations = steps = 0
+    elapsed = 0.0
+    while iterations == 0 or elapsed < time_budget:
+        # Restart the level once every egg is gone, so that each move still does some work
+        if not grid.is_present('🥚'):
+            grid._load_rows(level)
+        start = time.perf_counter()
+        steps += run(iterations)
+        elapsed += time.perf_counter() - start
+        iterations += 1
+
+    # Tracing allocations slows everything down, so memory is measured on its own run
+    grid = Grid(grid_data=(level, 10**6), engine=engine)
+    run = _operation(grid, operation)
+    tracemalloc.start()
+    run(0)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    rolls = operation.startswith("roll_")
+    return {
+        "iterations": iterations,
+        "seconds": elapsed,
+        "calls_per_sec": iterations / elapsed,
+        "moves_per_sec": iterations / elapsed if rolls else None,
+        "steps_per_sec": steps / elapsed if rolls or operation == "apply_move" else None,
+        "peak_memory_bytes": peak,
+    }
+
+
+def _operation(grid: Grid, operation: str) -> Callable[[int], int]:
+    """Builds a callable that performs one iteration of an operation on a grid.
+
+    Args:
+        grid (Grid): The grid to operate on.
+        operation (str): The operation to perform.
+
+    Returns:
+        Callable[[int], int]: Takes the iteration number and returns the number of
+        steps it performed (one per call for operations that are not rolls).
+    """
+    moves = [Move(m) for m in "lfrb"]
+
+    def roll(iteration: int, resolution: str) -> int:
+        grid.moves.append(moves[iteration % 4])
+        return len(grid.roll(resolution=resolution)) - 1
+
+    def apply_move(iteration: int) -> int:
+        grid.moves.append(moves[iteration % 4])
+        grid._apply_move(moves[iteration % 4])
+        return 1
+
+    def find_eggs(iteration: int) -> int:
+        grid._find_eggs(moves[iteration % 4])
+        return 1
+
+    def copy_grid(iteration: int) -> int:
+        grid.copy_grid()
+        return 1
+
+    operations: dict[str, Callable[[int], int]] = {
+        "roll_step": lambda i: roll(i, "step"),
+        "roll_slide": lambda i: roll(i, "slide"),
+        "apply_move": apply_move,
+        "find_eggs": find_eggs,
+        "copy_grid": copy_grid,
+    }
+    if operation not in operations:
+        raise ValueError(f"Unknown operation: {operation}")
+    return operations[operation]
+
+
+def current_commit() -> str | None:
+    """Returns the hash of the checked-out git commit, if any."""
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return completed.stdout.strip()
+
+
+def summary_table(results: list[BenchmarkResult], baseline: list[BenchmarkResult] | None = None) -> str:
+    """Formats benchmark results as a table, optionally compared to a previous run.
+
+    Args:
+        results (list[BenchmarkResult]): The results to display.
+        baseline (list[BenchmarkResult] | None): Results of a previous run to compare against.
+
+    Returns:
+        str: The formatted table.
+    """
+    def key(result: BenchmarkResult) -> tuple[Any, ...]:
+        return (result["size"], result["density"], result["engine"], result["operation"])
+
+    previous = {key(result): result for result in baseline or []}
+    headers: list[str | list[str]] = [
+        "Size", "Density", "Engine", "Operation", "Calls/s", "Moves/s", "Steps/s", "Peak KiB"
+    ]
+    if baseline is not None:
+        headers.append("Speedup")
+
+    data: list[list[str | int]] = []
+    for result in results:
+        row: list[str | int] = [f"{result['size']}x{result['size']}", str(result["density"]),
+                                result["engine"], result["operation"]]
+        if result.get("skipped"):
+            row += ["skipped", "-", "-", "-"]
+        else:
+            row += [
+                f"{result[rate]:.1f}" if result[rate] is not None else "-"
+                for rate in ("calls_per_sec", "moves_per_sec", "steps_per_sec")
+            ]
+            row.append(str(result["peak_memory_bytes"] // 1024))
+        if baseline is not None:
+            old = previous.get(key(result))
+            if old and not old.get("skipped") and not result.get("skipped"):
+                row.append(f"{result['calls_per_sec'] / old['calls_per_sec']:.2f}x")
+            else:
+                row.append("-")
+        data.append(row)
+    return create_table(data, headers, "Egg Roll Engine Benchmarks")
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Runs the benchmark suite and saves the results as JSON.
+
+    Args:
+        argv (list[str] | None): The command-line arguments. Defaults to sys.argv[1:].
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the Egg Roll grid engines.")
+    parser.add_argument("--sizes", default=",".join(map(str, SIZES)),
+                        help="comma-separated side lengths of the generated levels")
+    parser.add_argument("--densities", default=",".join(map(str, DENSITIES)),
+                        help="comma-separated egg densities of the generated levels")
+    parser.add_argument("--engines", default=",".join(ENGINES), help="comma-separated engines")
+    parser.add_argument("--operations", default=",".join(OPERATIONS), help="comma-separated operations")
+    parser.add_argument("--time-budget", type=float, default=1.0,
+                        help="seconds spent repeating each operation (default: 1.0)")
+    parser.add_argument("--max-step-cells", type=int, default=250_000,
+                        help="largest level, in cells, on which step-by-step rolls are measured")
+    parser.add_argument("--output", default="benchmark_results.json", help="where to save the results")
+    parser.add_argument("--compare", metavar="RESULTS", help="results of a previous run to compare against")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(
+        sizes=tuple(int(size) for size in args.sizes.split(",")),
+        densities=tuple(float(density) for density in args.densities.split(",")),
+        engines=tuple(args.engines.split(",")),
+        operations=tuple(args.operations.split(",")),
+        time_budget=args.time_budget,
+        max_step_cells=args.max_step_cells,
+    )
+    report = {
+        "commit": current_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=4)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as file:
+            baseline = json.load(file)["results"]
+    print(summary_table(results, baseline))
+
+
+if __name__ == "__main__":
+    main()
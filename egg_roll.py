@@ -16,22 +16,32 @@ limitations under the License.
 @author Renz Jared Rolle <rgrolle@up.edu.ph>
 """
 
-import copy
+import argparse
+import asyncio
+import json
 import re
 import sys
 import time
 
 from enum import Enum
+from typing import Any
 
+import instrumentation
 from game_utils import Move, Grid
+from level_format import open_level
 from main_menu import display_main_menu
 from terminal_utils import (
-    center_text, clear_screen, terminal_dimensions, print_format, load_localization
+    FRAME_BUDGET, TILT_DURATION, FrameRenderer, FrameScheduler, center_text, clear_screen,
+    merge_changes, print_format, load_localization
 )
 from leaderboard_utils import Leaderboard
+from save_state import delete_save, has_save, load_game, save_game
 
 EggRollLocalization = dict[str, str | list[str]]
 
+renderer = FrameRenderer()    # Draws the grid, redrawing only changed cells while animating
+scheduler = FrameScheduler()  # Paces the animation of each tilt (configured from the command line)
+
 
 class GameState(Enum):
     """Enumeration for special game commands that control game flow.
@@ -67,19 +77,19 @@ def main(filename: str) -> None:
         filename (str): The path to the file containing the game level.
     """
     # Read game level file
-    game = Grid(filename=filename)
+    game = open_level(filename)    # Text (.in) or packed level
+    if has_save(filename):
+        game = resume_game(filename, game.engine) or game
+    display_grid(game.level_state, game.name)     # Undoing a move redraws the grid itself
 
     # Display game prompt until the maximum number of moves is reached
     while len(game.moves) < game.max_moves:
-        if not game.moves:
-            display_grid(game.level_state, game.name)
-
         display_stats(game)
         remaining_moves: int = game.max_moves - len(game.moves)
         moveset: str | GameState = take_moves(remaining_moves)
 
         if isinstance(moveset, GameState):    # Checks if the player entered a special command
-            update_game(moveset, filename)    # instead of a moveset
+            update_game(moveset, filename, game)    # instead of a moveset
             return
 
         if moveset == "u":                    # Undo latest move
@@ -89,21 +99,60 @@ def main(filename: str) -> None:
                 move = Move(m)
                 game.moves.append(move)
 
-                snapshots = game.roll()
-                for snapshot in snapshots:     # Print each snapshot with a 0.3s delay
-                    display_grid(snapshot, filename)
-                    time.sleep(0.3)
-
-                # Keep track of level states and cumulative points per move played
-                game.level_states.append((copy.deepcopy(snapshots[-1]), game.points))
+                # Animate the tilt, only redrawing the cells that changed in each frame.
+                # The grid records the move in its undo journal (level_states) as it rolls.
+                display_grid(game.level_state, filename)
+                scheduler.play(game.iter_roll(frames="delta"), renderer.update, merge_changes)
 
                 if not game.is_present('🥚'):
+                    delete_save(filename)       # A finished game cannot be resumed
                     display_stats(game, EndReason.NO_MORE_EGGS)
                     return
 
+    delete_save(filename)
     display_stats(game, EndReason.RAN_OUT_OF_MOVES)
 
 
+def main_async(filename: str) -> None:
+    """Runs Egg Roll on a level with the asyncio game loop (see `async_game`).
+
+    Like `main`, it offers to resume the saved game of the level, and the game is saved
+    if the player leaves it before it ends.
+
+    Args:
+        filename (str): The path to the file containing the game level.
+    """
+    from async_game import play_in_terminal     # Use local import to avoid circular imports
+    resumed = resume_game(filename) if has_save(filename) else None
+    gamestate, game = asyncio.run(play_in_terminal(filename, scheduler, resumed))
+    if game is None:
+        delete_save(filename)       # A finished game cannot be resumed
+    update_game(gamestate, filename, game)
+
+
+def resume_game(filename: str, engine: str = "emoji") -> Grid | None:
+    """Asks the player whether to resume the saved game of a level.
+
+    The save is deleted if the player declines, or if it cannot be resumed.
+
+    Args:
+        filename (str): The path to the level file.
+        engine (str): The board representation of the resumed game ('emoji' or 'compact').
+
+    Returns:
+        Grid | None: The saved game, or None to start over.
+    """
+    loc: EggRollLocalization = load_localization()
+    while True:     # Ask again until the player responds with a valid answer: [y,Y,n,N]
+        response: str = input(center_text(str(loc["prompt_resume_game"]), pad_right=False))
+        if response.upper() in ('Y', 'N'):
+            break
+    game = load_game(filename, engine) if response.upper() == 'Y' else None
+    if game is None:
+        delete_save(filename)
+    return game
+
+
 def undo_last_move(game: Grid) -> None:
     """Undoes the last move made by the player.
 
@@ -112,8 +161,7 @@ def undo_last_move(game: Grid) -> None:
     """
     if game.moves:
         game.moves.pop()
-        game.level_states.pop()
-        game.level_state, game.points = game.level_states[-1]
+        game.level_states.undo()    # Applies the last move's changes in reverse
         display_grid(game.level_state, game.name)
 
 
@@ -125,16 +173,7 @@ def display_grid(level_state: list[list[str]], filename: str) -> None:
         filename (str): The name of the level file being played.
     """
     loc = load_localization()
-    _, cols = terminal_dimensions()
-    div: str = "═" * cols
-    clear_screen()
-    print_format(div, is_centered=True)
-    print_format(f" {loc['game_level']}: " + filename, is_centered=False, args=["green"])
-    print_format(div + "\n\n", is_centered=True)
-
-    grid = "\n".join(''.join(row) for row in level_state)
-    print_format(grid + "\n ", is_centered=True)
-    print_format(div, is_centered=True)
+    renderer.draw(level_state, f" {loc['game_level']}: " + filename)
 
 
 def display_stats(game: Grid, end_reason: EndReason | None = None) -> None:
@@ -193,19 +232,35 @@ def display_stats(game: Grid, end_reason: EndReason | None = None) -> None:
                 display_main_menu()     # Go back to main menu
 
 
-def update_game(gamestate: GameState, filename: str) -> None:
+def update_game(gamestate: GameState, filename: str, game: Grid | None = None) -> None:
     """Updates the game based on the player's input.
 
+    A game in progress is saved when the player returns to the main menu or exits,
+    and its save is discarded when the player restarts it, or leaves it without moves
+    (e.g. after undoing every move of a resumed game).
+
     Args:
         gamestate (GameState): The gamestate command to be made.
         filename (str): The name of the level being played.
+        game (Grid | None): The game in progress, if any.
     """
+    loc: EggRollLocalization = load_localization()
+    if game is not None and gamestate != GameState.RESTART:
+        try:
+            if game.moves:
+                save_game(game, filename)
+                print_format(f"\n{loc['game_saved']}", True, args=['light_yellow'])
+            else:
+                delete_save(filename)   # Nothing left to resume
+        except OSError as e:
+            print_format(f"\n{loc['error_game_not_saved']}".format(error=e), True, args=["red"])
+
     if gamestate == GameState.RESTART:
+        delete_save(filename)
         main(filename)
     elif gamestate == GameState.RETURN:
         display_main_menu()
     elif gamestate == GameState.TERMINATE:
-        loc: EggRollLocalization = load_localization()
         print_format(f"\n{loc['exit_goodbye']}\n", True, args=['magenta', None, ('bold',)])
         time.sleep(1)
         clear_screen()
@@ -259,11 +314,128 @@ def take_moves(remaining_moves: int) -> str | GameState:
     return validate_moves(moveset, remaining_moves)
 
 
+def replay(filename: str, moveset: str) -> dict[str, Any]:
+    """Plays a recorded move string on a level at full speed, without displaying anything.
+
+    The moves are validated like player input, and every tilt is resolved straight to
+    its final grid using the compact engine.
+
+    Args:
+        filename (str): The path to the level file.
+        moveset (str): The recorded moves.
+
+    Returns:
+        dict[str, Any]: The level name, moves played, final points, remaining moves, end
+        reason (or None if the game is still in progress), and the final grid as a list of rows.
+    """
+    game = open_level(filename, engine="compact")
+    moves = validate_moves(moveset, game.max_moves)
+    if not isinstance(moves, str) or moves == "u":  # Commands are not part of a recording
+        moves = ""
+
+    end_reason: EndReason | None = None
+    for m in moves.lower():
+        game.moves.append(Move(m))
+        for _ in game.iter_roll(frames="delta", skip_intermediate=True):
+            pass
+        if not game.is_present('🥚'):
+            end_reason = EndReason.NO_MORE_EGGS
+            break
+    if end_reason is None and len(game.moves) >= game.max_moves:
+        end_reason = EndReason.RAN_OUT_OF_MOVES
+
+    return {
+        "level": game.name,
+        "moves": ''.join(move.move_string for move in game.moves),
+        "points": game.points,
+        "remaining_moves": game.max_moves - len(game.moves),
+        "end_reason": end_reason.value if end_reason else None,
+        "grid": [''.join(row) for row in game.level_state],
+    }
+
+
+def print_replay(result: dict[str, Any], as_json: bool = False) -> None:
+    """Prints the outcome of a replayed game.
+
+    Args:
+        result (dict[str, Any]): The outcome returned by `replay`.
+        as_json (bool): Whether to print the outcome as a single line of JSON.
+    """
+    if as_json:
+        print(json.dumps(result, ensure_ascii=False))
+        return
+
+    loc: EggRollLocalization = load_localization()
+    print('\n'.join(result["grid"]))
+    print(str(loc["game_points"]) + str(result["points"]))
+    if result["end_reason"]:
+        print(str(loc[f"game_ended_{result['end_reason']}"]))
+    else:
+        print(str(loc["game_remaining_moves"]) + str(result["remaining_moves"]))
+
+
+def parse_arguments(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parses the command-line arguments of Egg Roll.
+
+    Args:
+        argv (list[str] | None): The command-line arguments. Defaults to sys.argv[1:].
+
+    Returns:
+        argparse.Namespace: The parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description="Egg Roll: tilt the grid to roll the eggs into their nests.")
+    parser.add_argument("level", nargs="?", help="level file to play (opens the main menu if omitted)")
+    parser.add_argument(
+        "--replay", metavar="MOVES",
+        help="play MOVES on the level at full speed and only print the outcome"
+    )
+    parser.add_argument(
+        "--headless", action="store_true",
+        help="replay one move string per line of standard input (implied by --replay)"
+    )
+    parser.add_argument("--json", action="store_true", help="print replay outcomes as JSON lines")
+    parser.add_argument(
+        "--tilt-duration", type=float, default=TILT_DURATION, metavar="SECONDS",
+        help=f"time spent animating each tilt (default: {TILT_DURATION})"
+    )
+    parser.add_argument(
+        "--frame-budget", type=float, default=FRAME_BUDGET, metavar="SECONDS",
+        help=f"shortest time a frame stays on screen (default: {FRAME_BUDGET:.3f})"
+    )
+    parser.add_argument("--instant", action="store_true", help="skip tilt animations")
+    parser.add_argument(
+        "--async", dest="use_async", action="store_true",
+        help="play the level with the asyncio game loop, which reads input while animating"
+    )
+    parser.add_argument(
+        "--profile", nargs="?", const=instrumentation.REPORT_FILE, metavar="FILE",
+        help="count and time the engine's hot paths, and write a JSON report to FILE on exit "
+             f"(default: {instrumentation.REPORT_FILE}; also enabled by {instrumentation.ENV_VAR})"
+    )
+    args = parser.parse_args(argv)
+    if (args.replay is not None or args.headless) and not args.level:
+        parser.error("a level file is required to replay moves")
+    return args
+
+
 if __name__ == "__main__":
-    # Check if the player included a level filename argument
-    # If not, the main menu is displayed
-    if len(sys.argv) > 1:
-        LEVEL_FILENAME = str(sys.argv[1])
-        main(LEVEL_FILENAME)
+    arguments = parse_arguments()
+    if arguments.profile:
+        instrumentation.enable(arguments.profile)
+    else:
+        instrumentation.enable_from_environment()
+    scheduler.tilt_duration = arguments.tilt_duration
+    scheduler.frame_budget = arguments.frame_budget
+    scheduler.instant = arguments.instant
+    if arguments.replay is not None:
+        print_replay(replay(arguments.level, arguments.replay), arguments.json)
+    elif arguments.headless:
+        for line in sys.stdin:
+            print_replay(replay(arguments.level, line.strip()), arguments.json)
+    elif arguments.level and arguments.use_async:
+        main_async(arguments.level)
+    elif arguments.level:
+        # If the player included a level filename argument, that level is played
+        main(arguments.level)
     else:
         display_main_menu()
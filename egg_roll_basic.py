@@ -16,15 +16,14 @@ limitations under the License.
 @author Renz Jared Rolle <rgrolle@up.edu.ph>
 """
 
-import copy
-import os
 import re
-import subprocess
 import sys
-import time
 
 from game_utils import Move, Grid
 from leaderboard_utils import Leaderboard
+from terminal_utils import FrameScheduler, clear_screen
+
+scheduler = FrameScheduler()    # Paces the animation of each tilt
 
 
 def main(filename: str) -> None:
@@ -53,13 +52,9 @@ def main(filename: str) -> None:
             move = Move(m)
             game.moves.append(move)
 
-            snapshots = game.roll()
-            for snapshot in snapshots:     # Print each snapshot with a 0.3s delay
-                display_grid(snapshot)
-                time.sleep(0.3)
-
-            # Keep track of level states and cumulative points per move played
-            game.level_states.append((copy.deepcopy(snapshots[-1]), game.points))
+            snapshots = game.roll()         # Also records the move in game.level_states
+            display_grid(snapshots[0])
+            scheduler.play(snapshots[1:], display_grid)   # Every tilt takes the same time
 
             if not game.is_present('🥚'):  # Check if there are eggs left
                 display_stats(game, is_final=True)
@@ -68,13 +63,6 @@ def main(filename: str) -> None:
     display_stats(game, is_final=True)
 
 
-def clear_screen() -> None:
-    """Clears the terminal screen, if any"""
-    if sys.stdout.isatty():
-        clear_cmd = 'cls' if os.name == 'nt' else 'clear'
-    subprocess.run([clear_cmd])
-
-
 def display_grid(level_state: list[list[str]]) -> None:
     """Displays the current state of the game grid on the terminal.
 
@@ -0,0 +1,386 @@
+"""
+Copyright 2025 Renz Jared Rolle.
+
+Licensed under the GNU General Public License, Version 3 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://github.com/renzjared/egg-roll/blob/main/LICENSE
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+@author Renz Jared Rolle <rgrolle@up.edu.ph>
+"""
+
+import argparse
+import asyncio
+import io
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterable
+
+from async_game import GameSession, InputLines
+from egg_roll import GameState, validate_moves
+from game_utils import Grid
+from leaderboard_utils import LeaderboardStore, default_store
+from level_format import open_level
+from level_index import LevelIndex
+from terminal_utils import (
+    CLEAR_SCREEN, FRAME_BUDGET, LOCALIZATION_DIR, SETTINGS_FILE, TILT_DURATION, FrameScheduler,
+    center_text, color_text, create_table, load_localization
+)
+
+EggRollLocalization = dict[str, str | list[str]]
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 4321
+SCREEN_WIDTH = 80       # Telnet clients do not report their size, so a common one is assumed
+SCREEN_HEIGHT = 24
+BACKLOG = 1024          # Connections waiting to be accepted (asyncio's default of 100 overflows under bursts)
+
+
+class LevelCache:
+    """The parsed levels served to every session, shared read-only.
+
+    Every level is read once, when the cache is built. Each game gets its own compact
+    Grid, built from the cached rows, so the cache itself never changes afterwards.
+    """
+
+    def __init__(self, paths: Iterable[str | Path]) -> None:
+        """Reads the levels.
+
+        Args:
+            paths (Iterable[str | Path]): The level files (text or packed). Levels are
+                named after their file name, which must be unique.
+        """
+        self._levels: dict[str, tuple[tuple[str, ...], int]] = {}
+        for path in paths:
+            grid = open_level(str(path))
+            self._levels[Path(path).name] = (tuple(''.join(row) for row in grid.level_state), grid.max_moves)
+
+    @classmethod
+    def from_directory(cls, directory: str | Path = "") -> "LevelCache":
+        """Reads every level in a directory, as listed by its level index.
+
+        Args:
+            directory (str | Path): The directory holding the level files.
+
+        Returns:
+            LevelCache: The levels of the directory.
+        """
+        index = LevelIndex(directory)
+        index.refresh()
+        return cls(info.path for info in index.search())
+
+    def __len__(self) -> int:
+        """Returns the number of levels."""
+        return len(self._levels)
+
+    def names(self) -> list[str]:
+        """Returns the names of the levels, in the order they were read."""
+        return list(self._levels)
+
+    def open(self, name: str) -> Grid:
+        """Starts a new game of a level.
+
+        Args:
+            name (str): The name of the level.
+
+        Returns:
+            Grid: The level in its initial state, on the compact engine.
+
+        Raises:
+            KeyError: If there is no level with that name.
+        """
+        rows, max_moves = self._levels[name]
+        return Grid(grid_data=(list(rows), max_moves), filename=name, engine="compact")
+
+    def table_rows(self) -> list[list[str | int]]:
+        """Returns the number, name, size and maximum moves of every level, for `create_table`."""
+        return [
+            [number, name, f"{len(rows)} x {max((len(row) for row in rows), default=0)}", max_moves]
+            for number, (name, (rows, max_moves)) in enumerate(self._levels.items(), 1)
+        ]
+
+
+class ConnectionStream(io.TextIOBase):
+    """Buffers the output of one connection, sending everything written since the last
+    flush in a single write.
+
+    Line endings are sent as CRLF, as telnet clients expect.
+
+    Attributes:
+        writer (asyncio.StreamWriter): The connection.
+        bytes_sent (int): The number of bytes sent so far.
+    """
+
+    def __init__(self, writer: asyncio.StreamWriter) -> None:
+        """Initializes the stream.
+
+        Args:
+            writer (asyncio.StreamWriter): The connection.
+        """
+        super().__init__()
+        self.writer = writer
+        self.bytes_sent = 0
+        self._buffer: list[str] = []
+
+    def writable(self) -> bool:
+        """Returns True: the stream can be written to."""
+        return True
+
+    def write(self, text: str) -> int:
+        """Adds text to the buffer.
+
+        Args:
+            text (str): The text to send.
+
+        Returns:
+            int: The number of characters written.
+        """
+        self._buffer.append(text)
+        return len(text)
+
+    def flush(self) -> None:
+        """Sends the buffered text to the connection, unless it is closing."""
+        if self._buffer and not self.writer.is_closing():
+            data = ''.join(self._buffer).replace('\n', '\r\n').encode("utf-8")
+            self.writer.write(data)
+            self.bytes_sent += len(data)
+        self._buffer.clear()
+
+    async def drain(self) -> None:
+        """Sends the buffered text, then waits until the client has caught up."""
+        self.flush()
+        await self.writer.drain()
+
+
+class ServerSession(GameSession):
+    """A game played by a client of the server.
+
+    Before waiting for input, the session waits for the client to receive everything
+    sent so far, so a slow client cannot make the server buffer frames without limit.
+    """
+
+    async def _read_line(self) -> str | None:
+        """Waits for the client to catch up, then for the next line it sends.
+
+        Returns:
+            str | None: The line, or None once the connection has closed.
+        """
+        assert isinstance(self.stream, ConnectionStream)
+        await self.stream.drain()
+        return await super()._read_line()
+
+
+class GameServer:
+    """Hosts many independent games of Egg Roll on one event loop, over plain TCP.
+
+    Each client first picks a language and a level, then plays it with its own
+    `ServerSession`. Clients share the parsed levels and the leaderboard store. The
+    store locks and syncs files, so it is only called from a thread of its own, one
+    call at a time, instead of from the event loop.
+
+    Attributes:
+        levels (LevelCache): The levels that can be played.
+        store (LeaderboardStore): Where the scores of every client are saved.
+        store_executor (ThreadPoolExecutor): The thread that calls the store.
+        tilt_duration (float): Seconds spent animating one tilt.
+        frame_budget (float): Shortest time a frame stays on screen.
+        instant (bool): Whether to skip animations.
+        width (int): The width of the clients' screens.
+        height (int): The height of the clients' screens.
+        active (int): The number of clients currently connected.
+        served (int): The number of clients connected since the server started.
+    """
+
+    def __init__(
+            self,
+            levels: LevelCache,
+            store: LeaderboardStore | None = None,
+            tilt_duration: float = TILT_DURATION,
+            frame_budget: float = FRAME_BUDGET,
+            instant: bool = False,
+            width: int = SCREEN_WIDTH,
+            height: int = SCREEN_HEIGHT
+    ) -> None:
+        """Initializes the server.
+
+        Args:
+            levels (LevelCache): The levels that can be played.
+            store (LeaderboardStore | None): Where scores are saved. Defaults to `default_store()`.
+            tilt_duration (float): Seconds spent animating one tilt.
+            frame_budget (float): Shortest time a frame stays on screen.
+            instant (bool): Whether to skip animations.
+            width (int): The width of the clients' screens.
+            height (int): The height of the clients' screens.
+        """
+        self.levels = levels
+        self.store = store if store is not None else default_store()
+        self.store_executor = ThreadPoolExecutor(1, thread_name_prefix="leaderboard")
+        self.tilt_duration = tilt_duration
+        self.frame_budget = frame_budget
+        self.instant = instant
+        self.width = width
+        self.height = height
+        self.active = 0
+        self.served = 0
+
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> asyncio.Server:
+        """Starts accepting clients.
+
+        Args:
+            host (str): The address to listen on.
+            port (int): The port to listen on, or 0 for any free port.
+
+        Returns:
+            asyncio.Server: The listening server.
+        """
+        return await asyncio.start_server(self.handle_client, host, port, backlog=BACKLOG)
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serves one client until it exits or disconnects.
+
+        Args:
+            reader (asyncio.StreamReader): The client's input.
+            writer (asyncio.StreamWriter): The client's output.
+        """
+        self.active += 1
+        self.served += 1
+        lines = InputLines(reader)
+        lines.start()
+        stream = ConnectionStream(writer)
+        loc: EggRollLocalization | None = None
+        try:
+            loc = await self._choose_language(lines, stream)
+            while loc is not None:
+                level = await self._choose_level(lines, stream, loc)
+                if level is None:
+                    break
+                scheduler = FrameScheduler(self.tilt_duration, self.frame_budget, self.instant)
+                session = ServerSession(
+                    level, lines, stream, scheduler, loc, self.store, self.width, self.height, self.levels.open,
+                    self.store_executor
+                )
+                if await session.run() == GameState.TERMINATE:
+                    break
+            if loc is not None:
+                stream.write(color_text(center_text(f"\n{loc['exit_goodbye']}\n", width=self.width), ["magenta"]) + "\n")
+                await stream.drain()
+        except ConnectionError:
+            pass    # The client disconnected
+        finally:
+            lines.close()
+            self.active -= 1
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _choose_language(self, lines: InputLines, stream: ConnectionStream) -> EggRollLocalization | None:
+        """Asks the client for the language of its session.
+
+        Args:
+            lines (InputLines): The client's input.
+            stream (ConnectionStream): The client's output.
+
+        Returns:
+            EggRollLocalization | None: The localization chosen (the game's language if the
+            answer is not a known language), or None if the client disconnected.
+        """
+        languages = sorted(path.stem for path in LOCALIZATION_DIR.glob("*.json") if path != SETTINGS_FILE)
+        stream.write(f"{CLEAR_SCREEN}Language / Wika [{'/'.join(languages)}]: ")
+        await stream.drain()
+        answer = await lines.readline()
+        if answer is None:
+            return None
+        answer = answer.strip().lower()
+        return load_localization(answer if answer in languages else None)
+
+    async def _choose_level(
+            self,
+            lines: InputLines,
+            stream: ConnectionStream,
+            loc: EggRollLocalization
+    ) -> str | None:
+        """Lists the levels and asks the client which one to play.
+
+        Args:
+            lines (InputLines): The client's input.
+            stream (ConnectionStream): The client's output.
+            loc (EggRollLocalization): The localization of the session.
+
+        Returns:
+            str | None: The name of the level, or None if the client asked to exit or
+            disconnected.
+        """
+        headers: list[str | list[str]] = ["#", loc["game_level_name"], loc["game_size"], loc["game_max_moves"]]
+        table = create_table(self.levels.table_rows(), headers, str(loc["level_selector_title"]), self.width)
+        names = self.levels.names()
+        error = ""
+        while True:
+            stream.write(f"{CLEAR_SCREEN}{table}\n{error}\n{loc['prompt_enter_level']}: ")
+            await stream.drain()
+            choice = await lines.readline()
+            if choice is None or validate_moves(choice, 0) == GameState.TERMINATE:
+                return None
+            choice = choice.strip()
+            if choice.isdigit() and 1 <= int(choice) <= len(names):
+                return names[int(choice) - 1]
+            if choice in names:
+                return choice
+            error = color_text(str(loc["error_invalid_choice"]).format(choice=choice), ["red"])
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Runs the game server until it is interrupted.
+
+    Args:
+        argv (list[str] | None): The command-line arguments. Defaults to sys.argv[1:].
+    """
+    parser = argparse.ArgumentParser(description="Host many games of Egg Roll over TCP (e.g. for telnet clients).")
+    parser.add_argument("levels", nargs="*", help="level files to serve (default: every level in the current directory)")
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"the address to listen on (default: {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"the port to listen on (default: {DEFAULT_PORT})")
+    parser.add_argument(
+        "--tilt-duration", type=float, default=TILT_DURATION, metavar="SECONDS",
+        help=f"time spent animating each tilt (default: {TILT_DURATION})"
+    )
+    parser.add_argument(
+        "--frame-budget", type=float, default=FRAME_BUDGET, metavar="SECONDS",
+        help=f"shortest time a frame stays on screen (default: {FRAME_BUDGET:.3f})"
+    )
+    parser.add_argument("--instant", action="store_true", help="skip tilt animations")
+    parser.add_argument("--size", type=int, nargs=2, default=[SCREEN_HEIGHT, SCREEN_WIDTH], metavar=("ROWS", "COLS"),
+                        help=f"the size of the clients' screens (default: {SCREEN_HEIGHT} {SCREEN_WIDTH})")
+    args = parser.parse_args(argv)
+
+    levels = LevelCache(args.levels) if args.levels else LevelCache.from_directory()
+    if not levels:
+        parser.error("no levels to serve")
+    server = GameServer(
+        levels, tilt_duration=args.tilt_duration, frame_budget=args.frame_budget,
+        instant=args.instant, width=args.size[1], height=args.size[0]
+    )
+
+    async def serve() -> None:
+        listener = await server.start(args.host, args.port)
+        host, port = listener.sockets[0].getsockname()[:2]
+        print(f"Serving {len(levels)} levels on {host}:{port} (Ctrl+C to stop)")
+        async with listener:
+            await listener.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
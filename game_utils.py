@@ -16,15 +16,32 @@ limitations under the License.
 @author Renz Jared Rolle <rgrolle@up.edu.ph>
 """
 
-from copy import deepcopy
+from array import array
+from bisect import bisect_left, insort
 from dataclasses import dataclass
+from functools import wraps
+from itertools import groupby
+from typing import Any, Callable, Iterator, Sequence
+import re
 import sys
 
 from terminal_utils import print_format, load_localization
 
 EggRollGrid = list[list[str]]
+EggRollDelta = dict[tuple[int, int], str]
+EggRollChanges = dict[tuple[int, int], tuple[str, str]]
+LandingTable = list[list[Any]]  # The landing cell of each cell and whether it is at the edge, or None
 EggRollLocalization = dict[str, str | list[str]]
 
+# Tile codes used by the compact engine. The code of a tile is its index in TILES.
+GRASS, EGG, EMPTY_NEST, FULL_NEST, PAN, WALL = range(6)
+TILES: tuple[str, ...] = ('🟩', '🥚', '🪹', '🪺', '🍳', '🧱')
+ENGINES: tuple[str, ...] = ("emoji", "compact")
+RESOLUTIONS: tuple[str, ...] = ("step", "slide")
+FRAME_KINDS: tuple[str, ...] = ("view", "snapshot", "delta")
+CHECKPOINT_INTERVAL = 20    # Moves between full grid checkpoints in the undo journal
+_SLIDING_RUN = re.compile(b"[%c%c]+" % (GRASS, EGG))   # Runs of cells that eggs slide through
+
 
 @dataclass
 class Move:
@@ -55,39 +72,105 @@ class Grid:
 
     Attributes:
         name (str): The name of the level file.
+        engine (str): The board representation in use ('emoji' or 'compact').
         level (list[str]): The level configuration read from the file.
         max_moves (int): The maximum number of moves allowed for the level.
         moves (list[Move]): The list of moves made by the player.
         points (int): The player's current score.
-        level_state (EggRollGrid): The current state of the grid.
-        level_states (list[tuple[EggRollGrid, int]]): A history of grid states and scores.
+        level_state (EggRollGrid): The current state of the grid. Its cells may be
+            edited in place; `eggs` is then rebuilt the next time it is read.
+        level_states (MoveJournal): A history of grid states and scores.
+        eggs (EggIndex): The positions of the eggs on the grid.
     """
 
+    engine = "emoji"
+
+    def __new__(cls, *args: Any, engine: str = "emoji", **kwargs: Any) -> "Grid":
+        """Creates a grid backed by the requested engine.
+
+        Passing `engine="compact"` to the Grid constructor returns a CompactGrid instead.
+        """
+        if cls is Grid and engine == "compact":
+            cls = CompactGrid
+        return super().__new__(cls)
+
     def __init__(
             self,
             grid_data: tuple[list[str], int] | None = None,
-            filename: str = "Unnamed"
+            filename: str = "Unnamed",
+            engine: str = "emoji"
     ) -> None:
         """Initializes a Grid object with the given level file.
 
         Args:
             grid_data (tuple[list[str], int]): The level configuration data.
             filename (str): The path to the level file.
+            engine (str): The board representation to use ('emoji' or 'compact').
+
+        Raises:
+            ValueError: If no level data is provided or the engine is unknown.
         """
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown grid engine: {engine}")
         if grid_data:
             self.level = grid_data[0]
             self.max_moves = grid_data[1]
-            self.level_state = [list(line) for line in self.level]
+            rows = self.level
         elif filename:
             self.level = self.read_level(filename)
             self.max_moves = int(self.level[1])
-            self.level_state = [list(line) for line in self.level[2:]]
+            rows = self.level[2:]
         else:
             raise ValueError("No level data provided.")
+        self._load_rows(rows)
         self.name = filename
         self.moves: list[Move] = []
         self.points: int = 0
-        self.level_states: list[tuple[EggRollGrid, int]] = [(self.copy_grid(), self.points)]
+        self.level_states = MoveJournal(self, self._first_checkpoint(rows))
+
+    def _load_rows(self, rows: list[str]) -> None:
+        """Builds the board from the rows of a level.
+
+        Args:
+            rows (list[str]): The rows of the level, one string per row.
+        """
+        self.level_state = [list(line) for line in rows]
+
+    @property
+    def level_state(self) -> EggRollGrid:
+        """EggRollGrid: The current state of the grid.
+
+        Assigning it copies the rows into rows that tell the egg index when they are
+        edited in place, so the index never goes out of date.
+        """
+        return self._level_state
+
+    @level_state.setter
+    def level_state(self, level_state: EggRollGrid) -> None:
+        self._eggs = EggIndex()
+        self._level_state = _TrackedRows(level_state, self._eggs)
+        self._eggs.rebuild(self._level_state)
+        self._landings: dict[tuple[int, int], LandingTable] = {}
+
+    @property
+    def eggs(self) -> "EggIndex":
+        """EggIndex: The positions of the eggs, rebuilt first if the grid was edited in place."""
+        if self._eggs.stale:
+            self._eggs.rebuild(self._level_state)
+            self._landings.clear()     # The obstacles may have been edited too
+        return self._eggs
+
+    def _first_checkpoint(self, rows: list[str]) -> Any:
+        """Returns the undo journal checkpoint of a grid that was just loaded.
+
+        Args:
+            rows (list[str]): The rows of the level, one string per row.
+
+        Returns:
+            tuple[str, ...]: The level rows, which double as the first checkpoint,
+            so the board is not copied.
+        """
+        return tuple(rows)
 
     def read_level(self, filename: str) -> list[str]:
         """Reads the game level from a specified file.
@@ -115,29 +198,98 @@ class Grid:
             print_format(str(loc["exit"]), is_centered=True, args=["light_yellow"])
             sys.exit()
 
-    def roll(self, moves: list[Move] | None = None) -> list[EggRollGrid]:
+    def roll(
+            self,
+            moves: list[Move] | None = None,
+            resolution: str = "step"
+    ) -> list[EggRollGrid]:
         """Simulate rolling eggs on the grid based on the provided move
 
+        With the "step" resolution, every egg moves one cell per snapshot until nothing
+        moves. With the "slide" resolution, every egg is moved straight to its resting
+        cell, nest or pan, so only the grid before and after the tilt are captured.
+
         Args:
             moves (list[Move]): A list of moves to simulate on the grid.
+            resolution (str): How the tilt is resolved ('step' or 'slide').
 
         Returns:
             list[EggRollGrid]: A list of snapshots of the grid after the move.
         """
+        if resolution not in RESOLUTIONS:
+            raise ValueError(f"Unknown roll resolution: {resolution}")
+        skip_intermediate = resolution == "slide"
+        return list(self.iter_roll(moves, frames="snapshot", skip_intermediate=skip_intermediate))
+
+    def iter_roll(
+            self,
+            moves: list[Move] | None = None,
+            frames: str = "view",
+            skip_intermediate: bool = False
+    ) -> Iterator[EggRollGrid | EggRollDelta]:
+        """Lazily simulate rolling eggs on the grid, yielding one frame per step.
+
+        The grid only advances as the generator is consumed, so `points` and
+        `level_state` are up to date with the last frame yielded. A generator that is
+        closed before its last frame (by `close()`, or once it is garbage collected, which
+        happens as soon as a loop over `grid.iter_roll(...)` is left with `break`) finishes
+        the tilt at once without yielding more frames, so the move is always applied
+        and recorded in `level_states` as a whole. A generator that is never started
+        does not change the grid. Frame kinds are:
+
+        - "view": the grid itself. It is only valid until the next frame is requested.
+        - "snapshot": an independent copy of the grid (this is what `roll` returns).
+        - "delta": the cells that changed since the previous frame, as {(row, col): tile}.
+          The grid before the tilt is not yielded, since the caller already has it.
+
+        Args:
+            moves (list[Move]): A list of moves to simulate on the grid.
+            frames (str): The kind of frame to yield ('view', 'snapshot' or 'delta').
+            skip_intermediate (bool): Whether to move the eggs straight to where they stop,
+                skipping every frame in between.
+
+        Yields:
+            EggRollGrid | EggRollDelta: The frames of the roll.
+        """
         if moves:
             self.moves = moves
+        if frames not in FRAME_KINDS:
+            raise ValueError(f"Unknown frame kind: {frames}")
 
-        snapshots = []
         move = self.moves[-1] # The move to be performed is the last move added
+        advance = self._slide_to_rest if skip_intermediate else self._apply_move
+        points_before = self.points
+        move_changes: dict[Any, Any] = {}
 
-        while True:
-            snapshots.append([row[:] for row in self.level_state])  # Capture the grid's state
-            points_change, moved = self._apply_move(move)
+        def step() -> tuple[dict[Any, Any], bool]:
+            changes: dict[Any, Any] = {}
+            points_change, moved = advance(move, changes)
             self.points += points_change
-            if not moved:
-                break
+            for cell, old in changes.items():
+                move_changes.setdefault(cell, old)
+            return changes, moved
 
-        return snapshots
+        finished = False
+        try:
+            if frames != "delta":
+                yield self._view() if frames == "view" else self._snapshot()
+            while not finished:
+                changes, moved = step()
+                finished = not moved or skip_intermediate
+                if moved and frames == "delta":
+                    yield self._render_changes(changes)
+                elif moved:
+                    yield self._view() if frames == "view" else self._snapshot()
+        except GeneratorExit:
+            # Closed before the eggs came to rest: finish the tilt without yielding
+            while not finished:
+                _, moved = step()
+                finished = not moved or skip_intermediate
+            raise
+        finally:
+            # Keep track of the cells changed and points earned by this move, even if an
+            # error stopped it halfway, so that it can still be undone
+            self.level_states.record(self._diff_changes(move_changes), self.points - points_before)
 
     def is_present(self, element: str) -> bool:
         """Check if an element is present in the grid
@@ -148,15 +300,91 @@ class Grid:
         Returns:
             bool: True if the element is found, False otherwise.
         """
+        if element == '🥚':
+            return len(self.eggs) > 0
         return any(element in row for row in self.level_state)
 
     def copy_grid(self) -> EggRollGrid:
         """Creates a deep copy of the current grid state.
 
         Returns:
-            EggRollGrid: A deep copy of the grid.
+            EggRollGrid: A deep copy of the grid, made of plain lists that are not tied
+            to the egg index of this grid.
         """
-        return deepcopy(self.level_state)
+        return [list(row) for row in self.level_state]
+
+    def _snapshot(self) -> EggRollGrid:
+        """Captures the current grid state for a roll snapshot.
+
+        Returns:
+            EggRollGrid: A row-by-row copy of the grid.
+        """
+        return [row[:] for row in self.level_state]
+
+    def _view(self) -> EggRollGrid:
+        """Returns the current grid state without copying it.
+
+        Returns:
+            EggRollGrid: The grid itself.
+        """
+        return self.level_state
+
+    def _diff_changes(self, changes: dict[tuple[int, int], str]) -> EggRollChanges:
+        """Keeps the recorded changes whose tile actually changed.
+
+        Args:
+            changes (dict[tuple[int, int], str]): The tile each touched cell had before the change.
+
+        Returns:
+            EggRollChanges: The old and new tile of every changed cell.
+        """
+        state = self.level_state
+        return {
+            (r, c): (old, state[r][c])
+            for (r, c), old in changes.items() if state[r][c] != old
+        }
+
+    def _render_changes(self, changes: dict[tuple[int, int], str]) -> EggRollDelta:
+        """Renders recorded changes into the cells whose tile actually changed.
+
+        Args:
+            changes (dict[tuple[int, int], str]): The tile each touched cell had before the change.
+
+        Returns:
+            EggRollDelta: The new tile of every changed cell.
+        """
+        state = self.level_state
+        return {
+            (r, c): state[r][c]
+            for (r, c), old in changes.items() if state[r][c] != old
+        }
+
+    def _rows(self) -> tuple[str, ...]:
+        """Returns the rows of the current grid state as strings.
+
+        Returns:
+            tuple[str, ...]: The rows of the grid.
+        """
+        return tuple(''.join(row) for row in self.level_state)
+
+    def _checkpoint(self) -> Any:
+        """Captures the current grid state in a compact, immutable form for the undo journal.
+
+        Returns:
+            tuple[str, ...]: The rows of the grid.
+        """
+        return self._rows()
+
+    def _restore_checkpoint(self, checkpoint: Any) -> EggRollGrid:
+        """Rebuilds a grid state from a checkpoint made by `_checkpoint`.
+
+        Args:
+            checkpoint (tuple[str, ...]): The rows of the grid.
+
+        Returns:
+            EggRollGrid: The grid state.
+        """
+        return [list(row) for row in checkpoint]
 
     def _set_position(self, pos: tuple[int, int], value: str) -> None:
         """Sets a specific position in the grid to a given value.
@@ -166,48 +394,47 @@ class Grid:
             value (str): The value to set at the given position.
         """
         r, c = pos
-        self.level_state[r][c] = value
+        row, eggs = self.level_state[r], self.eggs
+        if row[c] == '🥚':
+            eggs.remove(pos)
+        if value == '🥚':
+            eggs.add(pos)
+        if (row[c] in ('🟩', '🥚')) != (value in ('🟩', '🥚')):
+            self._landings.clear()     # The obstacles changed, so the landing tables are stale
+        _set_cell(row, c, value)
 
     def _find_eggs(self, move: Move | None = None) -> list[tuple[int, int]]:
         """Finds all egg positions in the grid.
 
+        The positions come from the egg index, so the grid itself is not scanned.
+
         Args:
             move_direction (Move | None): The previous move made.
             
         Returns:
-            list[tuple[int, int]]: A list of egg positions.
+            list[tuple[int, int]]: A list of egg positions, sorted depending on the move
+            direction to maintain egg collision.
         """
-        eggs = [(r, c)
-            for r in range(len(self.level_state))
-            for c in range(len(self.level_state[0]))
-            if self.level_state[r][c] == '🥚'
-        ]
-
-        # Sort eggs depending on move direction to maintain egg collision
-        if move:
-            dr, dc = move.directions()
-            if dr == -1:    # Forward
-                eggs.sort()
-            elif dr == 1:   # Backward
-                eggs.sort(reverse=True)
-            elif dc == -1:  # Left
-                eggs.sort(key=lambda x: (x[1], x[0]))
-            elif dc == 1:   # Right
-                eggs.sort(key=lambda x: (x[1], x[0]), reverse=True)
-        return eggs
+        return self.eggs.ordered(move)
 
     def _clear_eggs(self) -> None:
         """Clears eggs from the grid by replacing them with grass."""
-        for r, row in enumerate(self.level_state):
-            for c, cell in enumerate(row):
-                if cell == '🥚':
-                    self.level_state[r][c] = '🟩'
+        state, eggs = self.level_state, self.eggs
+        for r, c in eggs.ordered():
+            _set_cell(state[r], c, '🟩')
+        eggs.clear()
 
-    def _apply_move(self, move: Move) -> tuple[int, bool]:
+    def _apply_move(
+            self,
+            move: Move,
+            changes: dict[tuple[int, int], str] | None = None
+    ) -> tuple[int, bool]:
         """Applies a single move to all eggs on the grid.
 
         Args:
             move (Move): The move to be performed.
+            changes (dict[tuple[int, int], str] | None): If given, the tile every touched
+                cell had before the move is recorded into it.
 
         Returns:
             tuple[int, bool]: The change in points, and a bool representing whether any eggs moved.
@@ -222,8 +449,14 @@ class Grid:
         if not eggs:
             return current_points, moved
 
+        if changes is not None:
+            for egg in eggs:
+                changes.setdefault(egg, '🥚')
+
         for egg in eggs:
             outcome, new_pos = self._calculate_new_position(egg, move)
+            if changes is not None and outcome in ("move", "fill_nest"):
+                changes.setdefault(new_pos, self.level_state[new_pos[0]][new_pos[1]])
             if outcome == "move":
                 self._set_position(new_pos, '🥚')
                 moved = True
@@ -239,6 +472,112 @@ class Grid:
 
         return current_points, moved
 
+    def _slide_to_rest(
+            self,
+            move: Move,
+            changes: dict[tuple[int, int], str] | None = None
+    ) -> tuple[int, bool]:
+        """Moves every egg straight to where it stops for the given move.
+
+        Each egg jumps to its landing cell from `_landing_table` instead of walking there.
+        Eggs are resolved in the same collision order as `_find_eggs`, so eggs sharing a
+        landing cell pile up against its obstacle one cell further back each, unless the
+        obstacle is a pan or an empty nest that takes the egg.
+
+        Args:
+            move (Move): The move to be performed.
+            changes (dict[tuple[int, int], str] | None): If given, the tile every touched
+                cell had before the move is recorded into it.
+
+        Returns:
+            tuple[int, bool]: The change in points, and a bool representing whether any eggs moved.
+        """
+        state, eggs = self.level_state, self.eggs     # A stale index is rebuilt before the tables are read
+        dr, dc = move.directions()
+        landings = self._landing_table(dr, dc)
+        current_points = 0
+        moved = False
+
+        # Number of eggs already resting against each landing cell's obstacle
+        stacked: dict[tuple[int, int], int] = {}
+        for egg in self._find_eggs(move):
+            r, c = egg
+            landing, at_edge = landings[r][c]
+            count = stacked.get(landing, 0)
+            target_r, target_c = landing[0] + dr, landing[1] + dc
+            if count:
+                target = '🥚'
+            else:
+                target = '🧱' if at_edge else state[target_r][target_c]
+
+            if target in ('🪹', '🍳'):
+                stop = (target_r, target_c)
+                if target == '🪹':
+                    _set_cell(state[target_r], target_c, '🪺')
+                    current_points += calculate_points(self.max_moves, self.moves)
+                else:
+                    current_points -= 5
+            else:
+                stop = (landing[0] - count * dr, landing[1] - count * dc)
+                stacked[landing] = count + 1
+                if stop == egg:
+                    continue    # Already resting, and no later egg can stop on its cell
+                _set_cell(state[stop[0]], stop[1], '🥚')
+                eggs.add(stop)
+            _set_cell(state[r], c, '🟩')
+            eggs.remove(egg)
+            if changes is not None:
+                changes.setdefault(egg, '🥚')
+                changes.setdefault(stop, target if target in ('🪹', '🍳') else '🟩')
+            moved = moved or stop != egg
+
+        return current_points, moved
+
+    def _landing_table(self, dr: int, dc: int) -> LandingTable:
+        """Returns, for every cell, the last cell an egg can slide to in a direction.
+
+        Only grass and eggs can be slid through; every other tile and the edges of the
+        grid stop eggs. As on the compact engine, the tables of both directions along an
+        axis are built in one pass and reused until `_set_position` changes which cells
+        are obstacles, or the grid is edited in place.
+
+        Args:
+            dr (int): The row direction of the move.
+            dc (int): The column direction of the move.
+
+        Returns:
+            LandingTable: The landing cell of each cell, and whether it is stopped by the
+            edge of the grid. The entries of obstacle cells are None.
+        """
+        table = self._landings.get((dr, dc))
+        if table is not None:
+            return table
+
+        # Columns are handled as rows of the transposed grid, then transposed back
+        lines = self.level_state if dc else list(zip(*self.level_state))
+        towards_end: LandingTable = []
+        towards_start: LandingTable = []
+        for i, line in enumerate(lines):
+            ends: list[Any] = [None] * len(line)
+            starts: list[Any] = [None] * len(line)
+            start = 0
+            for sliding, group in groupby(line, key=('🟩', '🥚').__contains__):
+                end = start + len(list(group))
+                if sliding:
+                    last = ((i, end - 1) if dc else (end - 1, i), end == len(line))
+                    first = ((i, start) if dc else (start, i), start == 0)
+                    ends[start:end] = [last] * (end - start)
+                    starts[start:end] = [first] * (end - start)
+                start = end
+            towards_end.append(ends)
+            towards_start.append(starts)
+        if not dc:
+            towards_end = [list(row) for row in zip(*towards_end)]
+            towards_start = [list(row) for row in zip(*towards_start)]
+        axis = (0, 1) if dc else (1, 0)
+        self._landings[axis], self._landings[(-axis[0], -axis[1])] = towards_end, towards_start
+        return self._landings[(dr, dc)]
+
     def _calculate_new_position(
             self, pos: tuple[int, int],
             move: Move,
@@ -273,6 +612,925 @@ class Grid:
         return "reset", pos
 
 
+
+class BoardSnapshot(Sequence[list[str]]):
+    """A copy of a compact board, rendered into emoji rows only when it is first read.
+
+    The compact engine captures its roll snapshots as these, so a snapshot that is
+    never looked at costs a copy of the board instead of a grid of emoji. A snapshot
+    reads like the grid it renders to, and compares equal to it.
+
+    Attributes:
+        board (bytes): The tile codes of the grid, stored row by row.
+        rows (int): The number of rows in the grid.
+        cols (int): The number of columns in the grid.
+        palette (list[str]): The tile represented by each code.
+    """
+
+    __slots__ = ("board", "rows", "cols", "palette", "_rendered")
+    __hash__ = None     # type: ignore[assignment]
+
+    def __init__(self, board: bytes, rows: int, cols: int, palette: list[str]) -> None:
+        """Initializes the snapshot. Nothing is rendered yet.
+
+        Args:
+            board (bytes): The tile codes of the grid, stored row by row.
+            rows (int): The number of rows in the grid.
+            cols (int): The number of columns in the grid.
+            palette (list[str]): The tile represented by each code.
+        """
+        self.board = board
+        self.rows = rows
+        self.cols = cols
+        self.palette = palette
+        self._rendered: EggRollGrid | None = None
+
+    def render(self) -> EggRollGrid:
+        """Returns the rows of the snapshot, rendering them the first time.
+
+        Returns:
+            EggRollGrid: The grid. It is shared by every later call, so it must not be edited.
+        """
+        if self._rendered is None:
+            board, palette, cols = self.board, self.palette, self.cols
+            self._rendered = [
+                [palette[code] for code in board[start:start + cols]]
+                for start in range(0, self.rows * cols, cols)
+            ]
+        return self._rendered
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def __getitem__(self, index: Any) -> Any:
+        return self.render()[index]
+
+    def __iter__(self) -> Iterator[list[str]]:
+        return iter(self.render())
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, BoardSnapshot):
+            other = other.render()
+        return self.render() == other
+
+    def __repr__(self) -> str:
+        return repr(self.render())
+
+
+class CompactGrid(Grid):
+    """A grid engine that stores the board as a flat bytearray of tile codes.
+
+    Cells are addressed as `row * cols + col`, and every step of a roll compares
+    single-byte tile codes instead of emoji strings. Emoji are only produced when
+    the board is read through `level_state` or `copy_grid` (which render it once per
+    change of the board), or when a roll snapshot is first read.
+
+    Attributes:
+        board (bytearray): The tile codes of the grid, stored row by row.
+        rows (int): The number of rows in the grid.
+        cols (int): The number of columns in the grid.
+        palette (list[str]): The tile represented by each code. Starts with TILES;
+            unknown characters found in a level are appended to it.
+    """
+
+    engine = "compact"
+
+    def _load_rows(self, rows: list[str]) -> None:
+        """Encodes the rows of a level into the flat board.
+
+        Args:
+            rows (list[str]): The rows of the level, one string per row.
+
+        Raises:
+            ValueError: If the rows do not all have the same length.
+        """
+        self.palette: list[str] = list(TILES)
+        self._codes: dict[str, int] = {tile: code for code, tile in enumerate(TILES)}
+        self.rows = len(rows)
+        self.cols = len(rows[0]) if rows else 0
+        self.board = bytearray()
+        self._landings: dict[tuple[int, int], array] = {}
+        self._last_render: BoardSnapshot | None = None
+        for line in rows:
+            if len(line) != self.cols:
+                raise ValueError("Level rows must all have the same length.")
+            self.board.extend(self._encode(tile) for tile in line)
+
+    def _first_checkpoint(self, rows: list[str]) -> bytes:
+        """Returns the undo journal checkpoint of a grid that was just loaded.
+
+        Args:
+            rows (list[str]): The rows of the level, one string per row.
+
+        Returns:
+            bytes: A copy of the board.
+        """
+        return self._checkpoint()
+
+    @classmethod
+    def from_board(
+            cls,
+            board: bytearray,
+            rows: int,
+            cols: int,
+            palette: list[str],
+            max_moves: int,
+            filename: str = "Unnamed"
+    ) -> "CompactGrid":
+        """Creates a grid from an already encoded board, without going through emoji rows.
+
+        Args:
+            board (bytearray): The tile codes of the grid, stored row by row.
+            rows (int): The number of rows in the grid.
+            cols (int): The number of columns in the grid.
+            palette (list[str]): The tile represented by each code.
+            max_moves (int): The maximum number of moves allowed for the level.
+            filename (str): The path to the level file.
+
+        Returns:
+            CompactGrid: The grid. It owns `board`, which is not copied.
+
+        Raises:
+            ValueError: If the board size, palette or tile codes are inconsistent.
+        """
+        if len(board) != rows * cols:
+            raise ValueError("The board does not have rows * cols cells.")
+        if list(palette[:len(TILES)]) != list(TILES) or len(palette) > 256:
+            raise ValueError("The palette must start with the standard tiles and hold at most 256 tiles.")
+        if board.translate(None, bytes(range(len(palette)))):
+            raise ValueError("The board uses tile codes missing from the palette.")
+
+        grid = cls.__new__(cls)
+        grid.level = [str(rows), str(max_moves)]
+        grid.max_moves = max_moves
+        grid.rows, grid.cols, grid.board = rows, cols, board
+        grid.palette = list(palette)
+        grid._landings = {}
+        grid._last_render = None
+        grid._codes = {tile: code for code, tile in enumerate(grid.palette)}
+        grid.name = filename
+        grid.moves = []
+        grid.points = 0
+        grid.level_states = MoveJournal(grid, grid._checkpoint())
+        return grid
+
+    @property
+    def level_state(self) -> EggRollGrid:  # type: ignore[override]
+        """EggRollGrid: The board, rendered into rows that write their edits back to it.
+
+        Editing a cell (or a whole row) of the rows returned changes the board, through
+        `_set_position`. Edits that would change the size of the grid raise a ValueError.
+        The rows are not updated by later changes to the board, so they should be read
+        again after a roll.
+
+        The board is only rendered again once it has changed; until then, reading the
+        grid copies the rows of the last rendering.
+        """
+        return _BoardRows(self._render(), self)
+
+    @level_state.setter
+    def level_state(self, level_state: EggRollGrid) -> None:
+        self._load_rows(["".join(row) for row in level_state])
+
+    def _encode(self, tile: str) -> int:
+        """Returns the code of a tile, adding it to the palette if it is new.
+
+        Args:
+            tile (str): The tile to encode.
+
+        Returns:
+            int: The tile code.
+        """
+        code = self._codes.get(tile)
+        if code is None:
+            code = len(self.palette)
+            if code > 255:
+                raise ValueError("Too many distinct tiles for the compact engine.")
+            self.palette.append(tile)
+            self._codes[tile] = code
+        return code
+
+    def is_present(self, element: str) -> bool:
+        """Check if an element is present in the grid
+
+        Args:
+            element (str): The element to search for in the grid.
+
+        Returns:
+            bool: True if the element is found, False otherwise.
+        """
+        code = self._codes.get(element)
+        return code is not None and self.board.find(code) != -1
+
+    def copy_grid(self) -> EggRollGrid:
+        """Creates a deep copy of the current grid state.
+
+        Returns:
+            EggRollGrid: A deep copy of the grid, which does not write back to the board.
+        """
+        return [row[:] for row in self._render()]
+
+    def _render(self) -> EggRollGrid:
+        """Renders the board, reusing the last rendering if the board has not changed since.
+
+        Returns:
+            EggRollGrid: The rendered grid. It is shared, so it must not be edited.
+        """
+        snapshot = self._last_render
+        if snapshot is None or snapshot.board != self.board:
+            snapshot = self._snapshot()
+        return snapshot.render()
+
+    def _snapshot(self) -> BoardSnapshot:  # type: ignore[override]
+        """Captures the current grid state for a roll snapshot.
+
+        The snapshot is also kept as the last rendering of the board, so reading
+        `level_state` right after a roll reuses it.
+
+        Returns:
+            BoardSnapshot: A copy of the board, rendered when first read.
+        """
+        snapshot = BoardSnapshot(bytes(self.board), self.rows, self.cols, self.palette)
+        self._last_render = snapshot
+        return snapshot
+
+    def _view(self) -> EggRollGrid:
+        """Renders the current grid state.
+
+        Returns:
+            EggRollGrid: A rendered copy of the grid.
+        """
+        return self.level_state
+
+    def _diff_changes(self, changes: dict[int, int]) -> EggRollChanges:
+        """Keeps the recorded changes whose tile actually changed.
+
+        Args:
+            changes (dict[int, int]): The tile code each touched board index had before the change.
+
+        Returns:
+            EggRollChanges: The old and new tile of every changed cell.
+        """
+        board, palette, cols = self.board, self.palette, self.cols
+        return {
+            divmod(i, cols): (palette[old], palette[board[i]])
+            for i, old in changes.items() if board[i] != old
+        }
+
+    def _render_changes(self, changes: dict[int, int]) -> EggRollDelta:
+        """Renders recorded changes into the cells whose tile actually changed.
+
+        Args:
+            changes (dict[int, int]): The tile code each touched board index had before the change.
+
+        Returns:
+            EggRollDelta: The new tile of every changed cell.
+        """
+        board, palette, cols = self.board, self.palette, self.cols
+        return {
+            divmod(i, cols): palette[board[i]]
+            for i, old in changes.items() if board[i] != old
+        }
+
+    def _rows(self) -> tuple[str, ...]:
+        """Returns the rows of the current grid state as strings.
+
+        Returns:
+            tuple[str, ...]: The rows of the grid.
+        """
+        palette, cols = self.palette, self.cols
+        return tuple(
+            ''.join(palette[code] for code in self.board[start:start + cols])
+            for start in range(0, self.rows * cols, cols)
+        )
+
+    def _checkpoint(self) -> bytes:
+        """Captures the current grid state in a compact, immutable form for the undo journal.
+
+        Returns:
+            bytes: A copy of the board. Codes stay valid, since the palette only grows.
+        """
+        return bytes(self.board)
+
+    def _restore_checkpoint(self, checkpoint: bytes) -> EggRollGrid:
+        """Rebuilds a grid state from a checkpoint made by `_checkpoint`.
+
+        Args:
+            checkpoint (bytes): A copy of the board.
+
+        Returns:
+            EggRollGrid: The grid state.
+        """
+        palette, cols = self.palette, self.cols
+        return [
+            [palette[code] for code in checkpoint[start:start + cols]]
+            for start in range(0, self.rows * cols, cols)
+        ]
+
+    def _set_position(self, pos: tuple[int, int], value: str) -> None:
+        """Sets a specific position in the grid to a given value.
+
+        Args:
+            pos (tuple[int, int]): The grid position to update (row, column).
+            value (str): The value to set at the given position.
+        """
+        r, c = pos
+        i, code = r * self.cols + c, self._encode(value)
+        if (self.board[i] in (GRASS, EGG)) != (code in (GRASS, EGG)):
+            self._landings.clear()     # The obstacles changed, so the landing tables are stale
+        self.board[i] = code
+
+    def _egg_indices(self, move: Move | None = None) -> list[int]:
+        """Finds the flat indices of all eggs, in the collision order of a move.
+
+        Args:
+            move (Move | None): The move being performed.
+
+        Returns:
+            list[int]: The board indices of the eggs.
+        """
+        board, eggs = self.board, []
+        i = board.find(EGG)
+        while i != -1:
+            eggs.append(i)
+            i = board.find(EGG, i + 1)
+
+        if move:
+            dr, dc = move.directions()
+            cols = self.cols
+            if dr == 1:     # Backward
+                eggs.reverse()
+            elif dc == -1:  # Left
+                eggs.sort(key=lambda i: (i % cols, i))
+            elif dc == 1:   # Right
+                eggs.sort(key=lambda i: (i % cols, i), reverse=True)
+        return eggs
+
+    def _find_eggs(self, move: Move | None = None) -> list[tuple[int, int]]:
+        """Finds all egg positions in the grid.
+
+        Args:
+            move (Move | None): The previous move made.
+
+        Returns:
+            list[tuple[int, int]]: A list of egg positions.
+        """
+        return [divmod(i, self.cols) for i in self._egg_indices(move)]
+
+    def _clear_eggs(self) -> None:
+        """Clears eggs from the grid by replacing them with grass."""
+        self.board[:] = self.board.replace(bytes((EGG,)), bytes((GRASS,)))
+
+    def _apply_move(
+            self,
+            move: Move,
+            changes: dict[int, int] | None = None
+    ) -> tuple[int, bool]:
+        """Applies a single move to all eggs on the grid.
+
+        Args:
+            move (Move): The move to be performed.
+            changes (dict[int, int] | None): If given, the tile code every touched
+                board index had before the move is recorded into it.
+
+        Returns:
+            tuple[int, bool]: The change in points, and a bool representing whether any eggs moved.
+        """
+        eggs = self._egg_indices(move)
+        current_points = 0
+        moved = False
+        if not eggs:
+            return current_points, moved
+
+        board, rows, cols = self.board, self.rows, self.cols
+        dr, dc = move.directions()
+        offset = dr * cols + dc
+        for i in eggs:
+            board[i] = GRASS
+            if changes is not None:
+                changes.setdefault(i, EGG)
+
+        for i in eggs:
+            r, c = divmod(i, cols)
+            if not (0 <= r + dr < rows and 0 <= c + dc < cols):
+                board[i] = EGG
+                continue
+            target = board[i + offset]
+            if changes is not None:
+                changes.setdefault(i + offset, target)
+            if target == EMPTY_NEST:
+                board[i + offset] = FULL_NEST
+                current_points += calculate_points(self.max_moves, self.moves)
+                moved = True
+            elif target == GRASS:
+                board[i + offset] = EGG
+                moved = True
+            elif target == PAN:
+                current_points -= 5
+                moved = True
+            else:
+                board[i] = EGG
+
+        return current_points, moved
+
+    def _slide_to_rest(
+            self,
+            move: Move,
+            changes: dict[int, int] | None = None
+    ) -> tuple[int, bool]:
+        """Moves every egg straight to where it stops for the given move.
+
+        Each egg jumps to its landing cell from `_landing_table` instead of walking there.
+        Eggs are resolved in collision order, so eggs sharing a landing cell pile up
+        against its obstacle one cell further back each, unless the obstacle is a pan
+        or an empty nest that takes the egg.
+
+        Args:
+            move (Move): The move to be performed.
+            changes (dict[int, int] | None): If given, the tile code every touched
+                board index had before the move is recorded into it.
+
+        Returns:
+            tuple[int, bool]: The change in points, and a bool representing whether any eggs moved.
+        """
+        board, cols = self.board, self.cols
+        dr, dc = move.directions()
+        offset = dr * cols + dc
+        landings = self._landing_table(dr, dc)
+        current_points = 0
+        moved = False
+
+        # Number of eggs already resting against each landing cell's obstacle
+        stacked: dict[int, int] = {}
+        for egg in self._egg_indices(move):
+            landing = landings[egg]
+            board[egg] = GRASS
+            at_edge = landing < 0
+            if at_edge:
+                landing = ~landing
+            count = stacked.get(landing, 0)
+            target_index = landing + offset
+            if count:
+                target = EGG
+            else:
+                target = WALL if at_edge else board[target_index]
+
+            if target == EMPTY_NEST:
+                stop = target_index
+                board[stop] = FULL_NEST
+                current_points += calculate_points(self.max_moves, self.moves)
+            elif target == PAN:
+                stop = target_index
+                current_points -= 5
+            else:
+                stop = landing - count * offset
+                board[stop] = EGG
+                stacked[landing] = count + 1
+            if changes is not None:
+                changes.setdefault(egg, EGG)
+                changes.setdefault(stop, target if target in (EMPTY_NEST, PAN) else GRASS)
+            moved = moved or stop != egg
+
+        return current_points, moved
+
+    def _landing_table(self, dr: int, dc: int) -> array:
+        """Returns, for every cell, the last cell an egg can slide to in a direction.
+
+        Only grass and eggs can be slid through; every other tile and the edges of the
+        grid stop eggs. Those obstacles never move during a game, and filling a nest
+        only turns one obstacle into another, so the tables of both directions along an
+        axis are built once and reused until `_set_position` changes which cells are
+        obstacles or a new board is loaded.
+
+        Args:
+            dr (int): The row direction of the move.
+            dc (int): The column direction of the move.
+
+        Returns:
+            array: The board index of the landing cell of each cell, bitwise inverted
+            (`~index`) when the landing cell is stopped by the edge of the grid. The
+            entries of obstacle cells are meaningless.
+        """
+        table = self._landings.get((dr, dc))
+        if table is not None:
+            return table
+
+        rows, cols = self.rows, self.cols
+        towards_end, towards_start = array('i', bytes(4 * rows * cols)), array('i', bytes(4 * rows * cols))
+        if dc:
+            for r in range(rows):
+                base = r * cols
+                for run in _SLIDING_RUN.finditer(self.board, base, base + cols):
+                    start, end = run.span()
+                    last = end - 1 if end < base + cols else ~(end - 1)
+                    first = start if start > base else ~start
+                    towards_end[start:end] = array('i', [last]) * (end - start)
+                    towards_start[start:end] = array('i', [first]) * (end - start)
+            self._landings[(0, 1)], self._landings[(0, -1)] = towards_end, towards_start
+        else:
+            for c in range(cols):
+                for run in _SLIDING_RUN.finditer(self.board[c::cols]):
+                    start_row, end_row = run.span()
+                    start, end = start_row * cols + c, end_row * cols + c
+                    last = end - cols if end_row < rows else ~(end - cols)
+                    first = start if start_row > 0 else ~start
+                    towards_end[start:end:cols] = array('i', [last]) * (end_row - start_row)
+                    towards_start[start:end:cols] = array('i', [first]) * (end_row - start_row)
+            self._landings[(1, 0)], self._landings[(-1, 0)] = towards_end, towards_start
+        return self._landings[(dr, dc)]
+
+    def _calculate_new_position(
+            self, pos: tuple[int, int],
+            move: Move,
+) -> tuple[str, tuple[int, int]]:
+        """
+        Calculates the outcome of moving an egg in a specific direction.
+
+        Args:
+            pos (tuple[int, int]): The position of the egg to be moved (row, col).
+            move (Move): The move to be performed.
+
+        Returns:
+            tuple[str, tuple[int, int]]: The outcome of the move, and the new position (row, col).
+        """
+        r, c = pos
+        dr, dc = move.directions()
+        new_r, new_c = r + dr, c + dc
+
+        # Check grid boundaries
+        if not (0 <= new_r < self.rows and 0 <= new_c < self.cols):
+            return "reset", pos
+
+        target = self.board[new_r * self.cols + new_c]
+        if target == EMPTY_NEST:
+            return "fill_nest", (new_r, new_c)
+        if target == GRASS:
+            return "move", (new_r, new_c)
+        if target == PAN:
+            return "fry", pos
+        return "reset", pos
+
+
+
+class _BoardRow(list[str]):
+    """A rendered row of a compact grid that writes the cells edited in it to the board."""
+
+    __slots__ = ("_grid", "_row")
+
+    def __init__(self, row: list[str], grid: CompactGrid, r: int) -> None:
+        super().__init__(row)
+        self._grid = grid
+        self._row = r
+
+    def __setitem__(self, index: Any, value: Any) -> None:
+        if isinstance(index, slice):
+            cells = list(self)
+            cells[index] = value
+            self._write(cells)
+        else:
+            c = range(len(self))[index]     # Raises an IndexError for cells out of the row
+            self._grid._set_position((self._row, c), value)
+            super().__setitem__(c, value)
+
+    def sort(self, *args: Any, **kwargs: Any) -> None:
+        cells = list(self)
+        cells.sort(*args, **kwargs)
+        self._write(cells)
+
+    def reverse(self) -> None:
+        self._write(self[::-1])
+
+    def _write(self, cells: list[str]) -> None:
+        """Writes the cells that differ from the row into the board, then into the row.
+
+        Args:
+            cells (list[str]): The new tiles of the row.
+
+        Raises:
+            ValueError: If the number of cells differs from the number of columns.
+        """
+        if len(cells) != len(self):
+            raise ValueError("The rows of a compact grid cannot change length.")
+        for c, (old, new) in enumerate(zip(self, cells)):
+            if old != new:
+                self._grid._set_position((self._row, c), new)
+        super().__setitem__(slice(None), cells)
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return list, (list(self),)
+
+
+class _BoardRows(list[_BoardRow]):
+    """The rendered rows of a compact grid. Rows assigned into it are written to the board."""
+
+    __slots__ = ()
+
+    def __init__(self, rows: EggRollGrid, grid: CompactGrid) -> None:
+        super().__init__(_BoardRow(row, grid, r) for r, row in enumerate(rows))
+
+    def __setitem__(self, index: Any, value: Any) -> None:
+        if isinstance(index, slice):
+            targets, value = self[index], list(value)
+            if len(value) != len(targets):
+                raise ValueError("A compact grid cannot change its number of rows.")
+            for row, cells in zip(targets, value):
+                row[:] = cells
+        else:
+            self[index][:] = value
+
+    def sort(self, *args: Any, **kwargs: Any) -> None:
+        rows = [list(row) for row in self]
+        rows.sort(*args, **kwargs)
+        self[:] = rows
+
+    def reverse(self) -> None:
+        self[:] = [list(row) for row in reversed(self)]
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return list, ([list(row) for row in self],)
+
+
+def _fixed_size(self: Any, *args: Any, **kwargs: Any) -> Any:
+    """Rejects edits that would change the number of cells of a compact grid."""
+    raise ValueError("The size of a compact grid cannot change.")
+
+
+for _name in ("__delitem__", "__iadd__", "__imul__", "append", "extend", "insert", "pop", "remove", "clear"):
+    setattr(_BoardRow, _name, _fixed_size)
+    setattr(_BoardRows, _name, _fixed_size)
+
+
+class EggIndex:
+    """The positions of the eggs on a grid, kept up to date as eggs move.
+
+    Eggs are bucketed by row and by column, and every bucket is kept sorted, so the eggs
+    can be listed in the collision order of any move without scanning the whole grid.
+
+    Attributes:
+        by_row (dict[int, list[int]]): The sorted columns of the eggs in each row.
+        by_col (dict[int, list[int]]): The sorted rows of the eggs in each column.
+        stale (bool): Whether the grid was edited in place since the index was built,
+            in which case it must be rebuilt before it is used.
+    """
+
+    def __init__(self, level_state: EggRollGrid | None = None) -> None:
+        """Initializes the index with the eggs of a grid.
+
+        Args:
+            level_state (EggRollGrid | None): The grid to index. Defaults to no eggs.
+        """
+        self.by_row: dict[int, list[int]] = {}
+        self.by_col: dict[int, list[int]] = {}
+        self._count = 0
+        self.stale = False
+        if level_state:
+            self.rebuild(level_state)
+
+    def __len__(self) -> int:
+        """Returns the number of eggs on the grid."""
+        return self._count
+
+    def add(self, pos: tuple[int, int]) -> None:
+        """Records an egg at a position.
+
+        Args:
+            pos (tuple[int, int]): The position of the egg (row, column).
+        """
+        r, c = pos
+        insort(self.by_row.setdefault(r, []), c)
+        insort(self.by_col.setdefault(c, []), r)
+        self._count += 1
+
+    def remove(self, pos: tuple[int, int]) -> None:
+        """Forgets the egg at a position.
+
+        Args:
+            pos (tuple[int, int]): The position of the egg (row, column).
+
+        Raises:
+            KeyError: If there is no egg at that position.
+        """
+        r, c = pos
+        for buckets, line, key in ((self.by_row, r, c), (self.by_col, c, r)):
+            bucket = buckets.get(line, [])
+            i = bisect_left(bucket, key)
+            if i == len(bucket) or bucket[i] != key:
+                raise KeyError(pos)
+            del bucket[i]
+            if not bucket:
+                del buckets[line]
+        self._count -= 1
+
+    def rebuild(self, level_state: EggRollGrid) -> None:
+        """Forgets every egg, then indexes the eggs of a grid.
+
+        Args:
+            level_state (EggRollGrid): The grid to index.
+        """
+        self.clear()
+        for r, row in enumerate(level_state):
+            for c, cell in enumerate(row):
+                if cell == '🥚':
+                    self.add((r, c))
+        self.stale = False
+
+    def clear(self) -> None:
+        """Forgets every egg."""
+        self.by_row.clear()
+        self.by_col.clear()
+        self._count = 0
+
+    def ordered(self, move: Move | None = None) -> list[tuple[int, int]]:
+        """Lists the egg positions in the collision order of a move.
+
+        Args:
+            move (Move | None): The move being performed. Without one, the eggs are
+                listed row by row.
+
+        Returns:
+            list[tuple[int, int]]: The egg positions. Forward lists them row by row,
+            left column by column, and backward and right list them in reverse.
+        """
+        dr, dc = move.directions() if move else (0, 0)
+        if dc:
+            by_col = self.by_col
+            eggs = [(r, c) for c in sorted(by_col) for r in by_col[c]]
+        else:
+            by_row = self.by_row
+            eggs = [(r, c) for r in sorted(by_row) for c in by_row[r]]
+        if dr == 1 or dc == 1:
+            eggs.reverse()
+        return eggs
+
+
+class _TrackedRow(list[str]):
+    """A row of an emoji grid that marks the egg index of its grid as stale when edited."""
+
+    __slots__ = ("_eggs",)
+
+    def __init__(self, row: list[str], eggs: EggIndex) -> None:
+        super().__init__(row)
+        self._eggs = eggs
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return _TrackedRow, (list(self), self._eggs)
+
+
+class _TrackedRows(list[_TrackedRow]):
+    """The rows of an emoji grid. Rows put into it are copied into tracked rows."""
+
+    __slots__ = ("_eggs",)
+
+    def __init__(self, rows: EggRollGrid, eggs: EggIndex) -> None:
+        super().__init__(_TrackedRow(row, eggs) for row in rows)
+        self._eggs = eggs
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return _TrackedRows, (list(self), self._eggs)
+
+    def _track(self, row: list[str]) -> _TrackedRow:
+        """Returns a row as a row tracked by the egg index of this grid."""
+        if isinstance(row, _TrackedRow) and row._eggs is self._eggs:
+            return row
+        return _TrackedRow(row, self._eggs)
+
+    def __setitem__(self, index: Any, value: Any) -> None:
+        value = [self._track(row) for row in value] if isinstance(index, slice) else self._track(value)
+        super().__setitem__(index, value)
+        self._eggs.stale = True
+
+    def append(self, row: list[str]) -> None:
+        super().append(self._track(row))
+        self._eggs.stale = True
+
+    def insert(self, index: Any, row: list[str]) -> None:
+        super().insert(index, self._track(row))
+        self._eggs.stale = True
+
+    def extend(self, rows: Any) -> None:
+        super().extend(self._track(row) for row in rows)
+        self._eggs.stale = True
+
+    def __iadd__(self, rows: Any) -> "_TrackedRows":
+        self.extend(rows)
+        return self
+
+
+def _marking_stale(method: Callable[..., Any]) -> Callable[..., Any]:
+    """Wraps an in-place list method so that it marks the egg index of the grid as stale."""
+    @wraps(method)
+    def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+        result = method(self, *args, **kwargs)
+        self._eggs.stale = True
+        return result
+    return wrapper
+
+
+for _name in ("__setitem__", "__delitem__", "__iadd__", "__imul__", "append", "extend",
+              "insert", "pop", "remove", "clear", "sort", "reverse"):
+    if _name not in vars(_TrackedRows):
+        setattr(_TrackedRows, _name, _marking_stale(getattr(list, _name)))
+    setattr(_TrackedRow, _name, _marking_stale(getattr(list, _name)))
+
+# Writes a cell of a tracked row without marking the egg index as stale, for the moves
+# of the emoji engine, which keep the index up to date themselves
+_set_cell = list.__setitem__
+
+
+class MoveJournal:
+    """An undo history that stores what each move changed instead of whole grids.
+
+    Every move is recorded as the cells it changed (old and new tile) and the points
+    it earned. A full checkpoint of the grid is kept every `checkpoint_interval` moves,
+    so any past state can be rebuilt without replaying the whole game.
+
+    Indexing the journal mirrors the former list of (grid, points) tuples: entry 0 is
+    the initial grid and entry -1 is the grid after the last move.
+
+    Attributes:
+        grid (Grid): The grid whose moves are being recorded.
+        checkpoint_interval (int): The number of moves between full checkpoints.
+        entries (list[tuple[EggRollChanges, int]]): The changed cells and points delta of each move.
+        checkpoints (dict[int, tuple[Any, int]]): Full grid checkpoints (as made by
+            `Grid._checkpoint`) and points, keyed by the number of moves played.
+    """
+
+    def __init__(
+            self,
+            grid: Grid,
+            initial_checkpoint: Any,
+            checkpoint_interval: int = CHECKPOINT_INTERVAL
+    ) -> None:
+        """Initializes the journal of a grid that has not been played yet.
+
+        Args:
+            grid (Grid): The grid whose moves are being recorded.
+            initial_checkpoint (Any): The checkpoint of the initial grid, as made by
+                `Grid._checkpoint`.
+            checkpoint_interval (int): The number of moves between full checkpoints.
+        """
+        self.grid = grid
+        self.checkpoint_interval = checkpoint_interval
+        self.entries: list[tuple[EggRollChanges, int]] = []
+        self.checkpoints: dict[int, tuple[Any, int]] = {0: (initial_checkpoint, grid.points)}
+
+    def __len__(self) -> int:
+        """Returns the number of recorded states, including the initial grid."""
+        return len(self.entries) + 1
+
+    def __getitem__(self, index: int) -> tuple[EggRollGrid, int]:
+        """Rebuilds the grid and points after a number of moves.
+
+        Args:
+            index (int): The number of moves played. Negative indices count from the end.
+
+        Returns:
+            tuple[EggRollGrid, int]: The grid and cumulative points at that point.
+
+        Raises:
+            IndexError: If the index is out of range.
+        """
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Journal index out of range.")
+
+        start = max(move for move in self.checkpoints if move <= index)
+        checkpoint, points = self.checkpoints[start]
+        level_state = self.grid._restore_checkpoint(checkpoint)
+        for changes, points_change in self.entries[start:index]:
+            for (r, c), (_, new) in changes.items():
+                level_state[r][c] = new
+            points += points_change
+        return level_state, points
+
+    def record(self, changes: EggRollChanges, points_change: int) -> None:
+        """Records a move that has just been applied to the grid.
+
+        Args:
+            changes (EggRollChanges): The old and new tile of every cell the move changed.
+            points_change (int): The points earned by the move.
+        """
+        self.entries.append((changes, points_change))
+        if len(self.entries) % self.checkpoint_interval == 0:
+            self.checkpoints[len(self.entries)] = (self.grid._checkpoint(), self.grid.points)
+
+    def undo(self) -> bool:
+        """Reverts the last recorded move by applying its changes in reverse.
+
+        Returns:
+            bool: True if a move was undone, False if there was nothing to undo.
+        """
+        if not self.entries:
+            return False
+        self.checkpoints.pop(len(self.entries), None)
+        changes, points_change = self.entries.pop()
+        for pos, (old, _) in changes.items():
+            self.grid._set_position(pos, old)
+        self.grid.points -= points_change
+        return True
+
+
 def calculate_points(max_moves: int, moves: list[Move]) -> int:
     """Calculates points based on moves left and other conditions.
 
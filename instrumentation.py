@@ -0,0 +1,312 @@
+"""
+Copyright 2025 Renz Jared Rolle.
+
+Licensed under the GNU General Public License, Version 3 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://github.com/renzjared/egg-roll/blob/main/LICENSE
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+@author Renz Jared Rolle <rgrolle@up.edu.ph>
+"""
+
+import atexit
+import functools
+import importlib
+import json
+import os
+import platform
+import sys
+import time
+
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, Iterator
+
+ENV_VAR = "EGG_ROLL_PROFILE"    # Set to a report file (or to 1 for REPORT_FILE) to instrument a session
+REPORT_FILE = "egg_roll_profile.json"
+
+# The hot paths that are counted and timed, as (module, function or Class.method, kind).
+# "call" times every call, "sized" also adds up the length of the results (the number of
+# eggs found, for example), and "generator" times every frame drawn from a generator.
+HOOKS: tuple[tuple[str, str, str], ...] = (
+    ("game_utils", "Grid.iter_roll", "generator"),
+    ("game_utils", "Grid._apply_move", "call"),
+    ("game_utils", "Grid._slide_to_rest", "call"),
+    ("game_utils", "Grid._find_eggs", "sized"),
+    ("game_utils", "Grid._landing_table", "call"),
+    ("game_utils", "Grid._clear_eggs", "call"),
+    ("game_utils", "Grid.is_present", "call"),
+    ("game_utils", "Grid._snapshot", "call"),
+    ("game_utils", "Grid.copy_grid", "call"),
+    ("game_utils", "Grid._checkpoint", "call"),
+    ("game_utils", "Grid._restore_checkpoint", "call"),
+    ("game_utils", "CompactGrid._apply_move", "call"),
+    ("game_utils", "CompactGrid._slide_to_rest", "call"),
+    ("game_utils", "CompactGrid._egg_indices", "sized"),
+    ("game_utils", "CompactGrid._landing_table", "call"),
+    ("game_utils", "CompactGrid.is_present", "call"),
+    ("game_utils", "CompactGrid._snapshot", "call"),
+    ("game_utils", "CompactGrid.copy_grid", "call"),
+    ("game_utils", "MoveJournal.record", "call"),
+    ("game_utils", "MoveJournal.__getitem__", "call"),
+    ("game_utils", "MoveJournal.undo", "call"),
+    ("terminal_utils", "load_localization", "call"),
+    ("terminal_utils", "clear_screen", "call"),
+    ("terminal_utils", "print_format", "call"),
+    ("terminal_utils", "create_table", "call"),
+    ("terminal_utils", "FrameRenderer.draw", "call"),
+    ("terminal_utils", "FrameRenderer.update", "call"),
+    ("terminal_utils", "FrameScheduler.play", "call"),
+    ("egg_roll", "display_grid", "call"),
+    ("egg_roll", "display_stats", "call"),
+    ("egg_roll", "undo_last_move", "call"),
+    ("egg_roll", "replay", "call"),
+    ("game_utils", "EggIndex.ordered", "call"),
+    ("game_utils", "EggIndex.rebuild", "call"),
+)
+
+
+def _board_cells(grid: Any, *args: Any, **kwargs: Any) -> int:
+    """Counts the cells of a compact grid, all of which its searches read."""
+    return len(grid.board)
+
+
+def _grid_cells(grid: Any, element: str, *args: Any, **kwargs: Any) -> int:
+    """Counts the cells `Grid.is_present` reads: none for eggs, which are indexed."""
+    return 0 if element == '🥚' else sum(len(row) for row in grid.level_state)
+
+
+def _level_cells(grid: Any, *args: Any, **kwargs: Any) -> int:
+    """Counts the cells of an emoji grid, all of which its landing tables read."""
+    return sum(len(row) for row in grid.level_state)
+
+
+def _indexed_cells(index: Any, level_state: Any, *args: Any, **kwargs: Any) -> int:
+    """Counts the cells `EggIndex.rebuild` reads, all of the grid it indexes."""
+    return sum(len(row) for row in level_state)
+
+
+def _compact_sorts(grid: Any, move: Any = None, *args: Any, **kwargs: Any) -> int:
+    """Counts the sorts of `CompactGrid._egg_indices`, which finds eggs row by row, so
+    only left and right tilts need a sort."""
+    return 1 if move is not None and move.directions()[1] else 0
+
+
+def _one_sort(*args: Any, **kwargs: Any) -> int:
+    """Counts the sort of the egg index's rows or columns done by every call."""
+    return 1
+
+
+# Events counted within the calls of some hot paths, as (hot path, counter, amount). The
+# amount is computed from the arguments of each call, and added to the counter of the hot
+# path in the report: "cells_scanned" counts the cells a search reads, and "sorts" the
+# sorts done to put the eggs in collision order.
+COUNTERS: tuple[tuple[str, str, Callable[..., int]], ...] = (
+    ("game_utils.Grid.is_present", "cells_scanned", _grid_cells),
+    ("game_utils.Grid._landing_table", "cells_scanned", _level_cells),
+    ("game_utils.CompactGrid._egg_indices", "cells_scanned", _board_cells),
+    ("game_utils.CompactGrid._egg_indices", "sorts", _compact_sorts),
+    ("game_utils.CompactGrid._landing_table", "cells_scanned", _board_cells),
+    ("game_utils.CompactGrid.is_present", "cells_scanned", _board_cells),
+    ("game_utils.EggIndex.ordered", "sorts", _one_sort),
+    ("game_utils.EggIndex.rebuild", "cells_scanned", _indexed_cells),
+)
+
+_stats: dict[str, dict[str, float]] = {}
+_patches: list[tuple[Any, str, Any]] = []     # (owner, attribute, original) of every patch
+_started: float | None = None
+
+
+def enabled() -> bool:
+    """Returns whether the hot paths are currently instrumented."""
+    return bool(_patches)
+
+
+def enable(report_file: str | None = REPORT_FILE) -> None:
+    """Starts counting and timing the hot paths listed in HOOKS.
+
+    The functions are wrapped in place, so nothing is slowed down unless this is called.
+    Module-level functions are also replaced in every module that imported them.
+
+    Args:
+        report_file (str | None): Where to write the JSON report when the program exits,
+            or None to only write it through `write_report`.
+    """
+    global _started
+    if enabled():
+        return
+    _stats.clear()
+    _started = time.time()
+    for module_name, path, kind in HOOKS:
+        for module in _modules(module_name):
+            owner_name, _, attribute = path.rpartition(".")
+            owner: Any = getattr(module, owner_name) if owner_name else module
+            original = vars(owner).get(attribute)
+            if original is None or getattr(original, "__instrumented__", False):
+                continue
+            wrapper = _wrap(f"{module_name}.{path}", original, kind)
+            _patch(owner, attribute, original, wrapper)
+            if not owner_name:  # Also replace the references held by importing modules
+                for other in list(sys.modules.values()):
+                    if other is not module and getattr(other, "__dict__", {}).get(attribute) is original:
+                        _patch(other, attribute, original, wrapper)
+    if report_file:
+        atexit.register(write_report, report_file)
+
+
+def enable_from_environment() -> bool:
+    """Enables instrumentation if the ENV_VAR environment variable is set.
+
+    Returns:
+        bool: True if instrumentation was enabled.
+    """
+    value = os.environ.get(ENV_VAR, "").strip()
+    if not value or value == "0":
+        return False
+    enable(REPORT_FILE if value == "1" else value)
+    return True
+
+
+def disable() -> None:
+    """Restores every instrumented function. The collected statistics are kept."""
+    while _patches:
+        owner, attribute, original = _patches.pop()
+        setattr(owner, attribute, original)
+
+
+def count(name: str, amount: int = 1) -> None:
+    """Adds to a counter of the report, for events that are not function calls.
+
+    Args:
+        name (str): The name of the counter.
+        amount (int): The amount to add.
+    """
+    _entry(name)["items"] += amount
+
+
+def report() -> dict[str, Any]:
+    """Builds the report of the session so far.
+
+    Returns:
+        dict[str, Any]: When the session started, how long it has lasted, the Python
+        version and command line, and the calls, total and longest time (in seconds),
+        item count and COUNTERS of every hot path, slowest first.
+    """
+    hooks = sorted(_stats.items(), key=lambda item: item[1]["seconds"], reverse=True)
+    return {
+        "started": _started,
+        "duration": time.time() - _started if _started is not None else 0.0,
+        "python": platform.python_version(),
+        "argv": sys.argv,
+        "hooks": {name: dict(stats) for name, stats in hooks},
+    }
+
+
+def write_report(report_file: str = REPORT_FILE) -> None:
+    """Writes the report of the session as JSON.
+
+    Args:
+        report_file (str): The file to write the report to.
+    """
+    with open(report_file, "w", encoding="utf-8") as file:
+        json.dump(report(), file, indent=2)
+
+
+def _entry(name: str) -> dict[str, float]:
+    """Returns the statistics of a hot path, creating them if needed."""
+    stats = _stats.get(name)
+    if stats is None:
+        stats = _stats[name] = {"calls": 0, "seconds": 0.0, "max_seconds": 0.0, "items": 0}
+    return stats
+
+
+def _record(stats: dict[str, float], elapsed: float, items: int = 0) -> None:
+    """Adds one call to the statistics of a hot path."""
+    stats["calls"] += 1
+    stats["seconds"] += elapsed
+    stats["max_seconds"] = max(stats["max_seconds"], elapsed)
+    stats["items"] += items
+
+
+def _wrap(name: str, function: Any, kind: str) -> Any:
+    """Wraps a function so that its calls are counted and timed.
+
+    Args:
+        name (str): The name of the hot path in the report.
+        function (Any): The function to wrap.
+        kind (str): 'call', 'sized' or 'generator' (see HOOKS).
+
+    Returns:
+        Any: The wrapper.
+    """
+    stats = _entry(name)
+    counters = [(counter, amount) for path, counter, amount in COUNTERS if path == name]
+    for counter, _ in counters:
+        stats.setdefault(counter, 0)
+
+    if kind == "generator":
+        @functools.wraps(function)
+        def wrapper(*args: Any, **kwargs: Any) -> Iterator[Any]:
+            frames = function(*args, **kwargs)
+            try:
+                while True:
+                    start = time.perf_counter()
+                    try:
+                        frame = next(frames)
+                    except StopIteration:
+                        _record(stats, time.perf_counter() - start)
+                        return
+                    _record(stats, time.perf_counter() - start, 1)
+                    yield frame
+            finally:
+                frames.close()
+    else:
+        @functools.wraps(function)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            result = function(*args, **kwargs)
+            elapsed = time.perf_counter() - start
+            _record(stats, elapsed, len(result) if kind == "sized" and result is not None else 0)
+            for counter, amount in counters:
+                stats[counter] += amount(*args, **kwargs)
+            return result
+
+    wrapper.__instrumented__ = True    # type: ignore[attr-defined]
+    return wrapper
+
+
+def _patch(owner: Any, attribute: str, original: Any, wrapper: Callable[..., Any]) -> None:
+    """Replaces an attribute, remembering the original so that `disable` can restore it."""
+    _patches.append((owner, attribute, original))
+    setattr(owner, attribute, wrapper)
+
+
+def _modules(name: str) -> list[ModuleType]:
+    """Finds the loaded copies of a module, importing it if it was not loaded yet.
+
+    A script run directly is loaded as __main__, and may be imported again under its own
+    name, so both copies are returned.
+
+    Args:
+        name (str): The name of the module.
+
+    Returns:
+        list[ModuleType]: The copies of the module.
+    """
+    modules = []
+    main = sys.modules.get("__main__")
+    if main is not None and Path(getattr(main, "__file__", None) or "").stem == name:
+        modules.append(main)
+    if name in sys.modules or not modules:
+        try:
+            modules.append(importlib.import_module(name))
+        except ImportError:
+            pass
+    return modules
@@ -16,98 +16,638 @@ limitations under the License.
 @author Renz Jared Rolle <rgrolle@up.edu.ph>
 """
 
+import argparse
+import hashlib
 import json
+import os
+import sqlite3
+import tempfile
+import time
+import uuid
+
+from collections import Counter
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Iterator
 
-from terminal_utils import clear_screen, print_format, create_table, load_localization
+from terminal_utils import center_text, clear_screen, color_text, create_table, load_localization
 
 LEADERBOARD_FILE = "leaderboard.json"
+LEADERBOARD_DB = "leaderboard.db"
+STORE_ENV_VAR = "EGG_ROLL_LEADERBOARD"  # Selects the default store: 'journal', 'json' or 'sqlite'
+LEADERBOARD_SIZE = 10       # Number of top scores kept for each level
+COMPACT_EVERY = 32          # Journal records appended before they are compacted into the snapshot
 EggRollLeaderboards = dict[str, list[dict[str, str | int]]]
 EggRollLocalization = dict[str, str | list[str]]
 
+_default_stores: dict[tuple[int, str], "LeaderboardStore"] = {}  # Opened by `default_store`, by process and kind
+
 
 class Leaderboard:
     """A class to manage and display game leaderboards.
 
     Attributes:
-        filename (str): A JSON file where all game leaderboards are stored.
+        store (LeaderboardStore): Where all game leaderboards are stored.
         level_name (str): The name of the game level associated with the leaderboard.
     """
 
-    def __init__(self, level_name: str):
+    def __init__(self, level_name: str, store: "LeaderboardStore | None" = None):
         """Initializes the Leaderboard instance.
 
         Args:
             level_name (str): The name of the game level.
+            store (LeaderboardStore | None): Where leaderboards are stored.
+                Defaults to `default_store()`.
         """
-        self.filename = LEADERBOARD_FILE
+        self.store = store if store is not None else default_store()
         self.level_name = level_name
 
     def update(self, player_name: str, score: int) -> None:
         """Updates the leaderboard with a new score.
 
-        The leaderboard is sorted to only keep the top 10 scores.
+        The leaderboard only keeps the top 10 scores.
 
         Args:
             player_name (str): The name of the player to be added.
             score (int): The player's score.
         """
-        leaderboards = read_leaderboards()
-        if self.level_name not in leaderboards: # Initialize JSON Object if level is not yet stored
-            leaderboards[self.level_name] = []
-        leaderboards[self.level_name].append({"name": player_name, "score": score})
-        leaderboards[self.level_name] = sorted(
-            leaderboards[self.level_name], key=lambda x: x["score"], reverse=True
-        )[:10]  # Keep top 10 scores
-        self._write(leaderboards)
+        self.store.add_score(self.level_name, player_name, score)
 
     def display(self) -> None:
         """Displays the leaderboard for the current game level.
 
         If no leaderboard exists for the current level, an error message is shown.
         """
-        loc: EggRollLocalization = load_localization()
-        leaderboards: EggRollLeaderboards = read_leaderboards()
-
         clear_screen()
-        if self.level_name in leaderboards:
+        print(self.text())
+
+    def text(self, width: int | None = None, loc: EggRollLocalization | None = None) -> str:
+        """Formats the leaderboard for the current game level.
+
+        Args:
+            width (int | None): The width of the screen. Defaults to the terminal width.
+            loc (EggRollLocalization | None): The localization to use. Defaults to the
+                game's language.
+
+        Returns:
+            str: The leaderboard table followed by a blank line, or an error message if no
+            leaderboard exists for the current level.
+        """
+        loc = loc if loc is not None else load_localization()
+        entries = self.store.top_scores(self.level_name)
+
+        if entries:
             data = [[idx + 1, entry['name'], entry['score']]
-                for idx, entry in enumerate(leaderboards[self.level_name])]
+                for idx, entry in enumerate(entries)]
             headers: list[str | list[str]] = ["#", loc['game_name'], loc['game_score']]
             title: str = f"{loc['leaderboard_title']}: {self.level_name}"
-            table: str = create_table(data, headers, title)
-            print(table)
-            print()         # Blank line to separate table
-        else:
-            print_format(
-                f"\n{loc['error_no_leaderboard_found']} {self.level_name}",
-                is_centered=True,
-                args=["red"]
+            table: str = create_table(data, headers, title, width)
+            return table + "\n"      # Blank line to separate table
+        message = center_text(f"\n{loc['error_no_leaderboard_found']} {self.level_name}", width=width)
+        return color_text(message, ["red"])
+
+
+class LeaderboardStore:
+    """Base class for the places where leaderboards are stored."""
+
+    def add_score(self, level_name: str, player_name: str, score: int) -> None:
+        """Records a new score.
+
+        Args:
+            level_name (str): The name of the game level.
+            player_name (str): The name of the player.
+            score (int): The player's score.
+        """
+        raise NotImplementedError
+
+    def read_leaderboards(self) -> EggRollLeaderboards:
+        """Reads the top scores of every level.
+
+        Returns:
+            EggRollLeaderboards: The top scores of each level, highest first.
+        """
+        raise NotImplementedError
+
+    def top_scores(self, level_name: str, limit: int = LEADERBOARD_SIZE) -> list[dict[str, str | int]]:
+        """Reads the top scores of a level.
+
+        Args:
+            level_name (str): The name of the game level.
+            limit (int): The number of scores to return.
+
+        Returns:
+            list[dict[str, str | int]]: The top scores of the level, highest first.
+        """
+        return self.read_leaderboards().get(level_name, [])[:limit]
+
+
+class JsonLeaderboardStore(LeaderboardStore):
+    """Stores the top scores of every level in a single JSON file.
+
+    Every new score rewrites the whole file. The file is locked while it is updated, and
+    replaced atomically, so a crash never leaves a half-written file behind.
+
+    Attributes:
+        filename (str): The JSON file where all game leaderboards are stored.
+    """
+
+    def __init__(self, filename: str = LEADERBOARD_FILE) -> None:
+        """Initializes the store.
+
+        Args:
+            filename (str): The JSON file where all game leaderboards are stored.
+        """
+        self.filename = filename
+
+    def add_score(self, level_name: str, player_name: str, score: int) -> None:
+        with _locked(self.filename):
+            leaderboards = _read_snapshot(self.filename)
+            entries = leaderboards.get(level_name, []) + [{"name": player_name, "score": score}]
+            leaderboards[level_name] = _rank(entries)
+            _write_snapshot(self.filename, leaderboards)
+
+    def read_leaderboards(self) -> EggRollLeaderboards:
+        return _read_snapshot(self.filename)
+
+
+class JournalLeaderboardStore(LeaderboardStore):
+    """Appends new scores to a journal that is periodically compacted into a JSON snapshot.
+
+    Adding a score only appends one line to the journal (`<filename>.journal`), so its cost
+    does not grow with the size of the leaderboards. Once the journal holds `compact_every`
+    records, they are merged into the snapshot, which is then replaced atomically. Writers
+    are serialized with a lock file (`<filename>.lock`), so concurrent games never lose scores.
+
+    Journal records carry an id. Before the snapshot is replaced, the ids being merged are
+    written to a sidecar (`<filename>.merged`) together with a digest of the new snapshot,
+    so records that were already merged are skipped if the game stops between replacing the
+    snapshot and clearing the journal. The snapshot itself keeps the same schema as the
+    JSON store. A record cut short by a crash is ignored.
+
+    Attributes:
+        filename (str): The JSON snapshot holding the top scores of every level.
+        journal (str): The journal of scores not yet merged into the snapshot.
+        merged (str): The sidecar naming the records of an unfinished compaction.
+        compact_every (int): The number of journal records that triggers a compaction.
+    """
+
+    def __init__(self, filename: str = LEADERBOARD_FILE, compact_every: int = COMPACT_EVERY) -> None:
+        """Initializes the store.
+
+        Args:
+            filename (str): The JSON snapshot holding the top scores of every level.
+            compact_every (int): The number of journal records that triggers a compaction.
+        """
+        self.filename = filename
+        self.journal = f"{filename}.journal"
+        self.merged = f"{filename}.merged"
+        self.compact_every = compact_every
+
+    def add_score(self, level_name: str, player_name: str, score: int) -> None:
+        record = {"id": uuid.uuid4().hex, "level": level_name, "name": player_name, "score": score}
+        with _locked(self.filename):
+            with open(self.journal, "a+b") as file:
+                # Start on a new line if the last record was cut short by a crash
+                file.seek(0, os.SEEK_END)
+                if file.tell() > 0:
+                    file.seek(-1, os.SEEK_END)
+                    if file.read(1) != b"\n":
+                        file.write(b"\n")
+                file.write(json.dumps(record).encode("utf-8") + b"\n")
+                file.flush()
+                os.fsync(file.fileno())
+
+            if len(self._read_journal()) >= self.compact_every:
+                self._compact()
+
+    def read_leaderboards(self) -> EggRollLeaderboards:
+        leaderboards = _read_snapshot(self.filename)
+        return self._merge(leaderboards, self._unmerged(leaderboards, self._read_journal()))
+
+    def compact(self) -> None:
+        """Merges the journal into the snapshot, keeping the top scores of each level."""
+        with _locked(self.filename):
+            self._compact()
+
+    def _compact(self) -> None:
+        """Merges the journal into the snapshot. The caller must hold the lock."""
+        records = self._read_journal()
+        if not records:
+            return
+        leaderboards = _read_snapshot(self.filename)
+        records = self._unmerged(leaderboards, records)
+        if records:
+            leaderboards = self._merge(leaderboards, records)
+            # Name the records before the snapshot holding them replaces the old one
+            _write_snapshot(self.merged, {
+                "snapshot": _digest(leaderboards), "ids": [record["id"] for record in records]
+            })
+            _write_snapshot(self.filename, leaderboards)
+        self._clear_journal()
+
+    def _clear_journal(self) -> None:
+        """Empties the journal once it is merged, then removes the sidecar naming its records."""
+        with open(self.journal, "wb") as file:
+            os.fsync(file.fileno())
+        Path(self.merged).unlink(missing_ok=True)
+
+    def _unmerged(
+            self,
+            leaderboards: EggRollLeaderboards,
+            records: list[dict[str, str | int]]
+    ) -> list[dict[str, str | int]]:
+        """Drops the journal records that an interrupted compaction already merged.
+
+        The sidecar only counts if its digest matches the snapshot, since a compaction
+        stopped before replacing the snapshot merged nothing.
+
+        Args:
+            leaderboards (EggRollLeaderboards): The leaderboards of the snapshot.
+            records (list[dict[str, str | int]]): The journal records.
+
+        Returns:
+            list[dict[str, str | int]]: The records that are not in the snapshot yet.
+        """
+        if not records or not Path(self.merged).is_file():
+            return records
+        sidecar = _read_snapshot(self.merged)
+        if sidecar.get("snapshot") != _digest(leaderboards):
+            return records
+        merged_ids = set(sidecar.get("ids", []))
+        return [record for record in records if record["id"] not in merged_ids]
+
+    def _read_journal(self) -> list[dict[str, str | int]]:
+        """Reads the records of the journal, skipping any record cut short by a crash.
+
+        Returns:
+            list[dict[str, str | int]]: The journal records, oldest first.
+        """
+        if not Path(self.journal).is_file():
+            return []
+        records = []
+        with open(self.journal, "r", encoding="utf-8") as file:
+            for line in file:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if isinstance(record, dict) and {"id", "level", "name", "score"} <= record.keys():
+                    records.append(record)
+        return records
+
+    @staticmethod
+    def _merge(
+            leaderboards: EggRollLeaderboards,
+            records: list[dict[str, str | int]]
+    ) -> EggRollLeaderboards:
+        """Adds journal records to leaderboards, keeping the top scores of each level.
+
+        Args:
+            leaderboards (EggRollLeaderboards): The leaderboards of the snapshot.
+            records (list[dict[str, str | int]]): The journal records to add.
+
+        Returns:
+            EggRollLeaderboards: The merged leaderboards.
+        """
+        merged = {level: list(entries) for level, entries in leaderboards.items()}
+        changed = set()
+        for record in records:
+            entry = {"name": record["name"], "score": record["score"]}
+            merged.setdefault(str(record["level"]), []).append(entry)
+            changed.add(str(record["level"]))
+        for level in changed:
+            merged[level] = _rank(merged[level])
+        return merged
+
+
+class SQLiteLeaderboardStore(LeaderboardStore):
+    """Stores every score in an SQLite database.
+
+    Unlike the JSON stores, all scores are kept, not only the top 10 of each level, so
+    the history of each player can be queried. Scores are indexed by (level, score) and
+    by player, so a level's leaderboard or a player's scores are read without loading
+    the rest of the database.
+
+    Attributes:
+        filename (str): The SQLite database file.
+    """
+
+    def __init__(self, filename: str = LEADERBOARD_DB) -> None:
+        """Opens the database, creating its tables and indexes if needed.
+
+        Args:
+            filename (str): The SQLite database file.
+        """
+        self.filename = filename
+        # The game server calls the store from a thread of its own, not the one that opened it
+        self._connection = sqlite3.connect(filename, timeout=10, check_same_thread=False)
+        self._connection.row_factory = sqlite3.Row
+        with self._connection:
+            self._connection.executescript("""
+                CREATE TABLE IF NOT EXISTS scores (
+                    id INTEGER PRIMARY KEY,
+                    level TEXT NOT NULL,
+                    player TEXT NOT NULL,
+                    score INTEGER NOT NULL,
+                    recorded_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS scores_by_level ON scores (level, score DESC, id);
+                CREATE INDEX IF NOT EXISTS scores_by_player ON scores (player);
+            """)
+
+    def close(self) -> None:
+        """Closes the database connection."""
+        self._connection.close()
+
+    def add_score(self, level_name: str, player_name: str, score: int) -> None:
+        with self._connection:
+            self._connection.execute(
+                "INSERT INTO scores (level, player, score, recorded_at) VALUES (?, ?, ?, ?)",
+                (level_name, player_name, score, time.time())
             )
 
-    def _write(self, leaderboards: EggRollLeaderboards) -> None:
-        """Writes the leaderboard to the JSON file.
+    def top_scores(self, level_name: str, limit: int = LEADERBOARD_SIZE) -> list[dict[str, str | int]]:
+        rows = self._connection.execute(
+            "SELECT player, score FROM scores WHERE level = ? ORDER BY score DESC, id LIMIT ?",
+            (level_name, limit)
+        )
+        return [{"name": row["player"], "score": row["score"]} for row in rows]
+
+    def read_leaderboards(self) -> EggRollLeaderboards:
+        rows = self._connection.execute("""
+            SELECT level, player, score FROM (
+                SELECT level, player, score, id,
+                       ROW_NUMBER() OVER (PARTITION BY level ORDER BY score DESC, id) AS position
+                FROM scores
+            )
+            WHERE position <= ? ORDER BY level, position
+        """, (LEADERBOARD_SIZE,))
+        leaderboards: EggRollLeaderboards = {}
+        for row in rows:
+            leaderboards.setdefault(row["level"], []).append({"name": row["player"], "score": row["score"]})
+        return leaderboards
+
+    def player_history(self, player_name: str) -> list[dict[str, str | int | float]]:
+        """Reads every score of a player, oldest first.
 
         Args:
-            leaderboards (EggRollLeaderboards): Dictionary containing leaderboard data of all levels.
+            player_name (str): The name of the player.
+
+        Returns:
+            list[dict[str, str | int | float]]: The level, score and time (in seconds since
+            the epoch) of each of the player's games.
         """
-        with open(LEADERBOARD_FILE, "w", encoding="utf-8") as file:
-            json.dump(leaderboards, file, indent=4)
+        rows = self._connection.execute(
+            "SELECT level, score, recorded_at FROM scores WHERE player = ? ORDER BY id",
+            (player_name,)
+        )
+        return [dict(row) for row in rows]
+
+    def player_best_scores(self, player_name: str) -> dict[str, int]:
+        """Reads the best score of a player on each level they played.
+
+        Args:
+            player_name (str): The name of the player.
+
+        Returns:
+            dict[str, int]: The player's best score on each level.
+        """
+        rows = self._connection.execute(
+            "SELECT level, MAX(score) AS best FROM scores WHERE player = ? GROUP BY level ORDER BY level",
+            (player_name,)
+        )
+        return {row["level"]: row["best"] for row in rows}
+
+    def global_rankings(self, limit: int = LEADERBOARD_SIZE) -> list[dict[str, str | int]]:
+        """Ranks players by the sum of their best scores on every level.
+
+        Args:
+            limit (int): The number of players to return.
+
+        Returns:
+            list[dict[str, str | int]]: The name, total of best scores, and number of levels
+            played of the top players, highest total first.
+        """
+        rows = self._connection.execute("""
+            SELECT player, SUM(best) AS total, COUNT(*) AS levels FROM (
+                SELECT player, level, MAX(score) AS best FROM scores GROUP BY player, level
+            )
+            GROUP BY player ORDER BY total DESC, player LIMIT ?
+        """, (limit,))
+        return [{"name": row["player"], "total": row["total"], "levels": row["levels"]} for row in rows]
+
+    def import_json(self, filename: str = LEADERBOARD_FILE) -> int:
+        """Imports the scores of a JSON leaderboard (including its journal, if any).
+
+        Scores that are already in the database (with the same level, player and score, as
+        many times) are not imported again, so importing the same file twice has no effect.
+
+        Args:
+            filename (str): The JSON leaderboard file.
+
+        Returns:
+            int: The number of scores imported.
+        """
+        leaderboards = JournalLeaderboardStore(filename).read_leaderboards()
+        existing: dict[tuple[str, str, int], int] = {}
+        seen: Counter[tuple[str, str, int]] = Counter()
+        missing: list[tuple[str, str, int, float]] = []
+        with self._connection:
+            # Entries are inserted in leaderboard order, so tied scores keep their ranking
+            for level, entries in leaderboards.items():
+                for entry in entries:
+                    key = (level, str(entry["name"]), int(entry["score"]))
+                    if key not in existing:
+                        existing[key] = self._connection.execute(
+                            "SELECT COUNT(*) FROM scores WHERE level = ? AND player = ? AND score = ?", key
+                        ).fetchone()[0]
+                    seen[key] += 1
+                    if seen[key] > existing[key]:
+                        missing.append((*key, time.time()))
+            self._connection.executemany(
+                "INSERT INTO scores (level, player, score, recorded_at) VALUES (?, ?, ?, ?)", missing
+            )
+        return len(missing)
+
+
+def default_store() -> LeaderboardStore:
+    """Returns the store used for leaderboards by default.
+
+    The store is chosen with the EGG_ROLL_LEADERBOARD environment variable: 'journal'
+    (the default), 'json', or 'sqlite'. Each kind of store is opened once per process
+    and shared by every later call (so that games do not each open a database
+    connection), which is why callers must not close it.
+
+    Raises:
+        ValueError: If the environment variable names an unknown store.
+    """
+    kind = os.environ.get(STORE_ENV_VAR, "journal").strip().lower()
+    key = (os.getpid(), kind)      # A forked process opens its own connection
+    store = _default_stores.get(key)
+    if store is None:
+        if kind == "journal":
+            store = JournalLeaderboardStore(LEADERBOARD_FILE)
+        elif kind == "json":
+            store = JsonLeaderboardStore(LEADERBOARD_FILE)
+        elif kind == "sqlite":
+            store = SQLiteLeaderboardStore(LEADERBOARD_DB)
+        else:
+            raise ValueError(f"Unknown leaderboard store in {STORE_ENV_VAR}: {kind}")
+        _default_stores[key] = store
+    return store
+
 
 
 def read_leaderboards() -> EggRollLeaderboards:
-    """Reads the leaderboard from the JSON file.
-    
+    """Reads the leaderboards of every level from the default store.
+
+    If the leaderboard file exists but does not have a valid structure, it is treated as empty.
+
+    Returns:
+        EggRollLeaderboards: A dictionary containing leaderboard data for all game levels,
+        or an empty dictionary if there are no leaderboards.
+    """
+    return default_store().read_leaderboards()
+
+
+def _rank(entries: list[dict[str, str | int]]) -> list[dict[str, str | int]]:
+    """Sorts leaderboard entries by score, keeping the top scores (earlier entries win ties).
+
+    Args:
+        entries (list[dict[str, str | int]]): The leaderboard entries of a level.
+
+    Returns:
+        list[dict[str, str | int]]: The top entries, highest score first.
+    """
+    return sorted(entries, key=lambda x: x["score"], reverse=True)[:LEADERBOARD_SIZE]
+
+
+def _digest(leaderboards: EggRollLeaderboards) -> str:
+    """Hashes leaderboards, however their JSON file was formatted.
+
+    Args:
+        leaderboards (EggRollLeaderboards): Dictionary containing leaderboard data of all levels.
+
+    Returns:
+        str: The SHA-256 hash of the leaderboards, in hexadecimal.
+    """
+    return hashlib.sha256(json.dumps(leaderboards, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _read_snapshot(filename: str) -> EggRollLeaderboards:
+    """Reads leaderboards from a JSON file.
+
     If the file exists but does not have a valid structure, an empty dictionary is returned.
 
+    Args:
+        filename (str): The JSON file to read.
+
     Returns:
         EggRollLeaderboards: A dictionary containing leaderboard data for all game levels,
         or an empty dictionary if the file does not exist or is invalid.
     """
-    if Path(LEADERBOARD_FILE).is_file():
-        with open(LEADERBOARD_FILE, "r", encoding="utf-8") as file:
+    if Path(filename).is_file():
+        with open(filename, "r", encoding="utf-8") as file:
             leaderboard = json.load(file)
             if isinstance(leaderboard, dict):
                 return leaderboard
             return {}  # Return an empty dictionary if the structure is invalid
     return {} # File does not exist
+
+
+def _write_snapshot(filename: str, leaderboards: EggRollLeaderboards) -> None:
+    """Replaces a JSON leaderboard file atomically.
+
+    The leaderboards are written to a temporary file next to it, which is then renamed
+    over the old file, so readers see either the old or the new leaderboards.
+
+    Args:
+        filename (str): The JSON file to replace.
+        leaderboards (EggRollLeaderboards): Dictionary containing leaderboard data of all levels.
+    """
+    directory = os.path.dirname(os.path.abspath(filename))
+    fd, temp_name = tempfile.mkstemp(dir=directory, prefix=".leaderboard-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            json.dump(leaderboards, file, indent=4)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_name, filename)
+    except BaseException:
+        os.unlink(temp_name)
+        raise
+
+
+@contextmanager
+def _locked(filename: str) -> Iterator[None]:
+    """Holds an exclusive lock on `<filename>.lock` for the duration of the block.
+
+    Args:
+        filename (str): The leaderboard file to lock.
+    """
+    with open(f"{filename}.lock", "a+b") as lock_file:
+        if os.name == 'nt':
+            import msvcrt    # Use local imports, since each module only exists on one platform
+            lock_file.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:     # LK_LOCK gives up after 10 seconds; keep waiting
+                    continue
+            try:
+                yield
+            finally:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Imports JSON leaderboards into SQLite, and queries the SQLite leaderboards.
+
+    Args:
+        argv (list[str] | None): The command-line arguments. Defaults to sys.argv[1:].
+    """
+    parser = argparse.ArgumentParser(description="Manage the Egg Roll SQLite leaderboards.")
+    parser.add_argument("--db", default=LEADERBOARD_DB, help=f"database file (default: {LEADERBOARD_DB})")
+    commands = parser.add_subparsers(dest="command", required=True)
+    import_command = commands.add_parser("import", help="import the scores of a JSON leaderboard")
+    import_command.add_argument("json_file", nargs="?", default=LEADERBOARD_FILE)
+    top_command = commands.add_parser("top", help="show the top scores of a level")
+    top_command.add_argument("level")
+    top_command.add_argument("--limit", type=int, default=LEADERBOARD_SIZE)
+    player_command = commands.add_parser("player", help="show the best scores and history of a player")
+    player_command.add_argument("name")
+    rankings_command = commands.add_parser("rankings", help="rank players by their total best scores")
+    rankings_command.add_argument("--limit", type=int, default=LEADERBOARD_SIZE)
+    args = parser.parse_args(argv)
+
+    store = SQLiteLeaderboardStore(args.db)
+    try:
+        if args.command == "import":
+            print(f"Imported {store.import_json(args.json_file)} scores into {args.db}.")
+        elif args.command == "top":
+            data = [[idx + 1, entry["name"], entry["score"]]
+                    for idx, entry in enumerate(store.top_scores(args.level, args.limit))]
+            print(create_table(data or [["-", "-", "-"]], ["#", "Name", "Score"], args.level))
+        elif args.command == "player":
+            best = [[level, score] for level, score in store.player_best_scores(args.name).items()]
+            print(create_table(best or [["-", "-"]], ["Level", "Best score"], args.name))
+            print(f"{len(store.player_history(args.name))} games played.")
+        else:
+            data = [[idx + 1, entry["name"], entry["total"], entry["levels"]]
+                    for idx, entry in enumerate(store.global_rankings(args.limit))]
+            print(create_table(data or [["-", "-", "-", "-"]], ["#", "Name", "Total", "Levels"], "Rankings"))
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
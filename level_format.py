@@ -0,0 +1,256 @@
+"""
+Copyright 2025 Renz Jared Rolle.
+
+Licensed under the GNU General Public License, Version 3 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://github.com/renzjared/egg-roll/blob/main/LICENSE
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+@author Renz Jared Rolle <rgrolle@up.edu.ph>
+"""
+
+import argparse
+import mmap
+import struct
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterator
+
+from game_utils import CompactGrid, Grid, TILES
+
+# Packed level layout (little-endian):
+#   header   magic (4 bytes), version (u8), palette size (u8), reserved (u16),
+#            rows (u32), cols (u32), max moves (u32)
+#   palette  one entry per tile code: UTF-8 length (u8), then the UTF-8 bytes of the tile
+#   cells    one tile code (u8) per cell, row by row
+MAGIC = b"EGGR"
+VERSION = 1
+PACKED_EXTENSION = ".eggr"
+_HEADER = struct.Struct("<4sBBHIII")
+
+
+@dataclass
+class PackedHeader:
+    """The header of a packed level file."""
+    rows: int               #: The number of rows of the grid
+    cols: int               #: The number of columns of the grid
+    max_moves: int          #: The maximum number of moves allowed
+    palette: list[str]      #: The tile represented by each code
+    offset: int             #: The position of the first cell in the file
+
+
+def is_packed(filename: str) -> bool:
+    """Checks whether a file is a packed level.
+
+    Args:
+        filename (str): The path to the file.
+
+    Returns:
+        bool: True if the file starts with the packed level magic number.
+    """
+    try:
+        with open(filename, "rb") as file:
+            return file.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def read_header(buffer: Any) -> PackedHeader:
+    """Parses the header and palette of a packed level.
+
+    Args:
+        buffer (Any): The packed level, or its beginning (bytes, mmap, or memoryview).
+
+    Returns:
+        PackedHeader: The parsed header.
+
+    Raises:
+        ValueError: If the buffer is not a packed level, or is of an unsupported version.
+    """
+    if len(buffer) < _HEADER.size:
+        raise ValueError("Not a packed level: the file is too short.")
+    magic, version, palette_size, _, rows, cols, max_moves = _HEADER.unpack_from(buffer, 0)
+    if magic != MAGIC:
+        raise ValueError("Not a packed level: wrong magic number.")
+    if version != VERSION:
+        raise ValueError(f"Unsupported packed level version: {version}")
+
+    palette, offset = [], _HEADER.size
+    for _ in range(palette_size or 256):    # A palette size of 0 stands for 256 tiles
+        length = buffer[offset]
+        palette.append(bytes(buffer[offset + 1:offset + 1 + length]).decode("utf-8"))
+        offset += 1 + length
+    return PackedHeader(rows, cols, max_moves, palette, offset)
+
+
+def load_packed(filename: str) -> CompactGrid:
+    """Opens a packed level as a compact grid.
+
+    The file is memory-mapped and its cells are copied into the board in one block,
+    so no Python object is created per cell.
+
+    Args:
+        filename (str): The path to the packed level.
+
+    Returns:
+        CompactGrid: The level.
+
+    Raises:
+        ValueError: If the file is not a valid packed level.
+    """
+    with open(filename, "rb") as file:
+        if not file.read(len(MAGIC)):
+            raise ValueError("Not a packed level: the file is empty.")
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            header = read_header(view)
+            end = header.offset + header.rows * header.cols
+            if len(view) < end:
+                raise ValueError("Not a packed level: the file is truncated.")
+            with memoryview(view)[header.offset:end] as cells:
+                board = bytearray(cells)    # The only copy of the cells
+    return CompactGrid.from_board(
+        board, header.rows, header.cols, header.palette, header.max_moves, filename
+    )
+
+
+def open_level(filename: str, engine: str = "emoji") -> Grid:
+    """Opens a level file, whether it is a text level (.in) or a packed level.
+
+    Args:
+        filename (str): The path to the level file.
+        engine (str): The board representation to use ('emoji' or 'compact').
+
+    Returns:
+        Grid: The level.
+    """
+    if not is_packed(filename):
+        return Grid(filename=filename, engine=engine)
+    grid = load_packed(filename)
+    if engine == "compact":
+        return grid
+    return Grid(grid_data=(list(grid._rows()), grid.max_moves), filename=filename, engine=engine)
+
+
+def pack_level(source: str, destination: str) -> PackedHeader:
+    """Converts a text level (.in) into a packed level.
+
+    The text level is read twice, one line at a time: once to collect its tiles and
+    dimensions, and once to encode its rows, so it is never held in memory as a whole.
+
+    Args:
+        source (str): The path to the text level.
+        destination (str): The path to write the packed level to.
+
+    Returns:
+        PackedHeader: The header of the packed level.
+
+    Raises:
+        ValueError: If the text level is invalid or uses more than 256 distinct tiles.
+    """
+    palette = list(TILES)
+    rows = cols = 0
+    max_moves = 0
+    for index, line in enumerate(_read_lines(source)):
+        if index == 1:
+            max_moves = int(line)
+        elif index >= 2:
+            if rows and len(line) != cols:
+                raise ValueError("Level rows must all have the same length.")
+            cols = len(line)
+            rows += 1
+            palette.extend(sorted(set(line).difference(palette)))
+    if len(palette) > 256:
+        raise ValueError("A packed level can hold at most 256 distinct tiles.")
+
+    encoded_palette = [tile.encode("utf-8") for tile in palette]
+    with open(destination, "wb") as file:
+        file.write(_HEADER.pack(MAGIC, VERSION, len(palette) % 256, 0, rows, cols, max_moves))
+        for tile in encoded_palette:
+            file.write(bytes((len(tile),)) + tile)
+        # Translating to single-byte code points encodes a whole row without a per-cell loop
+        table = str.maketrans({tile: chr(code) for code, tile in enumerate(palette)})
+        for index, line in enumerate(_read_lines(source)):
+            if index >= 2:
+                file.write(line.translate(table).encode("latin-1"))
+    return PackedHeader(rows, cols, max_moves, palette, _HEADER.size + sum(1 + len(t) for t in encoded_palette))
+
+
+def unpack_level(source: str, destination: str) -> PackedHeader:
+    """Converts a packed level back into a text level (.in), one row at a time.
+
+    Args:
+        source (str): The path to the packed level.
+        destination (str): The path to write the text level to.
+
+    Returns:
+        PackedHeader: The header of the packed level.
+
+    Raises:
+        ValueError: If the source is not a valid packed level.
+    """
+    with open(source, "rb") as file:
+        if not file.read(len(MAGIC)):
+            raise ValueError("Not a packed level: the file is empty.")
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            header = read_header(view)
+            if len(view) < header.offset + header.rows * header.cols:
+                raise ValueError("Not a packed level: the file is truncated.")
+            table = str.maketrans({chr(code): tile for code, tile in enumerate(header.palette)})
+            with open(destination, "w", encoding="utf-8", newline="\n") as output:
+                output.write(f"{header.rows}\n{header.max_moves}\n")
+                for row in range(header.rows):
+                    start = header.offset + row * header.cols
+                    line = view[start:start + header.cols].decode("latin-1").translate(table)
+                    output.write(line + ("\n" if row < header.rows - 1 else ""))
+    return header
+
+
+def _read_lines(filename: str) -> Iterator[str]:
+    """Yields the lines of a text file without their line endings.
+
+    Args:
+        filename (str): The path to the text file.
+
+    Yields:
+        str: Each line of the file.
+    """
+    with open(filename, "r", encoding="utf-8") as file:
+        for line in file:
+            yield line.strip('\n\r')
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Converts levels between the text (.in) and packed formats.
+
+    Args:
+        argv (list[str] | None): The command-line arguments. Defaults to sys.argv[1:].
+    """
+    parser = argparse.ArgumentParser(description="Convert Egg Roll levels to and from the packed format.")
+    parser.add_argument("command", choices=["pack", "unpack"], help="the conversion to perform")
+    parser.add_argument("source", help="the level file to convert")
+    parser.add_argument(
+        "-o", "--output",
+        help=f"where to write the converted level (defaults to the source with a {PACKED_EXTENSION} "
+             "or .in extension)"
+    )
+    args = parser.parse_args(argv)
+
+    if args.command == "pack":
+        destination = args.output or str(Path(args.source).with_suffix(PACKED_EXTENSION))
+        header = pack_level(args.source, destination)
+    else:
+        destination = args.output or str(Path(args.source).with_suffix(".in"))
+        header = unpack_level(args.source, destination)
+    print(f"{args.source} -> {destination} ({header.rows} x {header.cols}, {header.max_moves} moves)")
+
+
+if __name__ == "__main__":
+    main()
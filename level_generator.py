@@ -0,0 +1,276 @@
+"""
+Copyright 2025 Renz Jared Rolle.
+
+Licensed under the GNU General Public License, Version 3 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://github.com/renzjared/egg-roll/blob/main/LICENSE
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+@author Renz Jared Rolle <rgrolle@up.edu.ph>
+"""
+
+import argparse
+import os
+import random
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+
+from batch_eval import evaluate_many
+from game_utils import Grid, Move
+from solver import Solver
+
+PLAYOUTS = 200          # Random move strings played to rate the difficulty of a level
+DEFAULT_TOLERANCE = 0.15
+SEEDS_PER_BATCH = 8     # Seeds handed to each worker before checking how many levels were accepted
+
+
+@dataclass
+class LevelSpec:
+    """The shape of the levels to generate, and which candidates to keep."""
+    rows: int                           #: The number of rows, including the surrounding walls
+    cols: int                           #: The number of columns, including the surrounding walls
+    eggs: int                           #: The number of eggs
+    nests: int                          #: The number of empty nests
+    pans: int = 0                       #: The number of pans
+    walls: int = 0                      #: The number of walls inside the level
+    max_moves: int = 10                 #: The maximum number of moves allowed
+    difficulty: float | None = None     #: The target difficulty, from 0 to 1 (None accepts any)
+    tolerance: float = DEFAULT_TOLERANCE  #: How far from the target difficulty a level may be
+    min_moves: int = 2                  #: The fewest moves the best solution may take
+
+    def validate(self) -> None:
+        """Checks that levels of this shape can be generated.
+
+        Raises:
+            ValueError: If the level is too small for its tiles, or a count is invalid.
+        """
+        if self.rows < 3 or self.cols < 3:
+            raise ValueError("Levels must be at least 3 x 3, including the surrounding walls.")
+        if min(self.eggs, self.nests) < 1 or min(self.pans, self.walls) < 0:
+            raise ValueError("Levels need at least one egg and one nest, and no negative counts.")
+        if self.eggs + self.nests + self.pans + self.walls > (self.rows - 2) * (self.cols - 2):
+            raise ValueError("There are more tiles than cells inside the level.")
+        if self.max_moves < 1:
+            raise ValueError("Levels must allow at least one move.")
+
+
+@dataclass
+class GeneratedLevel:
+    """A generated level that passed verification."""
+    rows: list[str]     #: The rows of the level
+    max_moves: int      #: The maximum number of moves allowed
+    seed: int           #: The seed the level was generated from
+    score: int          #: The best achievable score
+    moves: str          #: A move string that reaches the best score
+    difficulty: float   #: How far random play falls short of the best score, from 0 to 1
+
+    def text(self) -> str:
+        """Returns the level in the text format read by `Grid.read_level`."""
+        return "\n".join([str(len(self.rows)), str(self.max_moves)] + self.rows) + "\n"
+
+
+def random_layout(spec: LevelSpec, seed: int) -> list[str]:
+    """Scatters the tiles of a level over a grid surrounded by walls.
+
+    Args:
+        spec (LevelSpec): The shape of the level.
+        seed (int): The seed of the random generator. The same seed gives the same layout.
+
+    Returns:
+        list[str]: The rows of the level.
+    """
+    rng = random.Random(seed)
+    inner = (spec.rows - 2) * (spec.cols - 2)
+    tiles = ['🥚'] * spec.eggs + ['🪹'] * spec.nests + ['🍳'] * spec.pans + ['🧱'] * spec.walls
+    tiles += ['🟩'] * (inner - len(tiles))
+    rng.shuffle(tiles)
+
+    width = spec.cols - 2
+    level = ['🧱' * spec.cols]
+    for start in range(0, inner, width):
+        level.append('🧱' + ''.join(tiles[start:start + width]) + '🧱')
+    level.append('🧱' * spec.cols)
+    return level
+
+
+def rate_level(rows: list[str], max_moves: int, best_score: int, seed: int = 0) -> float:
+    """Rates how hard a level is by how far random play falls short of the best score.
+
+    Args:
+        rows (list[str]): The rows of the level.
+        max_moves (int): The maximum number of moves allowed.
+        best_score (int): The best achievable score, as found by the solver.
+        seed (int): The seed of the random move strings.
+
+    Returns:
+        float: 1 minus the average share of the best score reached by PLAYOUTS random
+        move strings (negative scores count as 0). 0 is trivial, 1 is hopeless for
+        random play.
+    """
+    if best_score <= 0:
+        return 1.0
+    rng = random.Random(seed)
+    playouts = [''.join(rng.choice('fblr') for _ in range(max_moves)) for _ in range(PLAYOUTS)]
+    scores, _ = evaluate_many(Grid(grid_data=(rows, max_moves)), playouts)
+    return 1 - sum(min(max(score, 0), best_score) for score in scores) / (best_score * len(scores))
+
+
+def try_seed(spec: LevelSpec, seed: int) -> GeneratedLevel | None:
+    """Generates the level of a seed and verifies it.
+
+    A level is rejected if the best solution does not fill every nest it can (as many
+    as there are eggs or nests, whichever is fewer), if it takes fewer than
+    `spec.min_moves` moves, or if its difficulty is too far from the target.
+
+    Args:
+        spec (LevelSpec): The shape of the level.
+        seed (int): The seed of the level.
+
+    Returns:
+        GeneratedLevel | None: The level, or None if it was rejected.
+    """
+    rows = random_layout(spec, seed)
+    grid = Grid(grid_data=(rows, spec.max_moves))
+    solution = Solver(grid).solve()
+    if len(solution.moves) < spec.min_moves:
+        return None
+
+    for m in solution.moves:    # Replay the solution to count the nests it fills
+        grid.moves.append(Move(m))
+        grid.roll(resolution="slide")
+    filled = sum(row.count('🪺') for row in grid.level_state)
+    if filled < min(spec.eggs, spec.nests):
+        return None
+
+    difficulty = rate_level(rows, spec.max_moves, solution.score, seed)
+    if spec.difficulty is not None and abs(difficulty - spec.difficulty) > spec.tolerance:
+        return None
+    return GeneratedLevel(rows, spec.max_moves, seed, solution.score, solution.moves, difficulty)
+
+
+def generate_levels(
+        spec: LevelSpec,
+        count: int,
+        workers: int | None = None,
+        first_seed: int = 0,
+        max_attempts: int | None = None
+) -> list[GeneratedLevel]:
+    """Generates verified levels, trying seeds in parallel across a process pool.
+
+    Seeds are tried in order from `first_seed`, and the accepted levels are returned in
+    seed order, so the result does not depend on the number of workers.
+
+    Args:
+        spec (LevelSpec): The shape of the levels.
+        count (int): The number of levels to generate.
+        workers (int | None): The number of worker processes. Defaults to one per CPU.
+            With a single worker, the seeds are tried in this process.
+        first_seed (int): The first seed to try.
+        max_attempts (int | None): The most seeds to try. Defaults to 1000 per level.
+
+    Returns:
+        list[GeneratedLevel]: The accepted levels. There may be fewer than `count` if
+        `max_attempts` seeds were not enough.
+
+    Raises:
+        ValueError: If levels of this shape cannot be generated.
+    """
+    spec.validate()
+    workers = max(1, workers or os.cpu_count() or 1)
+    max_attempts = max_attempts if max_attempts is not None else 1000 * count
+    batch = workers * SEEDS_PER_BATCH
+    check = partial(try_seed, spec)
+
+    levels: list[GeneratedLevel] = []
+    executor = ProcessPoolExecutor(workers) if workers > 1 else None
+    try:
+        seed, last_seed = first_seed, first_seed + max_attempts
+        while len(levels) < count and seed < last_seed:
+            seeds = range(seed, min(seed + batch, last_seed))
+            if executor is not None:
+                results = executor.map(check, seeds, chunksize=SEEDS_PER_BATCH)
+            else:
+                results = map(check, seeds)
+            levels.extend(level for level in results if level is not None)
+            seed = seeds.stop
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return levels[:count]
+
+
+def write_levels(levels: list[GeneratedLevel], directory: str | Path, prefix: str = "generated") -> list[Path]:
+    """Writes levels as .in files named after their seed.
+
+    Args:
+        levels (list[GeneratedLevel]): The levels to write.
+        directory (str | Path): The directory to write them to. It is created if needed.
+        prefix (str): The start of the file names.
+
+    Returns:
+        list[Path]: The paths of the written files.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for level in levels:
+        path = directory / f"{prefix}_{level.seed}.in"
+        with open(path, "w", encoding="utf-8", newline="\n") as file:
+            file.write(level.text())
+        paths.append(path)
+    return paths
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Generates verified levels and writes them as .in files.
+
+    Args:
+        argv (list[str] | None): The command-line arguments. Defaults to sys.argv[1:].
+    """
+    parser = argparse.ArgumentParser(description="Generate solvable Egg Roll levels.")
+    parser.add_argument("--size", type=int, nargs=2, default=[8, 8], metavar=("ROWS", "COLS"),
+                        help="the size of the levels, including the surrounding walls (default: 8 8)")
+    parser.add_argument("--eggs", type=int, default=3, help="the number of eggs (default: 3)")
+    parser.add_argument("--nests", type=int, default=3, help="the number of nests (default: 3)")
+    parser.add_argument("--pans", type=int, default=2, help="the number of pans (default: 2)")
+    parser.add_argument("--walls", type=int, default=6, help="the number of inner walls (default: 6)")
+    parser.add_argument("--moves", type=int, default=10, help="the maximum number of moves (default: 10)")
+    parser.add_argument("--difficulty", type=float,
+                        help="the target difficulty, from 0 (trivial) to 1 (hard); any if omitted")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help=f"how far from the target difficulty a level may be (default: {DEFAULT_TOLERANCE})")
+    parser.add_argument("--min-moves", type=int, default=2,
+                        help="reject levels solved in fewer moves (default: 2)")
+    parser.add_argument("--count", type=int, default=10, help="the number of levels to generate (default: 10)")
+    parser.add_argument("--seed", type=int, default=0, help="the first seed to try (default: 0)")
+    parser.add_argument("--workers", type=int, help="the number of processes (default: one per CPU)")
+    parser.add_argument("--output", default="generated", help="the directory to write the levels to")
+    args = parser.parse_args(argv)
+
+    spec = LevelSpec(
+        rows=args.size[0], cols=args.size[1], eggs=args.eggs, nests=args.nests, pans=args.pans,
+        walls=args.walls, max_moves=args.moves, difficulty=args.difficulty,
+        tolerance=args.tolerance, min_moves=args.min_moves,
+    )
+    try:
+        levels = generate_levels(spec, args.count, args.workers, args.seed)
+    except ValueError as e:
+        parser.error(str(e))
+    for level, path in zip(levels, write_levels(levels, args.output)):
+        print(f"{path}: best score {level.score} with '{level.moves}', difficulty {level.difficulty:.2f}")
+    if len(levels) < args.count:
+        print(f"[Warning] Only {len(levels)} of {args.count} levels were accepted.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+Copyright 2025 Renz Jared Rolle.
+
+Licensed under the GNU General Public License, Version 3 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://github.com/renzjared/egg-roll/blob/main/LICENSE
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+@author Renz Jared Rolle <rgrolle@up.edu.ph>
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+INDEX_FILE = ".level_index.json"
+INDEX_VERSION = 1       # Bump when the fields of LevelInfo change, to rebuild old indexes
+LEVEL_EXTENSION = ".in"
+
+
+@dataclass
+class LevelInfo:
+    """The metadata of a level file, as stored in the level index."""
+    path: str       #: The path to the level file
+    size: int       #: The size of the file, in bytes
+    mtime_ns: int   #: The modification time of the file, in nanoseconds
+    rows: int       #: The number of rows of the grid
+    cols: int       #: The number of columns of the grid
+    max_moves: int  #: The maximum number of moves allowed
+    eggs: int       #: The number of eggs on the grid
+    nests: int      #: The number of empty nests on the grid
+    sha256: str     #: The SHA-256 hash of the file contents
+
+    @property
+    def name(self) -> str:
+        """str: The file name of the level."""
+        return Path(self.path).name
+
+
+class LevelIndex:
+    """A persistent index of the level files in a directory.
+
+    The index is saved as JSON in the directory itself. Refreshing it only reads the level
+    files that were added or changed (by size or modification time) since the last refresh,
+    so listing a large level library does not open every file.
+
+    Attributes:
+        directory (Path): The directory holding the level files.
+        index_file (Path): The JSON file where the index is saved.
+        levels (dict[str, LevelInfo]): The indexed levels, by path.
+    """
+
+    def __init__(self, directory: str | Path = "", index_file: str | Path | None = None) -> None:
+        """Initializes the index, loading the saved index if there is one.
+
+        Args:
+            directory (str | Path): The directory holding the level files.
+            index_file (str | Path | None): Where the index is saved.
+                Defaults to INDEX_FILE inside the directory.
+        """
+        self.directory = Path(directory)
+        self.index_file = Path(index_file) if index_file is not None else self.directory / INDEX_FILE
+        self.levels: dict[str, LevelInfo] = self._load()
+
+    def refresh(self) -> bool:
+        """Updates the index to match the level files in the directory.
+
+        New and changed files are read; removed files are dropped. Files that are not
+        valid levels are left out of the index. The index is saved if anything changed.
+
+        Returns:
+            bool: True if the index changed.
+        """
+        found: dict[str, LevelInfo] = {}
+        changed = False
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if not entry.name.endswith(LEVEL_EXTENSION) or not entry.is_file():
+                    continue
+                path = str(self.directory / entry.name)
+                stat = entry.stat()
+                known = self.levels.get(path)
+                if known is not None and (known.size, known.mtime_ns) == (stat.st_size, stat.st_mtime_ns):
+                    found[path] = known
+                    continue
+                info = read_level_info(path, stat.st_size, stat.st_mtime_ns)
+                if info is not None:
+                    found[path] = info
+                changed = changed or info != known
+
+        changed = changed or found.keys() != self.levels.keys()
+        self.levels = found
+        if changed:
+            self.save()
+        return changed
+
+    def search(self, query: str = "") -> list[LevelInfo]:
+        """Lists the indexed levels whose file name contains a query, sorted by path.
+
+        Args:
+            query (str): The text to look for in the file names (case-insensitive).
+
+        Returns:
+            list[LevelInfo]: The matching levels.
+        """
+        query = query.strip().lower()
+        return [
+            self.levels[path] for path in sorted(self.levels)
+            if query in self.levels[path].name.lower()
+        ]
+
+    def save(self) -> None:
+        """Saves the index, replacing the saved index atomically."""
+        data = {"version": INDEX_VERSION, "levels": [asdict(info) for info in self.levels.values()]}
+        fd, temp_name = tempfile.mkstemp(dir=self.index_file.parent, prefix=".level_index-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump(data, file)
+            os.replace(temp_name, self.index_file)
+        except BaseException:
+            os.unlink(temp_name)
+            raise
+
+    def _load(self) -> dict[str, LevelInfo]:
+        """Loads the saved index.
+
+        Returns:
+            dict[str, LevelInfo]: The saved levels by path, or an empty dictionary if there
+            is no saved index, or it is invalid or from another version.
+        """
+        try:
+            with open(self.index_file, "r", encoding="utf-8") as file:
+                data = json.load(file)
+            if data.get("version") != INDEX_VERSION:
+                return {}
+            return {entry["path"]: LevelInfo(**entry) for entry in data["levels"]}
+        except (OSError, ValueError, TypeError, KeyError, AttributeError):
+            return {}
+
+
+def read_level_info(path: str, size: int, mtime_ns: int) -> LevelInfo | None:
+    """Reads the metadata of a level file.
+
+    Args:
+        path (str): The path to the level file.
+        size (int): The size of the file, in bytes.
+        mtime_ns (int): The modification time of the file, in nanoseconds.
+
+    Returns:
+        LevelInfo | None: The metadata of the level, or None if it is not a valid level.
+    """
+    try:
+        with open(path, "rb") as file:
+            contents = file.read()
+        lines = contents.decode("utf-8").splitlines()
+        max_moves = int(lines[1])
+        grid = lines[2:]    # Like Grid, every line after the header is a row
+        rows, cols = len(grid), len(grid[0])
+    except (OSError, UnicodeDecodeError, ValueError, IndexError):
+        return None
+
+    return LevelInfo(
+        path=path,
+        size=size,
+        mtime_ns=mtime_ns,
+        rows=rows,
+        cols=cols,
+        max_moves=max_moves,
+        eggs=sum(row.count('🥚') for row in grid),
+        nests=sum(row.count('🪹') for row in grid),
+        sha256=hashlib.sha256(contents).hexdigest(),
+    )
@@ -0,0 +1,470 @@
+"""
+Copyright 2025 Renz Jared Rolle.
+
+Licensed under the GNU General Public License, Version 3 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://github.com/renzjared/egg-roll/blob/main/LICENSE
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+@author Renz Jared Rolle <rgrolle@up.edu.ph>
+"""
+
+import argparse
+import asyncio
+import codecs
+import json
+import os
+import platform
+import random
+import re
+import tempfile
+import time
+import tracemalloc
+
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from benchmark import current_commit
+from game_server import BACKLOG, DEFAULT_HOST, GameServer, LevelCache
+from leaderboard_utils import JsonLeaderboardStore
+from solver import Solver
+from terminal_utils import CLEAR_SCREEN, TILT_DURATION, create_table, load_localization
+
+MOVE_SOURCES: tuple[str, ...] = ("random", "solver")
+PERCENTILES: tuple[int, ...] = (50, 90, 99)
+MOVE_TIMEOUT = 30.0     # Seconds a bot waits for the server to answer before giving up
+LoadTestReport = dict[str, Any]
+
+# A frame is either a full draw (which clears the screen) or an update of the changed
+# cells, which always ends by moving the cursor to the first column below the grid.
+_FRAME = re.compile(re.escape(CLEAR_SCREEN) + r"|\x1b\[\d+;1H")
+
+
+@dataclass
+class BotResult:
+    """What one simulated client measured."""
+    latencies: list[float] = field(default_factory=list)  #: Seconds from sending each move to the next prompt
+    frames: int = 0                 #: Animation frames received while moves were played
+    bytes_received: int = 0         #: Bytes received from the server
+    error: str | None = None        #: Why the bot failed, if it did
+
+
+class _Connection:
+    """The client side of a bot's connection, which waits for the server's prompts."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, timeout: float) -> None:
+        """Initializes the connection.
+
+        Args:
+            reader (asyncio.StreamReader): What the server sends.
+            writer (asyncio.StreamWriter): What is sent to the server.
+            timeout (float): Seconds to wait for each answer of the server.
+        """
+        self.reader = reader
+        self.writer = writer
+        self.timeout = timeout
+        self.bytes_received = 0
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._text = ""
+
+    async def send(self, line: str) -> None:
+        """Sends a line to the server."""
+        self.writer.write(f"{line}\n".encode("utf-8"))
+        await self.writer.drain()
+
+    async def expect(self, *prompts: str) -> tuple[str, str]:
+        """Reads until the server shows one of the prompts.
+
+        Args:
+            *prompts (str): The prompts to wait for.
+
+        Returns:
+            tuple[str, str]: The prompt shown, and everything received before it.
+
+        Raises:
+            ConnectionError: If the server closed the connection first.
+            TimeoutError: If the server did not answer in time.
+        """
+        deadline = time.monotonic() + self.timeout
+        while True:
+            found = [(self._text.find(prompt), prompt) for prompt in prompts if prompt in self._text]
+            if found:
+                index, prompt = min(found)
+                received = self._text[:index]
+                self._text = self._text[index + len(prompt):]
+                return prompt, received
+            data = await asyncio.wait_for(self.reader.read(65536), max(deadline - time.monotonic(), 0))
+            if not data:
+                raise ConnectionError("the server closed the connection")
+            self.bytes_received += len(data)
+            self._text += self._decoder.decode(data)
+
+    async def close(self) -> None:
+        """Closes the connection, reading whatever the server still sends."""
+        try:
+            while data := await asyncio.wait_for(self.reader.read(65536), self.timeout):
+                self.bytes_received += len(data)
+        finally:
+            self.writer.close()
+
+
+async def run_bot(
+        host: str,
+        port: int,
+        level: str,
+        moves: str,
+        name: str = "bot",
+        ready: "asyncio.Future[None] | None" = None,
+        start: asyncio.Event | None = None,
+        timeout: float = MOVE_TIMEOUT
+) -> BotResult:
+    """Plays one game against a server, one move per line, timing every move.
+
+    Args:
+        host (str): The address of the server.
+        port (int): The port of the server.
+        level (str): The name of the level to play.
+        moves (str): The moves to play. The bot exits once they run out.
+        name (str): The name entered for the leaderboard if the game ends.
+        ready (asyncio.Future[None] | None): Resolved once the level is on screen (or the bot failed).
+        start (asyncio.Event | None): Waited for before playing the first move.
+        timeout (float): Seconds to wait for each answer of the server.
+
+    Returns:
+        BotResult: The measurements of the bot.
+    """
+    loc = load_localization("en")
+    moves_prompt = str(loc["prompt_enter_moves_or_cmd"])
+    name_prompt = str(loc["prompt_name_leaderboard"])
+    again_prompt = str(loc["prompt_play_again"])
+    level_prompt = f"{loc['prompt_enter_level']}: "
+
+    result = BotResult()
+    connection: _Connection | None = None
+    try:
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+        connection = _Connection(reader, writer, timeout)
+        await connection.expect("]: ")           # Language prompt
+        await connection.send("en")
+        await connection.expect(level_prompt)
+        await connection.send(level)
+        await connection.expect(moves_prompt)
+        if ready is not None and not ready.done():
+            ready.set_result(None)
+        if start is not None:
+            await start.wait()
+
+        prompt = moves_prompt
+        for move in moves:
+            sent = time.perf_counter()
+            await connection.send(move)
+            prompt, received = await connection.expect(moves_prompt, name_prompt)
+            result.latencies.append(time.perf_counter() - sent)
+            result.frames += len(_FRAME.findall(received))
+            if prompt == name_prompt:
+                break
+
+        if prompt == name_prompt:    # The game ended: save the score and leave
+            await connection.send(name)
+            await connection.expect(again_prompt)
+            await connection.send("n")
+            await connection.expect(level_prompt)
+        await connection.send("exit")
+        await connection.close()
+    except (OSError, asyncio.TimeoutError) as e:
+        result.error = type(e).__name__
+    finally:
+        if ready is not None and not ready.done():
+            ready.set_result(None)
+        if connection is not None:
+            result.bytes_received = connection.bytes_received
+            connection.writer.close()
+    return result
+
+
+def move_strings(levels: LevelCache, clients: int, source: str = "random", seed: int = 0) -> list[tuple[str, str]]:
+    """Chooses the level and moves of every bot, going round the levels in turn.
+
+    Args:
+        levels (LevelCache): The levels to play.
+        clients (int): The number of bots.
+        source (str): 'random' for random moves (as many as the level allows), or
+            'solver' for the best solution of each level.
+        seed (int): The seed of the random moves.
+
+    Returns:
+        list[tuple[str, str]]: The level name and the moves of every bot.
+    """
+    names = levels.names()
+    solutions = {}
+    if source == "solver":
+        solutions = {name: Solver(levels.open(name)).solve().moves for name in names}
+    rng = random.Random(seed)
+    plays = []
+    for i in range(clients):
+        name = names[i % len(names)]
+        if source == "solver":
+            plays.append((name, solutions[name]))
+        else:
+            max_moves = levels.open(name).max_moves
+            plays.append((name, ''.join(rng.choice('fblr') for _ in range(max_moves))))
+    return plays
+
+
+async def run_load_test(
+        levels: LevelCache,
+        clients: int,
+        source: str = "random",
+        seed: int = 0,
+        tilt_duration: float = TILT_DURATION,
+        address: tuple[str, int] | None = None,
+        timeout: float = MOVE_TIMEOUT
+) -> LoadTestReport:
+    """Opens many simulated clients against a game server and measures how it copes.
+
+    Unless an address is given, a server is started in this process (with a throwaway
+    leaderboard), so that the memory it uses per session can be measured. The bots run
+    in this process too, so the memory they use is measured first, with the same bots
+    connected to a stub server that only shows the prompts, and taken away. The bots
+    all connect and open their level first; only then do they start playing, so every
+    session is active at once.
+
+    Args:
+        levels (LevelCache): The levels to play.
+        clients (int): The number of simulated clients.
+        source (str): Where the moves come from ('random' or 'solver').
+        seed (int): The seed of the random moves.
+        tilt_duration (float): Seconds the in-process server spends animating one tilt.
+        address (tuple[str, int] | None): The host and port of a running server to test instead.
+        timeout (float): Seconds a bot waits for each answer of the server.
+
+    Returns:
+        LoadTestReport: The configuration, duration, error counts, move latency
+        percentiles (in milliseconds), frame throughput and memory per session (what a
+        game session adds on the server, beyond the bare connection).
+    """
+    plays = move_strings(levels, clients, source, seed)
+    with tempfile.TemporaryDirectory() as directory:
+        listener = None
+        if address is None:
+            store = JsonLeaderboardStore(os.path.join(directory, "leaderboard.json"))
+            server = GameServer(levels, store, tilt_duration=tilt_duration)
+            listener = await server.start(DEFAULT_HOST, 0)
+            address = listener.sockets[0].getsockname()[:2]
+        host, port = address
+
+        start = asyncio.Event()
+        measure_memory = listener is not None and not tracemalloc.is_tracing()
+        memory = None
+        if measure_memory:
+            tracemalloc.start()
+            baseline = await _stub_memory(plays, timeout)
+            before = tracemalloc.get_traced_memory()[0]
+        bots = await _connect_bots(host, port, plays, start, timeout)
+        if measure_memory:
+            used = tracemalloc.get_traced_memory()[0] - before
+            memory = max(used - baseline, 0) // max(clients, 1)
+            tracemalloc.stop()    # Tracing would slow down the moves being timed
+
+        began = time.perf_counter()
+        start.set()
+        results = await asyncio.gather(*bots)
+        duration = time.perf_counter() - began
+        if listener is not None:
+            listener.close()
+            await listener.wait_closed()
+
+    latencies = sorted(latency for result in results for latency in result.latencies)
+    errors: dict[str, int] = {}
+    for result in results:
+        if result.error:
+            errors[result.error] = errors.get(result.error, 0) + 1
+    frames = sum(result.frames for result in results)
+    return {
+        "commit": current_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {
+            "clients": clients, "levels": levels.names(), "moves": source, "seed": seed,
+            "tilt_duration": tilt_duration if listener is not None else None,
+            "server": None if listener is not None else f"{host}:{port}",
+        },
+        "duration": duration,
+        "moves": len(latencies),
+        "errors": errors,
+        "error_rate": sum(errors.values()) / max(clients, 1),
+        "latency_ms": _latency_summary(latencies),
+        "frames": frames,
+        "frames_per_sec": frames / duration if duration > 0 else 0.0,
+        "bytes_received": sum(result.bytes_received for result in results),
+        "memory_per_session_bytes": memory,
+    }
+
+
+async def _connect_bots(
+        host: str,
+        port: int,
+        plays: list[tuple[str, str]],
+        start: asyncio.Event,
+        timeout: float
+) -> "list[asyncio.Task[BotResult]]":
+    """Starts a bot for every play, and waits until each has its level on screen (or failed).
+
+    Args:
+        host (str): The address of the server.
+        port (int): The port of the server.
+        plays (list[tuple[str, str]]): The level name and the moves of every bot.
+        start (asyncio.Event): Set to let the bots play their moves.
+        timeout (float): Seconds a bot waits for each answer of the server.
+
+    Returns:
+        list[asyncio.Task[BotResult]]: The bots, waiting for `start`.
+    """
+    loop = asyncio.get_running_loop()
+    ready = [loop.create_future() for _ in plays]
+    bots = [
+        asyncio.create_task(run_bot(host, port, level, moves, f"bot{i}", ready[i], start, timeout))
+        for i, (level, moves) in enumerate(plays)
+    ]
+    await asyncio.gather(*ready)
+    return bots
+
+
+async def _stub_memory(plays: list[tuple[str, str]], timeout: float) -> int:
+    """Measures the memory traced while the bots are connected to a stub server.
+
+    The stub only shows the prompts a bot waits for before playing, so what it measures
+    is mostly the bots' side of the connections (and the bare server side of them).
+
+    Args:
+        plays (list[tuple[str, str]]): The level name and the moves of every bot.
+        timeout (float): Seconds a bot waits for each answer of the stub.
+
+    Returns:
+        int: The bytes traced while the bots were connected.
+    """
+    loc = load_localization("en")
+    prompts = [f"{loc['prompt_enter_level']}: ", str(loc["prompt_enter_moves_or_cmd"])]
+
+    async def stub_session(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        writer.write("Language / Wika []: ".encode("utf-8"))
+        for prompt in prompts:
+            await reader.readline()
+            writer.write(prompt.encode("utf-8"))
+        await reader.read()     # Until the bot disconnects
+        writer.close()
+
+    listener = await asyncio.start_server(stub_session, DEFAULT_HOST, 0, backlog=BACKLOG)
+    host, port = listener.sockets[0].getsockname()[:2]
+    before = tracemalloc.get_traced_memory()[0]
+    bots = await _connect_bots(host, port, plays, asyncio.Event(), timeout)
+    used = tracemalloc.get_traced_memory()[0] - before
+    for bot in bots:
+        bot.cancel()
+    await asyncio.gather(*bots, return_exceptions=True)
+    listener.close()
+    await listener.wait_closed()
+    return used
+
+
+def _latency_summary(latencies: list[float]) -> dict[str, float | None]:
+    """Summarizes sorted latencies (in seconds) as milliseconds.
+
+    Args:
+        latencies (list[float]): The latencies, sorted.
+
+    Returns:
+        dict[str, float | None]: The mean, the PERCENTILES (nearest rank) and the maximum,
+        or None for each of them if there are no latencies.
+    """
+    summary: dict[str, float | None] = {"mean": None, **{f"p{p}": None for p in PERCENTILES}, "max": None}
+    if latencies:
+        summary["mean"] = sum(latencies) / len(latencies) * 1000
+        for p in PERCENTILES:
+            rank = max(1, -(-p * len(latencies) // 100))    # Ceiling of p% of the count
+            summary[f"p{p}"] = latencies[rank - 1] * 1000
+        summary["max"] = latencies[-1] * 1000
+    return summary
+
+
+def summary_table(report: LoadTestReport) -> str:
+    """Formats a load test report as a table.
+
+    Args:
+        report (LoadTestReport): The report returned by `run_load_test`.
+
+    Returns:
+        str: The formatted table.
+    """
+    def ms(value: float | None) -> str:
+        return f"{value:.1f} ms" if value is not None else "-"
+
+    latency = report["latency_ms"]
+    memory = report["memory_per_session_bytes"]
+    data: list[list[str | int]] = [
+        ["Clients", report["config"]["clients"]],
+        ["Moves played", report["moves"]],
+        ["Duration", f"{report['duration']:.2f} s"],
+        ["Errors", ", ".join(f"{error}: {count}" for error, count in report["errors"].items()) or "0"],
+        ["Error rate", f"{report['error_rate']:.1%}"],
+        *[[f"Latency {key}", ms(latency[key])] for key in latency],
+        ["Frames/s", f"{report['frames_per_sec']:.1f}"],
+        ["Memory/session", f"{memory / 1024:.1f} KiB" if memory is not None else "-"],
+    ]
+    return create_table(data, ["Metric", "Value"], "Egg Roll Server Load Test")
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Runs a load test against a game server and saves the report as JSON.
+
+    Args:
+        argv (list[str] | None): The command-line arguments. Defaults to sys.argv[1:].
+    """
+    parser = argparse.ArgumentParser(description="Simulate many clients playing on an Egg Roll game server.")
+    parser.add_argument("levels", nargs="*", help="level files to play (default: every level in the current directory)")
+    parser.add_argument("--clients", type=int, default=100, help="the number of simulated clients (default: 100)")
+    parser.add_argument("--moves", choices=MOVE_SOURCES, default="random",
+                        help="play random moves, or the solver's best solution (default: random)")
+    parser.add_argument("--seed", type=int, default=0, help="the seed of the random moves (default: 0)")
+    parser.add_argument(
+        "--tilt-duration", type=float, default=TILT_DURATION, metavar="SECONDS",
+        help=f"time the in-process server spends animating each tilt (default: {TILT_DURATION})"
+    )
+    parser.add_argument("--server", metavar="HOST:PORT",
+                        help="test a running server instead of one started in this process")
+    parser.add_argument("--timeout", type=float, default=MOVE_TIMEOUT,
+                        help=f"seconds to wait for each answer of the server (default: {MOVE_TIMEOUT})")
+    parser.add_argument("--output", default="load_test_results.json", help="where to save the report")
+    args = parser.parse_args(argv)
+
+    levels = LevelCache(args.levels) if args.levels else LevelCache.from_directory()
+    if not levels:
+        parser.error("no levels to play")
+    if args.clients < 1:
+        parser.error("at least one client is needed")
+    address = None
+    if args.server:
+        host, _, port = args.server.rpartition(":")
+        if not host or not port.isdigit():
+            parser.error("--server must be given as HOST:PORT")
+        address = (host, int(port))
+
+    report = asyncio.run(run_load_test(
+        levels, args.clients, args.moves, args.seed, args.tilt_duration, address, args.timeout
+    ))
+    Path(args.output).write_text(json.dumps(report, indent=4), encoding="utf-8")
+    print(summary_table(report))
+
+
+if __name__ == "__main__":
+    main()
@@ -16,18 +16,20 @@ limitations under the License.
 @author Renz Jared Rolle <rgrolle@up.edu.ph>
 """
 
-import json
 import sys
 import time
 from pathlib import Path
 
+from level_index import LevelIndex, LevelInfo
 from terminal_utils import (
     center_text, clear_screen, color_text, print_format, create_table,
-    load_localization, terminal_dimensions
+    load_localization, set_language, terminal_dimensions
 )
 
 EggRollLocalization = dict[str, str | list[str]]
 
+LEVELS_PER_PAGE = 10
+
 
 def display_instructions() -> None:
     """Displays the game instructions to the player."""
@@ -52,49 +54,73 @@ def display_instructions() -> None:
 
 
 def display_levels() -> str | None:
-    """Displays the list of available levels and prompts the player to select one."""
+    """Displays the list of available levels and prompts the player to select one.
+
+    Levels are read from the level index, a page at a time. Besides a level number or
+    file name, the player can enter 'n' or 'p' to change pages, or '/text' to only list
+    the levels whose names contain the text ('/' alone lists every level again).
+
+    Returns:
+        str | None: The path to the selected level file, or None if there are no levels.
+    """
     loc: EggRollLocalization = load_localization()
-    clear_screen()
-    levels_dir = Path("")
-    levels: list[str] = sorted(str(level) for level in levels_dir.glob("*.in"))
+    index = LevelIndex(Path(""))
+    index.refresh()
+    page, query = 0, ""
 
-    if not levels:
-        # Print error message
-        print_format(str(loc["error_no_levels_found"]), is_centered=True, args=["red"])
+    while True:
+        clear_screen()
+        levels: list[LevelInfo] = index.search(query)
+        if not index.levels:
+            # Print error message
+            print_format(str(loc["error_no_levels_found"]), is_centered=True, args=["red"])
+            print_format(
+                f"\n{loc['prompt_press_enter_to_return']}",
+                is_centered=True,
+                args=["yellow", None, ('blink',)]
+            )
+            input()
+            return None
+
+        # If levels are found:
+        pages = max(1, -(-len(levels) // LEVELS_PER_PAGE))
+        page = min(page, pages - 1)
+        first = page * LEVELS_PER_PAGE
+        data: list[list[str | int]] = [
+            [idx, level.name, f"{level.rows} x {level.cols}", level.max_moves]
+            for idx, level in enumerate(levels[first:first + LEVELS_PER_PAGE], first + 1)
+        ] or [["-", str(loc["error_no_levels_match"]).format(query=query), "-", "-"]]
+        headers = ["#", loc['game_level_name'], loc['game_size'], loc['game_max_moves']]
+        title: str = str(loc["level_selector_title"])
+        table: str = create_table(data, headers, title)
+        print(table)
         print_format(
-            f"\n{loc['prompt_press_enter_to_return']}",
-            is_centered=True,
-            args=["yellow", None, ('blink',)]
+            str(loc["level_selector_page"]).format(page=page + 1, pages=pages), is_centered=True
         )
-        input()
-        return None
-
-    # If levels are found:
-    data: list[list[str | int]] = []
-    for idx, level in enumerate(levels, 1):
-        rows, columns, moves_allowed = parse_level(level)
-        data.append([idx, Path(level).name, f"{rows} x {columns}", moves_allowed])
-    headers = ["#", loc['game_level_name'], loc['game_size'], loc['game_max_moves']]
-    title: str = str(loc["level_selector_title"])
-    table: str = create_table(data, headers, title)
-    print(table)
-    print() # Blank line to separate table
-
-    # Ask the player for level to be played
-    prompt = center_text(f"\n{loc['prompt_enter_level']} (1–{len(levels)}): ", pad_right=False)
-    choice = input(color_text(prompt, ["yellow", None, ('blink',)]))
-    try:
-        level_index = int(choice) - 1
-        if 0 <= level_index < len(levels):
-            return levels[level_index]
-        raise ValueError
-    except ValueError:
-        if choice in levels:    # Check if the player entered a valid level file name
-            return choice
-        print_format(f"\n{loc['error_invalid_choice']}".format(choice=choice), True, args=["red"])
-        time.sleep(1.5)
-        display_levels()
-        return None
+        print_format(str(loc["level_selector_hint"]), is_centered=True, args=["cyan"])
+
+        # Ask the player for level to be played
+        prompt = center_text(f"\n{loc['prompt_enter_level']} (1–{len(levels)}): ", pad_right=False)
+        choice = input(color_text(prompt, ["yellow", None, ('blink',)])).strip()
+        if choice.lower() == 'n':
+            page = min(page + 1, pages - 1)
+            continue
+        if choice.lower() == 'p':
+            page = max(page - 1, 0)
+            continue
+        if choice.startswith('/'):
+            page, query = 0, choice[1:]
+            continue
+        try:
+            level_index = int(choice) - 1
+            if 0 <= level_index < len(levels):
+                return levels[level_index].path
+            raise ValueError
+        except ValueError:
+            if choice in index.levels:    # Check if the player entered a valid level file name
+                return choice
+            print_format(f"\n{loc['error_invalid_choice']}".format(choice=choice), True, args=["red"])
+            time.sleep(1.5)
 
 
 def display_main_menu() -> None:
@@ -153,11 +179,7 @@ def display_main_menu() -> None:
 
         # Change game language
         elif choice.strip() == '3':
-            language_code = "tl" if loc["language"] == "en" else "en"
-            settings_file = Path("localization") / "settings.json"
-            with open(settings_file, "w", encoding="utf-8") as file:
-                json.dump({"language": language_code}, file)
-            loc = load_localization()
+            loc = set_language("tl" if loc["language"] == "en" else "en")
             display_main_menu()    # Reload main menu
 
         # Show credits
@@ -186,21 +208,3 @@ def display_main_menu() -> None:
             error_msg: str = str(loc["error_invalid_choice"])
             print_format(error_msg.format(choice=choice), True, args=["red"])
             time.sleep(1.5)
-
-
-def parse_level(level_path: str) -> tuple[int, int, int]:
-    """
-    Parses the level file to extract the dimensions of the grid and the number of moves allowed.
-
-    Args:
-        level_path (str): The path to the level file.
-
-    Returns:
-        tuple[int, int, int]: A tuple containing the dimensions, and the number of moves allowed.
-    """
-    with open(level_path, 'r', encoding="utf-8") as file:
-        lines: list[str] = file.readlines()
-        rows: int = len(lines) - 2            # Exclude the first two lines (metadata)
-        columns: int = len(lines[2].strip())  # Assume all rows have the same number of columns
-        moves_allowed: int = int(lines[1].strip())
-    return (rows, columns, moves_allowed)
@@ -0,0 +1,324 @@
+"""
+Copyright 2025 Renz Jared Rolle.
+
+Licensed under the GNU General Public License, Version 3 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://github.com/renzjared/egg-roll/blob/main/LICENSE
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+@author Renz Jared Rolle <rgrolle@up.edu.ph>
+"""
+
+import hashlib
+import os
+import struct
+import tempfile
+import zlib
+
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from game_utils import EggRollGrid, Grid, Move
+from level_format import open_level
+
+# Save file layout (little-endian):
+#   header       magic (4 bytes), version (u8), reserved (u8), checkpoint interval (u16),
+#                SHA-256 of the level file (32 bytes), move count (u32), points (i32)
+#   moves        two bits per move (MOVE_CODES), four moves per byte, first move in the low bits
+#   checkpoints  after every `checkpoint interval` moves: points (i32), CRC-32 of the grid (u32)
+MAGIC = b"EGGS"
+VERSION = 1
+SAVE_DIR = Path("saves")
+SAVE_EXTENSION = ".eggsave"
+MOVE_CODES = "fblr"
+CHECKPOINT_INTERVAL = 64    # Moves between checkpoints; short games have none
+_HEADER = struct.Struct("<4sBBH32sIi")
+_CHECKPOINT = struct.Struct("<iI")
+
+
+@dataclass
+class SaveState:
+    """A game in progress, stored as the moves played instead of the grids they led to."""
+    level_hash: bytes                   #: The SHA-256 hash of the level file
+    moves: str                          #: The moves played, as 'f', 'b', 'l' and 'r'
+    points: int                         #: The points earned so far
+    checkpoint_interval: int = 0        #: Moves between checkpoints (0 for none)
+    checkpoints: list[tuple[int, int]] = field(default_factory=list)  #: Points and grid CRC-32 at each checkpoint
+
+    def to_bytes(self) -> bytes:
+        """Encodes the save state in the save file format.
+
+        Returns:
+            bytes: The contents of the save file.
+        """
+        header = _HEADER.pack(
+            MAGIC, VERSION, 0, self.checkpoint_interval, self.level_hash, len(self.moves), self.points
+        )
+        checkpoints = b''.join(_CHECKPOINT.pack(points, crc) for points, crc in self.checkpoints)
+        return header + pack_moves(self.moves) + checkpoints
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "SaveState":
+        """Decodes the contents of a save file.
+
+        Args:
+            data (bytes): The contents of the save file.
+
+        Returns:
+            SaveState: The decoded save state.
+
+        Raises:
+            ValueError: If the data is not a save file, is of an unsupported version,
+                or is truncated.
+        """
+        if len(data) < _HEADER.size:
+            raise ValueError("Not a save file: the file is too short.")
+        magic, version, _, interval, level_hash, count, points = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError("Not a save file: wrong magic number.")
+        if version != VERSION:
+            raise ValueError(f"Unsupported save file version: {version}")
+
+        offset = _HEADER.size + (count + 3) // 4
+        checkpoints = count // interval if interval else 0
+        if len(data) != offset + checkpoints * _CHECKPOINT.size:
+            raise ValueError("Not a save file: the file is truncated or too long.")
+        moves = unpack_moves(data[_HEADER.size:offset], count)
+        return cls(level_hash, moves, points, interval, [
+            _CHECKPOINT.unpack_from(data, offset + i * _CHECKPOINT.size) for i in range(checkpoints)
+        ])
+
+
+def pack_moves(moves: str) -> bytes:
+    """Packs moves into two bits each.
+
+    Args:
+        moves (str): The moves, as 'f', 'b', 'l' and 'r' (in either case).
+
+    Returns:
+        bytes: The packed moves, four per byte.
+    """
+    packed = bytearray((len(moves) + 3) // 4)
+    for i, move in enumerate(moves.lower()):
+        packed[i // 4] |= MOVE_CODES.index(move) << (i % 4 * 2)
+    return bytes(packed)
+
+
+def unpack_moves(packed: bytes, count: int) -> str:
+    """Unpacks moves packed by `pack_moves`.
+
+    Args:
+        packed (bytes): The packed moves.
+        count (int): The number of moves.
+
+    Returns:
+        str: The moves, as 'f', 'b', 'l' and 'r'.
+    """
+    return ''.join(MOVE_CODES[packed[i // 4] >> (i % 4 * 2) & 3] for i in range(count))
+
+
+def level_hash(filename: str) -> bytes:
+    """Hashes the contents of a level file, so that a save is only resumed on the same level.
+
+    Args:
+        filename (str): The path to the level file.
+
+    Returns:
+        bytes: The SHA-256 hash of the file.
+    """
+    with open(filename, "rb") as file:
+        return hashlib.file_digest(file, "sha256").digest()
+
+
+def grid_checksum(level_state: EggRollGrid) -> int:
+    """Returns the CRC-32 of a grid, whichever engine it came from.
+
+    Args:
+        level_state (EggRollGrid): The grid.
+
+    Returns:
+        int: The checksum.
+    """
+    return zlib.crc32('\n'.join(''.join(row) for row in level_state).encode("utf-8"))
+
+
+def capture(
+        game: Grid,
+        filename: str,
+        checkpoint_interval: int = CHECKPOINT_INTERVAL,
+        digest: bytes | None = None
+) -> SaveState:
+    """Captures a game in progress.
+
+    The grids of the checkpoints are rebuilt from the game's undo journal.
+
+    Args:
+        game (Grid): The game.
+        filename (str): The path to the level file.
+        checkpoint_interval (int): Moves between checkpoints (0 for none).
+        digest (bytes | None): The `level_hash` of the level file, if already known.
+
+    Returns:
+        SaveState: The save state of the game.
+    """
+    checkpoints = []
+    if checkpoint_interval:
+        for played in range(checkpoint_interval, len(game.moves) + 1, checkpoint_interval):
+            level_state, points = game.level_states[played]
+            checkpoints.append((points, grid_checksum(level_state)))
+    moves = ''.join(move.move_string for move in game.moves)
+    return SaveState(digest or level_hash(filename), moves, game.points, checkpoint_interval, checkpoints)
+
+
+def restore(filename: str, state: SaveState, engine: str = "emoji", digest: bytes | None = None) -> Grid:
+    """Rebuilds a saved game by replaying its moves.
+
+    The moves are replayed with the compact engine, resolving every tilt straight to
+    its final grid, which also records the moves in the game's undo journal, so they
+    can still be undone. The game is then moved to the requested engine once.
+
+    Args:
+        filename (str): The path to the level file.
+        state (SaveState): The save state of the game.
+        engine (str): The board representation of the game returned ('emoji' or
+            'compact'), as for `open_level`.
+        digest (bytes | None): The `level_hash` of the level file, if already known.
+
+    Returns:
+        Grid: The game, as it was when it was saved.
+
+    Raises:
+        ValueError: If the save is of another level, or replaying it does not give the
+            saved checkpoints and points.
+    """
+    if state.level_hash != (digest or level_hash(filename)):
+        raise ValueError("The save file belongs to a different version of the level.")
+    game = open_level(filename, engine="compact")
+    checkpoints = iter(state.checkpoints)
+    for played, m in enumerate(state.moves, 1):
+        game.moves.append(Move(m))
+        for _ in game.iter_roll(frames="delta", skip_intermediate=True):
+            pass
+        if state.checkpoint_interval and played % state.checkpoint_interval == 0:
+            if next(checkpoints) != (game.points, grid_checksum(game.level_state)):
+                raise ValueError(f"The saved game does not match its checkpoint after {played} moves.")
+    if game.points != state.points:
+        raise ValueError("The saved game does not match its points.")
+    return _on_engine(game, filename, engine)
+
+
+def _on_engine(game: Grid, filename: str, engine: str) -> Grid:
+    """Moves a game to another engine, with its moves, points and undo history.
+
+    Args:
+        game (Grid): The game.
+        filename (str): The path to the level file.
+        engine (str): The board representation to use ('emoji' or 'compact').
+
+    Returns:
+        Grid: The game on that engine (the game itself if it already uses it).
+    """
+    if game.engine == engine:
+        return game
+    moved = Grid(grid_data=(list(game._rows()), game.max_moves), filename=filename, engine=engine)
+    # The journal's changes are tiles, which every engine shares, but its checkpoints
+    # are in the format of each engine
+    journal = moved.level_states
+    for played, (checkpoint, points) in game.level_states.checkpoints.items():
+        moved.level_state = game._restore_checkpoint(checkpoint)
+        journal.checkpoints[played] = (moved._checkpoint(), points)
+    journal.entries = game.level_states.entries
+    moved.level_state = game.copy_grid()
+    moved.moves, moved.points = game.moves, game.points
+    return moved
+
+
+def save_path(filename: str, digest: bytes | None = None) -> Path:
+    """Returns where the save of a level is kept.
+
+    Saves are named after the level and a hash of both its full path and its contents,
+    so a level that changes is never resumed from an old save, and two level files with
+    the same contents each keep their own save.
+
+    Args:
+        filename (str): The path to the level file.
+        digest (bytes | None): The `level_hash` of the level file, if already known.
+
+    Returns:
+        Path: The path to the save file.
+    """
+    path = Path(filename).resolve()
+    key = hashlib.sha256(str(path).encode("utf-8") + (digest or level_hash(filename))).hexdigest()[:16]
+    return SAVE_DIR / f"{path.stem}-{key}{SAVE_EXTENSION}"
+
+
+def save_game(game: Grid, filename: str) -> Path:
+    """Saves a game in progress, replacing the previous save of the level.
+
+    The level file is read and hashed once, for both the name and the contents of the save.
+
+    Args:
+        game (Grid): The game.
+        filename (str): The path to the level file.
+
+    Returns:
+        Path: The path to the save file.
+    """
+    digest = level_hash(filename)
+    path = save_path(filename, digest)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_name = tempfile.mkstemp(dir=path.parent, prefix=".save-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(capture(game, filename, digest=digest).to_bytes())
+        os.replace(temp_name, path)
+    except BaseException:
+        os.unlink(temp_name)
+        raise
+    return path
+
+
+def load_game(filename: str, engine: str = "emoji") -> Grid | None:
+    """Resumes the saved game of a level, if there is one.
+
+    Args:
+        filename (str): The path to the level file.
+        engine (str): The board representation to use ('emoji' or 'compact').
+
+    Returns:
+        Grid | None: The saved game, or None if there is no usable save.
+    """
+    digest = level_hash(filename)
+    path = save_path(filename, digest)
+    try:
+        return restore(filename, SaveState.from_bytes(path.read_bytes()), engine, digest)
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def has_save(filename: str) -> bool:
+    """Checks whether a level has a saved game.
+
+    Args:
+        filename (str): The path to the level file.
+
+    Returns:
+        bool: True if a save file exists for the level.
+    """
+    return save_path(filename).is_file()
+
+
+def delete_save(filename: str) -> None:
+    """Deletes the saved game of a level, if there is one.
+
+    Args:
+        filename (str): The path to the level file.
+    """
+    save_path(filename).unlink(missing_ok=True)
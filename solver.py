@@ -0,0 +1,360 @@
+"""
+Copyright 2025 Renz Jared Rolle.
+
+Licensed under the GNU General Public License, Version 3 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://github.com/renzjared/egg-roll/blob/main/LICENSE
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+@author Renz Jared Rolle <rgrolle@up.edu.ph>
+"""
+
+import argparse
+import os
+import sys
+import zlib
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from game_utils import CompactGrid, Grid, Move, EGG
+
+MOVE_ORDER = "fblr"     # Order in which tilts are tried; earlier tilts win ties
+SHARDS_PER_WORKER = 4   # Owner partitions per worker process, to even out their load
+
+# A search state waiting to be expanded: (board, points earned so far, moves played)
+Candidate = tuple[bytes, int, str]
+
+_worker_solver: "Solver | None" = None  # The solver used by the shards of this process
+
+
+@dataclass
+class Solution:
+    """The best score reachable on a level, and a move string that reaches it."""
+    score: int  #: The final score reached by playing the moves
+    moves: str  #: The moves to play ('f', 'b', 'l', 'r'), one character per move
+
+
+class Solver:
+    """Finds the best achievable score of an Egg Roll level.
+
+    The solver runs a depth-first search over every sequence of tilts, bounded by the
+    level's maximum number of moves. Results are stored in a transposition table keyed
+    on (board, moves played), since the points a board can still earn only depend on
+    the board itself and on how many moves have been used.
+
+    Tilts that move nothing are never searched: playing the next useful tilt earlier
+    never scores less. When no useful tilt is worth playing, the search stops and the
+    remaining moves can be spent on tilts that move nothing.
+
+    Attributes:
+        grid (CompactGrid): A scratch copy of the grid used to apply tilts.
+        base_points (int): The points already earned on the grid being solved.
+        table (dict[tuple[bytes, int], tuple[int, str]]): The transposition table,
+            mapping (board, moves played) to the best points still reachable and the moves.
+    """
+
+    def __init__(self, grid: Grid) -> None:
+        """Initializes the solver from the current state of a grid.
+
+        Args:
+            grid (Grid): The grid to solve. Moves already played on it are kept.
+        """
+        self.grid = CompactGrid(grid_data=(list(grid._rows()), grid.max_moves))
+        self.grid.name = grid.name
+        self.base_points = grid.points
+        self.start_depth = len(grid.moves)
+        self.table: dict[tuple[bytes, int], tuple[int, str]] = {}
+
+        # Only the number of moves matters for scoring, so one list per depth is shared
+        self._move_lists = [[Move('f')] * depth for depth in range(grid.max_moves + 2)]
+        self._moves = [Move(m) for m in MOVE_ORDER]
+
+    def solve(self) -> Solution:
+        """Searches for the best score reachable from the grid.
+
+        Returns:
+            Solution: The best final score and a move string that reaches it.
+        """
+        self.table.clear()
+        points, moves = self._search(bytes(self.grid.board), self.start_depth)
+        return Solution(self.base_points + points, moves)
+
+    def expand(self, board: bytes, depth: int) -> list[tuple[str, int, bytes]]:
+        """Applies every tilt to a board.
+
+        Args:
+            board (bytes): The board to tilt.
+            depth (int): The number of moves played before the tilt.
+
+        Returns:
+            list[tuple[str, int, bytes]]: For each tilt, its move character, the points it
+            earns, and the resulting board.
+        """
+        grid = self.grid
+        grid.moves = self._move_lists[depth + 1]
+        children = []
+        for move in self._moves:
+            grid.board[:] = board
+            points_change, _ = grid._slide_to_rest(move)
+            children.append((move.move_string, points_change, bytes(grid.board)))
+        return children
+
+    def _search(self, board: bytes, depth: int) -> tuple[int, str]:
+        """Finds the most points still reachable from a board.
+
+        Args:
+            board (bytes): The current board.
+            depth (int): The number of moves played so far.
+
+        Returns:
+            tuple[int, str]: The most points still reachable, and the moves that reach them.
+        """
+        key = (board, depth)
+        cached = self.table.get(key)
+        if cached is not None:
+            return cached
+
+        best: tuple[int, str] | None = None
+        can_pass = False    # Whether some tilt leaves the board unchanged
+        if depth < self.grid.max_moves and EGG in board:
+            for move, points_change, child in self.expand(board, depth):
+                if child == board:
+                    can_pass = True
+                    continue
+                points, moves = self._search(child, depth + 1)
+                candidate = (points_change + points, move + moves)
+                if best is None or _is_better(candidate, best):
+                    best = candidate
+
+        if best is None or (can_pass and _is_better((0, ""), best)):
+            best = (0, "")
+        self.table[key] = best
+        return best
+
+
+class ParallelSolver:
+    """Finds the best achievable score of an Egg Roll level using several processes.
+
+    The tilt tree is searched breadth first, one depth at a time. Every board is owned
+    by one shard, chosen by a hash of the board, so each board reached at a given depth
+    is deduplicated by its owner alone: only the most points (then the first moves in
+    MOVE_ORDER) reaching it are kept, as in the transposition table of `Solver`. The
+    shards of a depth are expanded in parallel, and each returns the children it
+    produced grouped by the shard that owns them.
+
+    The result does not depend on the number of workers: it is the same score and
+    moves as `Solver` finds.
+
+    Attributes:
+        grid (Grid): The grid being solved. Moves already played on it are kept.
+        workers (int): The number of worker processes.
+        shards (int): The number of partitions the boards are split into.
+    """
+
+    def __init__(self, grid: Grid, workers: int | None = None) -> None:
+        """Initializes the solver from the current state of a grid.
+
+        Args:
+            grid (Grid): The grid to solve. Moves already played on it are kept.
+            workers (int | None): The number of worker processes. Defaults to one per CPU.
+                With a single worker, the shards are expanded in this process.
+        """
+        self.grid = grid
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.shards = self.workers * SHARDS_PER_WORKER if self.workers > 1 else 1
+
+    def solve(self) -> Solution:
+        """Searches for the best score reachable from the grid.
+
+        Returns:
+            Solution: The best final score and a move string that reaches it.
+        """
+        grid = self.grid
+        rows, start_depth = list(grid._rows()), len(grid.moves)
+        root = CompactGrid(grid_data=(rows, grid.max_moves))
+        inboxes: list[list[list[Candidate]]] = [[] for _ in range(self.shards)]
+        inboxes[_owner(bytes(root.board), self.shards)].append([(bytes(root.board), 0, "")])
+
+        best: tuple[int, str] | None = None
+        executor = None
+        if self.workers > 1:
+            executor = ProcessPoolExecutor(
+                self.workers, initializer=_init_worker, initargs=(rows, grid.max_moves)
+            )
+        else:
+            _init_worker(rows, grid.max_moves)
+        try:
+            for depth in range(start_depth, grid.max_moves + 1):
+                if not any(inboxes):
+                    break
+                tasks = [(depth, self.shards, inbox) for inbox in inboxes]
+                if executor is not None:
+                    results = list(executor.map(_expand_shard, tasks))
+                else:
+                    results = [_expand_shard(task) for task in tasks]
+
+                inboxes = [[] for _ in range(self.shards)]
+                for shard_best, outboxes in results:
+                    if shard_best is not None and (best is None or _is_better_ordered(shard_best, best)):
+                        best = shard_best
+                    for owner, outbox in enumerate(outboxes):
+                        if outbox:
+                            inboxes[owner].append(outbox)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        points, moves = best if best is not None else (0, "")
+        return Solution(grid.points + points, moves)
+
+
+def _init_worker(rows: list[str], max_moves: int) -> None:
+    """Prepares the solver a process uses to expand shards.
+
+    Args:
+        rows (list[str]): The rows of the grid being solved.
+        max_moves (int): The maximum number of moves allowed for the level.
+    """
+    global _worker_solver
+    _worker_solver = Solver(Grid(grid_data=(rows, max_moves)))
+
+
+def _expand_shard(
+        task: tuple[int, int, list[list[Candidate]]]
+) -> tuple[tuple[int, str] | None, list[list[Candidate]]]:
+    """Deduplicates the boards a shard owns at one depth, then expands them.
+
+    Args:
+        task (tuple[int, int, list[list[Candidate]]]): The depth of the boards, the
+            number of shards, and the candidates sent to this shard by every shard.
+
+    Returns:
+        tuple[tuple[int, str] | None, list[list[Candidate]]]: The best (points, moves)
+        among the boards where the game can end, and the children of the boards,
+        grouped by the shard that owns them.
+    """
+    depth, shards, inbox = task
+    solver = _worker_solver
+    assert solver is not None
+
+    states: dict[bytes, tuple[int, str]] = {}
+    for candidates in inbox:
+        for board, points, moves in candidates:
+            known = states.get(board)
+            if known is None or _is_better_ordered((points, moves), known):
+                states[board] = (points, moves)
+
+    best: tuple[int, str] | None = None
+    outboxes: list[list[Candidate]] = [[] for _ in range(shards)]
+    for board, (points, moves) in states.items():
+        can_end = depth >= solver.grid.max_moves or EGG not in board
+        if not can_end:
+            for move, points_change, child in solver.expand(board, depth):
+                if child == board:
+                    can_end = True     # The remaining moves can be spent on this tilt
+                    continue
+                outboxes[_owner(child, shards)].append((child, points + points_change, moves + move))
+        if can_end and (best is None or _is_better_ordered((points, moves), best)):
+            best = (points, moves)
+    return best, outboxes
+
+
+def _owner(board: bytes, shards: int) -> int:
+    """Returns the shard that owns a board.
+
+    Args:
+        board (bytes): The board.
+        shards (int): The number of shards.
+
+    Returns:
+        int: The index of the owning shard.
+    """
+    return zlib.crc32(board) % shards
+
+
+def _is_better_ordered(candidate: tuple[int, str], best: tuple[int, str]) -> bool:
+    """Compares two (points, moves) results like `_is_better`, then by MOVE_ORDER.
+
+    This is the order in which `Solver` settles ties, so that results that are neither
+    better nor worse are still picked the same way whatever order they arrive in.
+
+    Args:
+        candidate (tuple[int, str]): The result being considered.
+        best (tuple[int, str]): The best result found so far.
+
+    Returns:
+        bool: True if the candidate should replace the best result.
+    """
+    if candidate[0] != best[0] or len(candidate[1]) != len(best[1]):
+        return _is_better(candidate, best)
+    return [MOVE_ORDER.index(m) for m in candidate[1]] < [MOVE_ORDER.index(m) for m in best[1]]
+
+
+def _is_better(candidate: tuple[int, str], best: tuple[int, str]) -> bool:
+    """Compares two (points, moves) results: more points first, then fewer moves.
+
+    Args:
+        candidate (tuple[int, str]): The result being considered.
+        best (tuple[int, str]): The best result found so far.
+
+    Returns:
+        bool: True if the candidate should replace the best result.
+    """
+    return candidate[0] > best[0] or (candidate[0] == best[0] and len(candidate[1]) < len(best[1]))
+
+
+def solve_level(filename: str, workers: int | None = None) -> Solution:
+    """Finds the best achievable score of a level file.
+
+    Args:
+        filename (str): The path to the level file.
+        workers (int | None): If given, the level is searched by a ParallelSolver with
+            that many worker processes (0 for one per CPU).
+
+    Returns:
+        Solution: The best final score and a move string that reaches it.
+    """
+    grid = Grid(filename=filename)
+    if workers is None:
+        return Solver(grid).solve()
+    return ParallelSolver(grid, workers).solve()
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Prints the optimal moves and score of each given level.
+
+    Args:
+        argv (list[str] | None): The command-line arguments. Defaults to sys.argv[1:].
+    """
+    parser = argparse.ArgumentParser(description="Find the best score of Egg Roll levels.")
+    parser.add_argument(
+        "levels", nargs="*",
+        help="level files to solve (defaults to every .in file in the current directory)"
+    )
+    parser.add_argument(
+        "--workers", type=int, metavar="N",
+        help="search in parallel with N processes (0 for one per CPU)"
+    )
+    args = parser.parse_args(argv)
+
+    levels: list[str] = args.levels or sorted(str(level) for level in Path("").glob("*.in"))
+    if not levels:
+        print("[Error] No level files found.")
+        sys.exit(1)
+
+    for level in levels:
+        solution = solve_level(level, args.workers)
+        print(f"{level}: {solution.score} points with moves '{solution.moves}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -16,13 +16,19 @@ limitations under the License.
 @author Renz Jared Rolle <rgrolle@up.edu.ph>
 """
 
+import asyncio
+import itertools
 import json
+import math
+import operator
 import os
-import subprocess
+import select
+import shutil
 import sys
+import time
 
 from pathlib import Path
-from typing import Literal, Sequence, cast
+from typing import Any, Callable, Iterable, Iterator, Literal, Sequence, TextIO, TypeVar, cast
 
 # Extend system path to access termcolor folder
 # Termcolor is installed locally due to importing issues (may be fixed later)
@@ -31,31 +37,49 @@ from termcolor import colored, COLORS, HIGHLIGHTS, ATTRIBUTES
 
 EggRollLocalization = dict[str, str | list[str]]
 
+# ANSI escape sequences (also understood by the Windows 10+ console, like termcolor's colors)
+CLEAR_SCREEN = "\x1b[H\x1b[2J"    # Move the cursor home, then clear the screen
+
+TILT_DURATION = 0.6         # Seconds spent animating one tilt, however far the eggs roll
+FRAME_BUDGET = 1 / 30       # Shortest time a frame stays on screen; faster frames are merged
+
+Frame = TypeVar("Frame")
+
+LOCALIZATION_DIR = Path("localization")
+SETTINGS_FILE = LOCALIZATION_DIR / "settings.json"
+
+# Process-wide cache of parsed localization files, as {path: (mtime in ns, contents)}
+_localization_cache: dict[Path, tuple[int, Any]] = {}
+
 
 def clear_screen() -> None:
     """Clears the terminal screen, if any"""
     if sys.stdout.isatty():
-        clear_cmd = 'cls' if os.name == 'nt' else 'clear'
-    subprocess.run([clear_cmd])
+        sys.stdout.write(CLEAR_SCREEN)
+        sys.stdout.flush()
 
 
 def terminal_dimensions() -> tuple[int, int]:
-    """Returns the terminal's current dimensions as (height, width)."""
-    terminal = os.get_terminal_size()
+    """Returns the terminal's current dimensions as (height, width).
+
+    Falls back to 24x80 when the output is not a terminal (e.g. piped to a file).
+    """
+    terminal = shutil.get_terminal_size()
     return terminal.lines, terminal.columns
 
 
-def center_text(text: str, pad_right: bool = True) -> str:
+def center_text(text: str, pad_right: bool = True, width: int | None = None) -> str:
     """Centers the given text horizontally within the terminal.
 
     Args:
         text (str): The text to be centered.
         pad_right (bool): Whether to pad on both sides or only on the left.
+        width (int | None): The width to center within. Defaults to the terminal width.
 
     Returns:
         str: The horizontally-centered text.
     """
-    _, terminal_width = terminal_dimensions()
+    terminal_width = width if width is not None else terminal_dimensions()[1]
 
     # Check if the text is purely composed of these emojis
     # Emojis are twice as wide as alphanumeric characters.
@@ -143,10 +167,391 @@ def print_format(
     print(text)
 
 
+class FrameRenderer:
+    """Draws the frames of a level on the terminal, redrawing only the cells that change.
+
+    A full frame is drawn once with `draw`. The frames that follow are applied with
+    `update`, which moves the cursor to each changed cell with ANSI escape sequences
+    instead of clearing the screen and printing every row again. Every frame is written
+    to the stream in a single call.
+
+    Attributes:
+        stream (TextIO | None): Where frames are written. Defaults to sys.stdout.
+        width (int | None): The width of the screen. Defaults to the terminal width.
+        height (int | None): The height of the screen. Defaults to the terminal height.
+    """
+
+    def __init__(
+            self,
+            stream: TextIO | None = None,
+            width: int | None = None,
+            height: int | None = None
+    ) -> None:
+        """Initializes the renderer.
+
+        Args:
+            stream (TextIO | None): Where frames are written. Defaults to sys.stdout.
+            width (int | None): The width of the screen. Defaults to the terminal width.
+            height (int | None): The height of the screen. Defaults to the terminal height.
+        """
+        self.stream = stream
+        self.width = width
+        self.height = height
+        self._grid: list[list[str]] | None = None   # The grid currently on screen
+        self._title = ""
+        self._origin = (0, 0)    # Screen row and column (1-based) of the top-left cell
+        self._end_row = 0        # Screen row of the cursor once a frame is drawn
+        self._size = (0, 0)      # Terminal dimensions when the frame was drawn
+
+    def draw(self, level_state: list[list[str]], title: str) -> None:
+        """Clears the screen and draws a full frame.
+
+        Args:
+            level_state (list[list[str]]): The grid to draw.
+            title (str): The title shown above the grid.
+        """
+        height, width = self._dimensions()
+        div = "═" * width
+        cols = max((len(row) for row in level_state), default=0)
+        padding = " " * max((width - cols * 2) // 2, 0)   # Emojis are two columns wide
+
+        lines = [div, color_text(title, ["green"]), div, ""]
+        lines += [padding + ''.join(row) for row in level_state]
+        lines += [" ", div]
+
+        self._grid = [row[:] for row in level_state]
+        self._title = title
+        self._origin = (5, len(padding) + 1)
+        self._end_row = len(lines) + 1
+        self._size = (height, width)
+        self._write(CLEAR_SCREEN + '\n'.join(lines) + '\n')
+
+    def update(self, changes: dict[tuple[int, int], str]) -> None:
+        """Redraws the cells that changed since the last frame.
+
+        The whole frame is drawn again instead if nothing was drawn yet, the terminal was
+        resized, or the frame does not fit on the screen (it would have scrolled, so cursor
+        positions would be off).
+
+        Args:
+            changes (dict[tuple[int, int], str]): The new tile of each changed cell, as
+                {(row, col): tile}.
+        """
+        if self._grid is None:
+            raise ValueError("A full frame must be drawn before it can be updated.")
+        for (row, col), tile in changes.items():
+            self._grid[row][col] = tile
+
+        height, width = self._dimensions()
+        if (height, width) != self._size or self._end_row > height:
+            self.draw(self._grid, self._title)
+            return
+
+        top, left = self._origin
+        output = [
+            f"\x1b[{top + row};{left + col * 2}H{tile}"
+            for (row, col), tile in changes.items()
+        ]
+        output.append(f"\x1b[{self._end_row};1H")    # Leave the cursor below the frame
+        self._write(''.join(output))
+
+    def draw_frame(self, level_state: list[list[str]], title: str) -> None:
+        """Draws a grid, only redrawing the cells that differ from the grid on screen.
+
+        Args:
+            level_state (list[list[str]]): The grid to draw.
+            title (str): The title shown above the grid.
+        """
+        previous = self._grid
+        if (previous is None or title != self._title or len(previous) != len(level_state)
+                or any(len(old) != len(new) for old, new in zip(previous, level_state))):
+            self.draw(level_state, title)
+            return
+        self.update({
+            (r, c): tile
+            for r, (old, new) in enumerate(zip(previous, level_state))
+            for c, tile in enumerate(new) if old[c] != tile
+        })
+
+    def _dimensions(self) -> tuple[int, int]:
+        """Returns the dimensions of the screen as (height, width)."""
+        height, width = terminal_dimensions()
+        return (
+            self.height if self.height is not None else height,
+            self.width if self.width is not None else width
+        )
+
+    def _write(self, text: str) -> None:
+        """Writes text to the stream in one call, then flushes it."""
+        stream = self.stream or sys.stdout
+        stream.write(text)
+        stream.flush()
+
+
+class FrameScheduler:
+    """Paces the frames of an animation so that every tilt takes the same time.
+
+    The frames of a tilt are spread evenly over `tilt_duration` seconds, measured against
+    a monotonic clock. When that would show frames for less than `frame_budget` seconds
+    (or drawing falls behind schedule), consecutive frames are merged and shown at once.
+    As soon as the player has typed new input, the rest of the animation is skipped.
+
+    Attributes:
+        tilt_duration (float): Seconds spent animating one tilt.
+        frame_budget (float): Shortest time a frame stays on screen.
+        instant (bool): Whether to skip animations and only draw the final frame.
+        input_stream (TextIO | None): The stream checked for pending input.
+            Defaults to sys.stdin; input is only checked on a terminal.
+    """
+
+    def __init__(
+            self,
+            tilt_duration: float = TILT_DURATION,
+            frame_budget: float = FRAME_BUDGET,
+            instant: bool = False,
+            input_stream: TextIO | None = None
+    ) -> None:
+        """Initializes the scheduler.
+
+        Args:
+            tilt_duration (float): Seconds spent animating one tilt.
+            frame_budget (float): Shortest time a frame stays on screen.
+            instant (bool): Whether to skip animations and only draw the final frame.
+            input_stream (TextIO | None): The stream checked for pending input.
+        """
+        self.tilt_duration = tilt_duration
+        self.frame_budget = frame_budget
+        self.instant = instant
+        self.input_stream = input_stream
+
+    def play(
+            self,
+            frames: Iterable[Frame],
+            draw: Callable[[Frame], None],
+            merge: Callable[[Frame, Frame], Frame] | None = None
+    ) -> None:
+        """Draws the frames of a tilt, the first one after 1/n of the tilt duration.
+
+        The frames are taken from the iterable as they are due, so a generator (such as
+        `Grid.iter_roll`) only computes the next frame once the previous one is drawn.
+        The frame shown before the tilt is expected to be on screen already.
+
+        Args:
+            frames (Iterable[Frame]): The frames of the tilt.
+            draw (Callable[[Frame], None]): Draws one frame.
+            merge (Callable[[Frame, Frame], Frame] | None): Combines two consecutive frames
+                into one (e.g. to merge changed cells). If None, merging keeps the later frame.
+        """
+        if self.instant or self.tilt_duration <= 0:
+            frames = list(frames)
+            if frames:
+                draw(_merge_frames(frames, merge))
+            return
+
+        batches, interval = self._batches(frames)
+        start = time.monotonic()
+        i = 0
+        batch = next(batches, None)
+        if batch is None:
+            return
+        while batch is not None:
+            # Catch up when drawing fell behind: merge every batch whose time has passed
+            while time.monotonic() >= start + (i + 2) * interval and (later := next(batches, None)):
+                i += 1
+                batch = batch + later
+            if self._input_pending(start + (i + 1) * interval - time.monotonic()):
+                # Fast-forward: show the rest of the animation at once
+                batch = batch + [frame for later in batches for frame in later]
+                draw(_merge_frames(batch, merge))
+                return
+            draw(_merge_frames(batch, merge))
+            i += 1
+            batch = next(batches, None)
+        # Keep the last frame on screen until the tilt's time is up, if the frames ran out early
+        self._input_pending(start + self.tilt_duration - time.monotonic())
+
+    async def play_async(
+            self,
+            frames: Iterable[Frame],
+            draw: Callable[[Frame], None],
+            merge: Callable[[Frame, Frame], Frame] | None = None,
+            interrupt: asyncio.Event | None = None
+    ) -> None:
+        """Draws the frames of a tilt like `play`, without blocking the event loop.
+
+        Instead of polling the input stream, the rest of the animation is skipped as soon
+        as `interrupt` is set (by the task reading the player's input, for example).
+
+        Args:
+            frames (Iterable[Frame]): The frames of the tilt.
+            draw (Callable[[Frame], None]): Draws one frame.
+            merge (Callable[[Frame, Frame], Frame] | None): Combines two consecutive frames
+                into one. If None, merging keeps the later frame.
+            interrupt (asyncio.Event | None): Set when the animation should be skipped.
+        """
+        if self.instant or self.tilt_duration <= 0 or (interrupt is not None and interrupt.is_set()):
+            frames = list(frames)
+            if frames:
+                draw(_merge_frames(frames, merge))
+            return
+
+        batches, interval = self._batches(frames)
+        start = time.monotonic()
+        i = 0
+        batch = next(batches, None)
+        if batch is None:
+            return
+        while batch is not None:
+            while time.monotonic() >= start + (i + 2) * interval and (later := next(batches, None)):
+                i += 1
+                batch = batch + later
+            if await _wait_for(interrupt, start + (i + 1) * interval - time.monotonic()):
+                batch = batch + [frame for later in batches for frame in later]
+                draw(_merge_frames(batch, merge))
+                return
+            draw(_merge_frames(batch, merge))
+            i += 1
+            batch = next(batches, None)
+        await _wait_for(interrupt, start + self.tilt_duration - time.monotonic())
+
+    def _batches(self, frames: Iterable[Frame]) -> tuple[Iterator[list[Frame]], float]:
+        """Groups the frames of a tilt so that no group stays on screen for less than the frame budget.
+
+        The groups are taken from the frames lazily. When the number of frames is known
+        in advance (e.g. a list), they are spread evenly over the tilt. Otherwise every
+        frame gets a slot of its own, and the frames left when the last slot comes are
+        merged into it, so the tilt never takes longer than its duration.
+
+        Args:
+            frames (Iterable[Frame]): The frames of the tilt.
+
+        Returns:
+            tuple[Iterator[list[Frame]], float]: The groups of frames, and the number of
+            seconds between two groups.
+        """
+        slots = max(1, int(self.tilt_duration / max(self.frame_budget, 1e-9)))
+        count = operator.length_hint(frames)
+        size = 1
+        if count:
+            size = math.ceil(count / min(slots, count))
+            slots = math.ceil(count / size)
+        return _group_frames(iter(frames), size, slots), self.tilt_duration / slots
+
+    def _input_pending(self, timeout: float) -> bool:
+        """Waits up to `timeout` seconds, returning early if the player typed new input.
+
+        Args:
+            timeout (float): The number of seconds to wait.
+
+        Returns:
+            bool: True if input is waiting to be read.
+        """
+        stream = self.input_stream or sys.stdin
+        timeout = max(timeout, 0.0)
+        try:
+            interactive = stream.isatty()
+        except (AttributeError, ValueError):
+            interactive = False
+        if not interactive:
+            time.sleep(timeout)
+            return False
+
+        if os.name == 'nt':
+            import msvcrt    # Windows consoles cannot be polled with select
+            deadline = time.monotonic() + timeout
+            while not msvcrt.kbhit():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                time.sleep(min(remaining, 0.01))
+            return True
+
+        readable, _, _ = select.select([stream], [], [], timeout)
+        return bool(readable)
+
+
+async def _wait_for(event: asyncio.Event | None, timeout: float) -> bool:
+    """Waits up to `timeout` seconds, returning early if the event is set.
+
+    Args:
+        event (asyncio.Event | None): The event to wait for. If None, the full time is waited.
+        timeout (float): The number of seconds to wait.
+
+    Returns:
+        bool: True if the event is set.
+    """
+    timeout = max(timeout, 0.0)
+    if event is None:
+        await asyncio.sleep(timeout)
+        return False
+    try:
+        await asyncio.wait_for(event.wait(), timeout)
+    except asyncio.TimeoutError:
+        return False
+    return True
+
+
+def _group_frames(frames: Iterator[Frame], size: int, groups: int) -> Iterator[list[Frame]]:
+    """Takes frames in groups of `size` as they are needed, the last group taking every frame left.
+
+    Args:
+        frames (Iterator[Frame]): The frames.
+        size (int): The number of frames in each group but the last.
+        groups (int): The largest number of groups.
+
+    Yields:
+        list[Frame]: The next group of frames. Groups are never empty.
+    """
+    for _ in range(groups - 1):
+        group = list(itertools.islice(frames, size))
+        if not group:
+            return
+        yield group
+    group = list(frames)
+    if group:
+        yield group
+
+
+def _merge_frames(frames: list[Frame], merge: Callable[[Frame, Frame], Frame] | None) -> Frame:
+    """Combines consecutive frames into the single frame that shows all of them.
+
+    Args:
+        frames (list[Frame]): The frames to combine, in order.
+        merge (Callable[[Frame, Frame], Frame] | None): Combines two consecutive frames.
+            If None, the last frame is kept.
+
+    Returns:
+        Frame: The combined frame.
+    """
+    if merge is None:
+        return frames[-1]
+    combined = frames[0]
+    for frame in frames[1:]:
+        combined = merge(combined, frame)
+    return combined
+
+
+def merge_changes(
+        earlier: dict[tuple[int, int], str],
+        later: dict[tuple[int, int], str]
+) -> dict[tuple[int, int], str]:
+    """Merges the changed cells of two consecutive delta frames.
+
+    Args:
+        earlier (dict[tuple[int, int], str]): The cells changed by the first frame.
+        later (dict[tuple[int, int], str]): The cells changed by the second frame.
+
+    Returns:
+        dict[tuple[int, int], str]: The cells changed by both frames, as {(row, col): tile}.
+    """
+    return {**earlier, **later}
+
+
 def create_table(
         data: list[list[str | int]],
         headers: list[str | list[str]] | None = None,
-        title: str | None = None
+        title: str | None = None,
+        width: int | None = None
 ) -> str:
     """Creates a formatted table from arbitrary data.
 
@@ -154,11 +559,12 @@ def create_table(
         data (list[list[str | int]]): A 2D list representing the table data.
         headers (list[str | list[str]] | None): A list of column headers (defaults to None).
         title (str | None): The title of the table, displayed on the topmost row as a header.
+        width (int | None): The width to center the table within. Defaults to the terminal width.
 
     Returns:
         str: The formatted table as a string.
     """
-    _, cols = terminal_dimensions()
+    cols = width if width is not None else terminal_dimensions()[1]
     col_widths = [max(len(str(item)) for item in col) + 1 for col in zip(*data)]
     if headers:
         col_widths = [max(len(headers[i]) + 1, col_widths[i]) for i in range(len(headers))]
@@ -180,7 +586,7 @@ def create_table(
         table_lines.append(f"│ {row_line}│")
 
     table_lines.append(f"└{'┴'.join('─' * (w + 1) for w in col_widths)}┘")
-    centered_table = center_text('\n'.join(table_lines))
+    centered_table = center_text('\n'.join(table_lines), width=cols)
 
     # Add title lines to the centered table last.
     # This allows the table below to be displayed in the center.
@@ -188,7 +594,7 @@ def create_table(
         title_lines = []
         div = "═" * cols   # horizontal divider line
         title_lines.append(div)
-        title_lines.append(color_text(center_text(title), ['light_yellow']))
+        title_lines.append(color_text(center_text(title, width=cols), ['light_yellow']))
         title_lines.append(div)
         title_lines.append("")
 
@@ -197,6 +603,26 @@ def create_table(
     return centered_table
 
 
+def _read_cached_json(path: Path) -> Any:
+    """Reads a JSON file, reusing the parsed contents until the file changes on disk.
+
+    Args:
+        path (Path): The path to the JSON file.
+
+    Returns:
+        Any: The parsed contents of the file.
+    """
+    mtime = path.stat().st_mtime_ns
+    cached = _localization_cache.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    with open(path, "r", encoding="utf-8") as file:
+        contents = json.load(file)
+    _localization_cache[path] = (mtime, contents)
+    return contents
+
+
 def load_localization(language_code: str | None = None) -> EggRollLocalization:
     """
     Loads the localization file based on the provided language code.
@@ -205,6 +631,10 @@ def load_localization(language_code: str | None = None) -> EggRollLocalization:
     code from the "settings.json" file located in the "localization" directory.
     The default language is "en" (English).
 
+    Both files are cached for the whole process, and only read again once their
+    modification time changes. The returned dictionary is shared, so it should not
+    be modified.
+
     If the localization file structure is invalid, an empty dictionary is returned.
 
     Args:
@@ -214,13 +644,28 @@ def load_localization(language_code: str | None = None) -> EggRollLocalization:
         EggRollLocalization: A dictionary containing the localization data.
     """ 
     if not language_code:
-        settings_file = Path("localization") / "settings.json"
-        with open(settings_file, "r", encoding="utf-8") as file:
-            language_code = json.load(file)["language"]
-
-    localization_file = Path("localization") / f"{language_code}.json"
-    with open(localization_file, "r", encoding="utf-8") as file:
-        locale = json.load(file)
-        if isinstance(locale, dict):
-            return locale
-        return {}  # Return an empty dictionary if the structure is invalid
+        language_code = _read_cached_json(SETTINGS_FILE)["language"]
+
+    locale = _read_cached_json(LOCALIZATION_DIR / f"{language_code}.json")
+    if isinstance(locale, dict):
+        return locale
+    return {}  # Return an empty dictionary if the structure is invalid
+
+
+def set_language(language_code: str) -> EggRollLocalization:
+    """Saves the game language to "settings.json" and returns its localization.
+
+    The localization cache is updated with the new settings directly, so the
+    settings file is not read back.
+
+    Args:
+        language_code (str): The language code to switch to.
+
+    Returns:
+        EggRollLocalization: A dictionary containing the localization data.
+    """
+    settings = {"language": language_code}
+    with open(SETTINGS_FILE, "w", encoding="utf-8") as file:
+        json.dump(settings, file)
+    _localization_cache[SETTINGS_FILE] = (SETTINGS_FILE.stat().st_mtime_ns, settings)
+    return load_localization(language_code)
@@ -16,13 +16,39 @@ limitations under the License.
 @author Renz Jared Rolle <rgrolle@up.edu.ph>
 """
 
+import asyncio
+import contextlib
+import io
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
 import unittest
 from copy import deepcopy
-from random import choice, randint
+from pathlib import Path
+from random import Random, choice, randint
+from typing import Iterator
 
+import async_game
+import batch_eval
+import benchmark
 import egg_roll
 import egg_roll_basic
+import game_server
 import game_utils
+import instrumentation
+import leaderboard_utils
+import level_format
+import level_generator
+import level_index
+import load_test
+import save_state
+import solver
+import terminal_utils
+import tournament
 from egg_roll import GameState
 
 
@@ -877,6 +903,1592 @@ class TestEggRoll(unittest.TestCase):
         self.assertEqual(new_pos, pos)
      
 
+    def test_compact_engine(self) -> None:
+        """
+        Tests that the compact (bytearray-backed) engine behaves exactly like the emoji engine.
+
+        Both engines play the same move sequences on the shipped levels, after which the
+        snapshots, points, and rendered grids are compared.
+        """
+        compact = game_utils.Grid(grid_data=(self.initial_grids["grid3"], 5), engine="compact")
+        self.assertIsInstance(compact, game_utils.CompactGrid)
+        self.assertEqual(compact.level_state, self.grid3.level_state)
+        self.assertEqual(compact._find_eggs(game_utils.Move('l')), self.grid3._find_eggs(game_utils.Move('l')))
+        self.assertTrue(compact.is_present('🪹'))
+        self.assertFalse(compact.is_present('🍅'))
+        self.assertFalse(compact.is_present('🟩🟩'))
+        with self.assertRaises(ValueError):
+            game_utils.Grid(grid_data=(self.initial_grids["grid3"], 5), engine="unknown")
+
+        compact = game_utils.Grid(filename="cs11.in", engine="compact")
+        compact.roll([game_utils.Move('b')])
+        self.assertEqual(compact.points, 20)     # One egg fills the nest, the next rests on it
+        self.assertEqual([compact.level_state[r][7] for r in (6, 7, 8)], ['🥚', '🪺', '🟩'])
+
+        grid_names: list[str] = ["cs11.in", "labyrinth.in", "sacrifice.in", "level1.in", "level2.in"]
+        for grid_name in grid_names:
+            for moveset in ["fblr", "lrrbf", "bbl", "rf"]:
+                emoji_grid = game_utils.Grid(filename=grid_name)
+                compact_grid = game_utils.Grid(filename=grid_name, engine="compact")
+                for m in (moveset * emoji_grid.max_moves)[:emoji_grid.max_moves]:
+                    move = game_utils.Move(m)
+                    emoji_grid.moves.append(move)
+                    compact_grid.moves.append(move)
+                    self.assertEqual(compact_grid.roll(), emoji_grid.roll())
+                    self.assertEqual(compact_grid.points, emoji_grid.points)
+                self.assertEqual(compact_grid.copy_grid(), emoji_grid.copy_grid())
+
+
+    def test_compact_rendering(self) -> None:
+        """
+        Tests that the compact engine only renders its board when it is read.
+
+        Roll snapshots must hold a copy of the board until they are first read, then
+        read like the emoji grid, and must not change when the board does.
+        """
+        grid = game_utils.Grid(filename="cs11.in", engine="compact")
+        snapshots = grid.roll([game_utils.Move('b')])
+        self.assertIsNone(snapshots[0]._rendered)
+        self.assertEqual(snapshots, self.grid_cs11.roll([game_utils.Move('b')]))
+        self.assertEqual(list(snapshots[-1]), grid.level_state)
+        self.assertEqual(len(snapshots[-1]), len(self.initial_grids["grid_cs11"]))
+        self.assertNotEqual(snapshots[0], snapshots[-1])
+
+        grid._set_position((1, 1), '🥚')
+        self.assertEqual(grid.level_state[1][1], '🥚')
+        self.assertEqual(snapshots[-1][1][1], '🟩')
+
+
+    def test_compact_level_state_edits(self) -> None:
+        """
+        Tests that editing the `level_state` of a compact grid changes its board.
+
+        Cells, slices of rows and whole rows written into `level_state` must be read back
+        and played like on the emoji engine, while edits that change the size of the grid
+        must raise a ValueError. Copies made by `copy_grid` do not write back.
+        """
+        emoji = game_utils.Grid(filename="level1.in")
+        compact = game_utils.Grid(filename="level1.in", engine="compact")
+        for grid in (emoji, compact):
+            grid.level_state[1][5] = '🟩'
+            grid.level_state[2][1:3] = ['🥚', '🥚']
+            grid.level_state[1] = ['🧱', '🪹', '🪹', '🟩', '🟩', '🟩', '🟩', '🧱']
+        self.assertEqual(compact.level_state, emoji.level_state)
+        self.assertEqual(compact._find_eggs(), [(2, 1), (2, 2)])
+        self.assertTrue(compact.is_present('🥚'))
+
+        for grid in (emoji, compact):
+            grid.moves.append(game_utils.Move('f'))
+            grid.roll()
+        self.assertEqual((compact.level_state, compact.points), (emoji.level_state, emoji.points))
+        self.assertEqual(compact.level_state[1][1:3], ['🪺', '🪺'])
+
+        copy = compact.copy_grid()
+        copy[1][1] = '🟩'
+        self.assertEqual(compact.level_state[1][1], '🪺')
+
+        state = compact.level_state
+        with self.assertRaises(ValueError):
+            state[0].append('🧱')
+        with self.assertRaises(ValueError):
+            state[0][1:3] = ['🟩']
+        with self.assertRaises(ValueError):
+            del state[3]
+        with self.assertRaises(IndexError):
+            state[0][8] = '🟩'
+        self.assertEqual(compact.level_state, emoji.level_state)
+
+
+    def test_slide_resolution(self) -> None:
+        """
+        Tests that resolving a tilt with the "slide" resolution matches the "step" resolution.
+
+        Small grids where eggs stack up, fill nests, fall into pans, or stay put are tilted
+        with both resolutions on both engines. The final grid and points must be the
+        expected ones, and a slide only keeps the grid before and after the tilt.
+        """
+        grid_cs11 = deepcopy(self.grid_cs11)
+        snapshots = grid_cs11.roll([game_utils.Move('b')], resolution="slide")
+        self.assertEqual(len(snapshots), 2)
+        self.assertEqual(snapshots[-1], self.grid_cs11.roll([game_utils.Move('b')])[-1])
+        self.assertEqual(grid_cs11.points, 20)
+        self.assertEqual(len(grid_cs11.roll([game_utils.Move('b')], resolution="slide")), 1)
+        with self.assertRaises(ValueError):
+            grid_cs11.roll(resolution="teleport")
+
+        # (level, moves, final grid, points)
+        cases: list[tuple[list[str], str, list[str], int]] = [
+            (['🥚🥚🥚🟩🪹'], 'r', ['🟩🟩🥚🥚🪺'], 11),                 # One egg fills the nest, the others stack
+            (['🥚', '🥚', '🍳', '🥚'], 'b', ['🟩', '🟩', '🍳', '🥚'], -10),  # Two eggs fall into the pan
+            (['🥚🪺🥚🟩'], 'lr', ['🥚🪺🟩🥚'], 0),                     # A full nest stops eggs
+            (['🥚'], 'fblr', ['🥚'], 0),                                # Nothing can move
+            (['🥚🟩🧱', '🟩🥚🟩', '🪹🟩🥚'], 'flb', ['🟩🟩🧱', '🥚🟩🟩', '🪺🥚🟩'], 11),
+        ]
+        for level, moves, expected, points in cases:
+            for engine in ["emoji", "compact"]:
+                stepped = game_utils.Grid(grid_data=(level, len(moves)), engine=engine)
+                slid = game_utils.Grid(grid_data=(level, len(moves)), engine=engine)
+                for m in moves:
+                    move = game_utils.Move(m)
+                    stepped.moves.append(move)
+                    slid.moves.append(move)
+                    stepped_snapshots = stepped.roll()
+                    slid_snapshots = slid.roll(resolution="slide")
+                    self.assertEqual(slid_snapshots[0], stepped_snapshots[0])
+                    self.assertEqual(slid_snapshots[-1], stepped_snapshots[-1])
+                    self.assertEqual(len(slid_snapshots), min(len(stepped_snapshots), 2))
+                    self.assertEqual(slid.points, stepped.points)
+                self.assertEqual([''.join(row) for row in slid.level_state], expected)
+                self.assertEqual(slid.points, points)
+
+
+    def test_iter_roll(self) -> None:
+        """
+        Tests the `iter_roll` generator of the `Grid` class.
+
+        This verifies that every frame kind describes the same roll as the `roll` method:
+        views and snapshots match the snapshots frame by frame, applying the deltas to the
+        initial grid reproduces each snapshot, and skipping intermediate frames only
+        yields the final grid.
+        """
+        moves = [game_utils.Move('l'), game_utils.Move('f'), game_utils.Move('r'), game_utils.Move('b')]
+        for engine in ["emoji", "compact"]:
+            expected_grid = game_utils.Grid(grid_data=(self.initial_grids["grid_labyrinth"], 15), engine=engine)
+            view_grid = game_utils.Grid(grid_data=(self.initial_grids["grid_labyrinth"], 15), engine=engine)
+            delta_grid = game_utils.Grid(grid_data=(self.initial_grids["grid_labyrinth"], 15), engine=engine)
+            skip_grid = game_utils.Grid(grid_data=(self.initial_grids["grid_labyrinth"], 15), engine=engine)
+
+            for i in range(1, len(moves) + 1):
+                snapshots = expected_grid.roll(moves[:i])
+                views = [deepcopy(frame) for frame in view_grid.iter_roll(moves[:i])]
+                self.assertEqual(views, snapshots)
+
+                grid = delta_grid.copy_grid()
+                deltas = list(delta_grid.iter_roll(moves[:i], frames="delta"))
+                self.assertEqual(len(deltas), len(snapshots) - 1)
+                for delta, snapshot in zip(deltas, snapshots[1:]):
+                    for (r, c), tile in delta.items():
+                        grid[r][c] = tile
+                    self.assertEqual(grid, snapshot)
+
+                frames = list(skip_grid.iter_roll(moves[:i], frames="snapshot", skip_intermediate=True))
+                self.assertEqual(frames, [snapshots[0], snapshots[-1]][:len(snapshots)])
+                self.assertEqual(view_grid.points, expected_grid.points)
+                self.assertEqual(delta_grid.points, expected_grid.points)
+                self.assertEqual(skip_grid.points, expected_grid.points)
+
+        with self.assertRaises(ValueError):
+            list(self.grid1.iter_roll([game_utils.Move('l')], frames="film"))
+
+
+    def test_move_journal(self) -> None:
+        """
+        Tests the `MoveJournal` undo history of the `Grid` class.
+
+        This verifies that every recorded state can be rebuilt from the journal (across
+        checkpoints), and that undoing moves one at a time restores the exact grid and
+        points that were reached before each move.
+        """
+        for engine in ["emoji", "compact"]:
+            grid = game_utils.Grid(filename="labyrinth.in", engine=engine)
+            grid.level_states = game_utils.MoveJournal(grid, grid._checkpoint(), checkpoint_interval=3)
+            expected = [(grid.copy_grid(), grid.points)]
+            for m in 'rbrflbrfblrflbf':
+                grid.moves.append(game_utils.Move(m))
+                grid.roll()
+                expected.append((grid.copy_grid(), grid.points))
+
+            self.assertEqual(len(grid.level_states), len(expected))
+            self.assertEqual(sorted(grid.level_states.checkpoints), [0, 3, 6, 9, 12, 15])
+            for i, state in enumerate(expected):
+                self.assertEqual(grid.level_states[i], state)
+            self.assertEqual(grid.level_states[-1], expected[-1])
+            with self.assertRaises(IndexError):
+                grid.level_states[len(expected)]
+
+            for state in reversed(expected[:-1]):
+                self.assertTrue(grid.level_states.undo())
+                self.assertEqual((grid.copy_grid(), grid.points), state)
+            self.assertFalse(grid.level_states.undo())
+            self.assertEqual(sorted(grid.level_states.checkpoints), [0])
+
+
+    def test_iter_roll_stopped_early(self) -> None:
+        """
+        Tests that a roll stopped before its last frame can still be undone.
+
+        Closing the frame generator after its first step, or breaking out of a loop over
+        it, must finish the tilt and record it in the undo journal. A roll interrupted
+        by an error must record what changed so far, so undoing it restores the grid.
+        """
+        for engine in ["emoji", "compact"]:
+            full = game_utils.Grid(filename="level1.in", engine=engine)
+            full.roll([game_utils.Move('l')])
+
+            grid = game_utils.Grid(filename="level1.in", engine=engine)
+            initial = grid.copy_grid()
+            frames = grid.iter_roll([game_utils.Move('l')])
+            next(frames)
+            next(frames)
+            frames.close()
+            self.assertEqual((grid.copy_grid(), grid.points), (full.copy_grid(), full.points))
+            self.assertEqual((len(grid.moves), len(grid.level_states)), (1, 2))
+            self.assertTrue(grid.level_states.undo())
+            self.assertEqual((grid.copy_grid(), grid.points), (initial, 0))
+
+            grid.moves = [game_utils.Move('l')]
+            for _ in grid.iter_roll(frames="delta"):
+                break
+            self.assertEqual((grid.copy_grid(), grid.points), (full.copy_grid(), full.points))
+            self.assertEqual(len(grid.level_states), 2)
+
+            grid = game_utils.Grid(filename="level1.in", engine=engine)
+            apply_move, calls = grid._apply_move, []
+
+            def failing_apply_move(*args: object) -> tuple[int, bool]:
+                calls.append(args)
+                if len(calls) == 2:
+                    raise RuntimeError("Interrupted")
+                return apply_move(*args)
+
+            grid._apply_move = failing_apply_move     # type: ignore[method-assign]
+            with self.assertRaises(RuntimeError):
+                grid.roll([game_utils.Move('l')])
+            self.assertNotEqual(grid.copy_grid(), initial)
+            self.assertTrue(grid.level_states.undo())
+            self.assertEqual((grid.copy_grid(), grid.points), (initial, 0))
+
+
+    def test_solver(self) -> None:
+        """
+        Tests the `Solver` class of the `solver` module.
+
+        The solutions of small hand-written grids are checked, and their scores compared
+        against an exhaustive search over every move string. The moves returned for the
+        shipped levels are replayed to check that they reach the reported score.
+        """
+        # (level, max moves, best score, best moves)
+        cases: list[tuple[list[str], int, int, str]] = [
+            (['🪹🟩🥚🟩🍳'], 2, 12, 'l'),                          # Fill the nest right away
+            (['🥚🟩🟩', '🧱🧱🟩', '🪹🟩🟩'], 3, 11, 'rbl'),        # Only one path reaches the nest
+            (['🍳🥚🟩'], 2, 0, ''),                                 # Every useful tilt loses points
+            (['🪹🥚🥚🪹'], 2, 23, 'lr'),                           # Fill one nest, then the other
+        ]
+        for level, max_moves, score, moves in cases:
+            best = None
+            for n in range(4 ** max_moves):
+                grid = game_utils.Grid(grid_data=(level, max_moves))
+                for i in range(max_moves):
+                    if not grid.is_present('🥚'):
+                        break
+                    grid.moves.append(game_utils.Move('fblr'[n // 4 ** i % 4]))
+                    grid.roll()
+                best = grid.points if best is None else max(best, grid.points)
+            solution = solver.Solver(game_utils.Grid(grid_data=(level, max_moves))).solve()
+            self.assertEqual(solution, solver.Solution(score, moves))
+            self.assertEqual(solution.score, best)
+
+        for level in ["cs11.in", "labyrinth.in", "sacrifice.in", "level1.in", "level2.in"]:
+            solution = solver.solve_level(level)
+            grid = game_utils.Grid(filename=level)
+            for m in solution.moves:
+                grid.moves.append(game_utils.Move(m))
+                grid.roll()
+            self.assertLessEqual(len(solution.moves), grid.max_moves)
+            self.assertEqual(grid.points, solution.score)
+
+
+    def test_evaluate_many(self) -> None:
+        """
+        Tests the `evaluate_many` function of the `batch_eval` module.
+
+        Move strings (including invalid characters and strings longer than the allowed
+        moves) are scored in one batch, and the points and final grids are compared with
+        playing each string move by move with `Grid.roll`. The NumPy backend is only
+        tested when NumPy is installed.
+        """
+        backends = ["python"] if batch_eval.np is None else ["python", "numpy"]
+        move_strings = ["", "f", "LBLF", "lblfrrrr", "xfxbx", "R" * 20, "bbll", "FbLr" * 5, "rlrlrl"]
+        for backend in backends:
+            scores, states = batch_eval.evaluate_many("level1.in", ["LBLF", "x"], backend=backend)
+            self.assertEqual(scores, [egg_roll.replay("level1.in", "LBLF")["points"], 0])
+            self.assertFalse(any('🥚' in row for row in states[0]))     # Every egg is gone
+            self.assertEqual(states[1], game_utils.Grid(filename="level1.in").copy_grid())
+
+        for grid_name in ["cs11.in", "labyrinth.in", "sacrifice.in", "level1.in", "level2.in"]:
+            expected_scores, expected_states = [], []
+            for move_string in move_strings:
+                grid = game_utils.Grid(filename=grid_name)
+                for m in egg_roll.validate_moves(move_string, grid.max_moves).lower():
+                    if not grid.is_present('🥚'):
+                        break
+                    grid.moves.append(game_utils.Move(m))
+                    grid.roll()
+                expected_scores.append(grid.points)
+                expected_states.append(grid.copy_grid())
+
+            for backend in backends:
+                scores, states = batch_eval.evaluate_many(grid_name, move_strings, backend=backend)
+                self.assertEqual(scores, expected_scores)
+                self.assertEqual(states, expected_states)
+
+        self.assertEqual(batch_eval.evaluate_many(self.grid1, []), ([], []))
+        with self.assertRaises(ValueError):
+            batch_eval.evaluate_many(self.grid1, ['f'], backend="gpu")
+
+
+    def test_replay(self) -> None:
+        """
+        Tests the headless `replay` function of the `egg_roll` module.
+
+        This verifies that recorded move strings are validated like player input, and
+        that the final points, end reason, and grid match playing the moves with `Grid.roll`.
+        """
+        result = egg_roll.replay("level1.in", "LBLF")
+        self.assertEqual(result["moves"], "lblf")
+        self.assertEqual(result["points"], 27)
+        self.assertEqual(result["end_reason"], egg_roll.EndReason.NO_MORE_EGGS.value)
+
+        result = egg_roll.replay("level1.in", "rrrrrrrr")
+        self.assertEqual(result["moves"], "rrrrr")
+        self.assertEqual(result["remaining_moves"], 0)
+        self.assertEqual(result["end_reason"], egg_roll.EndReason.RAN_OUT_OF_MOVES.value)
+
+        result = egg_roll.replay("level1.in", "restart")
+        self.assertEqual((result["moves"], result["points"], result["end_reason"]), ("", 0, None))
+
+        # (moves, points, end reason, moves played)
+        no_more_eggs = egg_roll.EndReason.NO_MORE_EGGS.value
+        for move_string, points, end_reason, played in [("lfrfrbl", 14, no_more_eggs, "lfrfrbl"),
+                                                        ("fblr" * 4, -10, no_more_eggs, "fbl"),
+                                                        ("llll", 0, None, "llll")]:
+            result = egg_roll.replay("sacrifice.in", move_string)
+            self.assertEqual((result["points"], result["end_reason"], result["moves"]), (points, end_reason, played))
+            grid = game_utils.Grid(filename="sacrifice.in")
+            for m in move_string:
+                if not grid.is_present('🥚'):
+                    break
+                grid.moves.append(game_utils.Move(m))
+                grid.roll()
+            self.assertEqual(result["points"], grid.points)
+            self.assertEqual(result["grid"], [''.join(row) for row in grid.level_state])
+
+
+    def test_benchmark(self) -> None:
+        """
+        Tests the level generator and measurements of the `benchmark` module.
+
+        This verifies that generated levels are reproducible, walled in and of the requested
+        size, and that every engine operation is measured (or skipped when too large).
+        """
+        for rows, cols, density in [(3, 3, 1.0), (5, 8, 0.0), (12, 7, 0.5), (40, 3, 1.0), (20, 33, 0.1)]:
+            level = benchmark.generate_level(rows, cols, density, seed=7)
+            self.assertEqual(level, benchmark.generate_level(rows, cols, density, seed=7))
+            self.assertEqual(len(level), rows)
+            self.assertTrue(all(len(row) == cols for row in level))
+            self.assertTrue(level[0] == level[-1] == '🧱' * cols)
+            self.assertTrue(all(row[0] == row[-1] == '🧱' for row in level))
+            eggs = sum(row.count('🥚') for row in level)
+            if density == 0.0:
+                self.assertEqual(eggs, 0)
+            elif density == 1.0:
+                self.assertEqual(eggs, (rows - 2) * (cols - 2))
+
+        results = benchmark.run_benchmarks(sizes=(10, 30), densities=(0.2,), time_budget=0.0,
+                                           max_step_cells=500)
+        self.assertEqual(len(results), 2 * len(game_utils.ENGINES) * len(benchmark.OPERATIONS))
+        for result in results:
+            if result["size"] == 30 and result["operation"] == "roll_step":
+                self.assertTrue(result.get("skipped"))
+                continue
+            self.assertEqual(result["iterations"], 1)
+            self.assertGreater(result["calls_per_sec"], 0)
+            self.assertGreaterEqual(result["peak_memory_bytes"], 0)
+            self.assertEqual(result["moves_per_sec"] is None, not result["operation"].startswith("roll_"))
+
+
+    def test_load_localization(self) -> None:
+        """
+        Tests the localization cache of the `terminal_utils` module.
+
+        This verifies that localization files are parsed once and reused, read again only
+        when their modification time changes, and that `set_language` updates the cache.
+        """
+        default_dir, default_settings = terminal_utils.LOCALIZATION_DIR, terminal_utils.SETTINGS_FILE
+        with tempfile.TemporaryDirectory() as directory:
+            terminal_utils.LOCALIZATION_DIR = Path(directory)
+            terminal_utils.SETTINGS_FILE = terminal_utils.LOCALIZATION_DIR / "settings.json"
+            try:
+                for code in ("en", "tl"):
+                    with open(os.path.join(directory, f"{code}.json"), "w", encoding="utf-8") as file:
+                        json.dump({"language": code}, file)
+                with open(terminal_utils.SETTINGS_FILE, "w", encoding="utf-8") as file:
+                    json.dump({"language": "en"}, file)
+
+                loc = terminal_utils.load_localization()
+                self.assertEqual(loc["language"], "en")
+                self.assertIs(terminal_utils.load_localization(), loc)
+                self.assertIs(terminal_utils.load_localization("en"), loc)
+
+                # Changes on disk are picked up once the modification time changes
+                en_file = os.path.join(directory, "en.json")
+                with open(en_file, "w", encoding="utf-8") as file:
+                    json.dump({"language": "en", "title": "Egg Roll"}, file)
+                os.utime(en_file, ns=(0, os.stat(en_file).st_mtime_ns + 10**9))
+                self.assertEqual(terminal_utils.load_localization()["title"], "Egg Roll")
+
+                loc = terminal_utils.set_language("tl")
+                self.assertEqual(loc["language"], "tl")
+                self.assertIs(terminal_utils.load_localization(), loc)
+                with open(terminal_utils.SETTINGS_FILE, "r", encoding="utf-8") as file:
+                    self.assertEqual(json.load(file), {"language": "tl"})
+            finally:
+                terminal_utils.LOCALIZATION_DIR, terminal_utils.SETTINGS_FILE = default_dir, default_settings
+
+
+    def test_frame_renderer(self) -> None:
+        """
+        Tests the `FrameRenderer` class of the `terminal_utils` module.
+
+        This verifies that a full frame is drawn once, that later frames only position the
+        cursor on the changed cells in a single write, and that the whole frame is drawn
+        again when it would not fit on the screen.
+        """
+        class Stream(io.StringIO):
+            writes = 0
+
+            def write(self, text: str) -> int:
+                self.writes += 1
+                return super().write(text)
+
+        level = [list(row) for row in ("🧱🧱🧱🧱", "🧱🥚🟩🧱", "🧱🧱🧱🧱")]
+        stream = Stream()
+        renderer = terminal_utils.FrameRenderer(stream=stream, width=20, height=40)
+        renderer.draw(level, "Level 1")
+        self.assertEqual(stream.writes, 1)
+        self.assertTrue(stream.getvalue().startswith(terminal_utils.CLEAR_SCREEN))
+        self.assertIn("      🧱🥚🟩🧱\n", stream.getvalue())
+
+        # The grid starts on row 5, after two dividers, the title and a blank line
+        stream.seek(0)
+        stream.truncate()
+        renderer.update({(1, 1): '🟩', (1, 2): '🥚'})
+        self.assertEqual(stream.writes, 2)
+        self.assertEqual(stream.getvalue(), "\x1b[6;9H🟩\x1b[6;11H🥚\x1b[10;1H")
+
+        stream.seek(0)
+        stream.truncate()
+        moved = [row[:] for row in level]
+        moved[1][1], moved[1][2] = '🥚', '🟩'
+        renderer.draw_frame(moved, "Level 1")
+        self.assertEqual(stream.getvalue(), "\x1b[6;9H🥚\x1b[6;11H🟩\x1b[10;1H")
+
+        # A screen too short for the frame falls back to full redraws
+        renderer.height = 5
+        stream.seek(0)
+        stream.truncate()
+        renderer.update({(1, 1): '🟩'})
+        self.assertTrue(stream.getvalue().startswith(terminal_utils.CLEAR_SCREEN))
+        self.assertIn("🧱🟩🟩🧱", stream.getvalue())
+
+        with self.assertRaises(ValueError):
+            terminal_utils.FrameRenderer(stream=stream).update({})
+
+
+    def test_frame_scheduler(self) -> None:
+        """
+        Tests the `FrameScheduler` class of the `terminal_utils` module.
+
+        This verifies that a tilt takes the configured time however many frames it has,
+        that frames shorter than the frame budget are merged without losing changes, and
+        that instant mode and pending input skip straight to the final frame.
+        """
+        frames = [{(0, i): '🥚', (0, i - 1): '🟩'} for i in range(1, 101)]
+        expected = terminal_utils._merge_frames(frames, terminal_utils.merge_changes)
+
+        for count in (1, 3, 100):
+            drawn: list[dict[tuple[int, int], str]] = []
+            scheduler = terminal_utils.FrameScheduler(tilt_duration=0.1, frame_budget=0.02)
+            start = time.monotonic()
+            scheduler.play(frames[:count], drawn.append, terminal_utils.merge_changes)
+            self.assertGreaterEqual(time.monotonic() - start, 0.1)
+            self.assertLessEqual(len(drawn), min(count, 5))
+            merged = terminal_utils._merge_frames(frames[:count], terminal_utils.merge_changes)
+            self.assertEqual(terminal_utils._merge_frames(drawn, terminal_utils.merge_changes), merged)
+
+        for count in (3, 100):     # Frames produced lazily, as by Grid.iter_roll
+            produced: list[int] = []
+
+            def generate() -> Iterator[dict[tuple[int, int], str]]:
+                for i, frame in enumerate(frames[:count]):
+                    produced.append(i)
+                    yield frame
+
+            drawn, produced_when_drawn = [], []
+
+            def draw(frame: dict[tuple[int, int], str]) -> None:
+                drawn.append(frame)
+                produced_when_drawn.append(len(produced))
+
+            start = time.monotonic()
+            terminal_utils.FrameScheduler(tilt_duration=0.1, frame_budget=0.02).play(
+                generate(), draw, terminal_utils.merge_changes
+            )
+            self.assertGreaterEqual(time.monotonic() - start, 0.1)
+            self.assertLessEqual(len(drawn), min(count, 5))
+            self.assertEqual(produced_when_drawn[0], 1)     # Drawn before the next frame was computed
+            merged = terminal_utils._merge_frames(frames[:count], terminal_utils.merge_changes)
+            self.assertEqual(terminal_utils._merge_frames(drawn, terminal_utils.merge_changes), merged)
+
+        drawn = []
+        terminal_utils.FrameScheduler(instant=True).play(frames, drawn.append, terminal_utils.merge_changes)
+        self.assertEqual(drawn, [expected])
+        drawn = []
+        terminal_utils.FrameScheduler(tilt_duration=0).play(frames, drawn.append)
+        self.assertEqual(drawn, [frames[-1]])
+
+        if os.name != 'nt':
+            class Terminal(io.TextIOWrapper):
+                def isatty(self) -> bool:
+                    return True
+
+            read_fd, write_fd = os.pipe()
+            with Terminal(io.FileIO(read_fd, closefd=True)) as stream:
+                os.write(write_fd, b"lblf\n")
+                drawn = []
+                scheduler = terminal_utils.FrameScheduler(tilt_duration=10, input_stream=stream)
+                scheduler.play(frames, drawn.append, terminal_utils.merge_changes)
+                self.assertEqual(drawn, [expected])
+            os.close(write_fd)
+
+
+    def test_leaderboard_store(self) -> None:
+        """
+        Tests the leaderboard stores of the `leaderboard_utils` module.
+
+        This verifies that both stores keep the top 10 scores of each level, that the journal
+        is compacted into a snapshot of the same schema, and that records cut short by a crash
+        or replayed after an interrupted compaction are counted exactly once.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "leaderboard.json")
+            json_store = leaderboard_utils.JsonLeaderboardStore(filename)
+            journal_store = leaderboard_utils.JournalLeaderboardStore(filename + ".2", compact_every=4)
+
+            scores = [("level1.in", 5), ("level1.in", 40), ("level2.in", 15), ("level1.in", 12),
+                      ("level1.in", 40), ("level1.in", -3), ("level1.in", 60), ("level1.in", 7),
+                      ("level2.in", -20), ("level1.in", 22), ("level1.in", 0), ("level1.in", 18),
+                      ("level1.in", 33), ("level1.in", 9)]
+            for i, (level, score) in enumerate(scores):
+                for store in (json_store, journal_store):
+                    leaderboard_utils.Leaderboard(level, store).update(f"player{i}", score)
+
+            for store in (json_store, journal_store):
+                top = store.top_scores("level1.in")
+                self.assertEqual([entry["score"] for entry in top], [60, 40, 40, 33, 22, 18, 12, 9, 7, 5])
+                self.assertEqual([entry["name"] for entry in top[1:3]], ["player1", "player4"])
+                self.assertEqual(store.top_scores("level2.in"), [
+                    {"name": "player2", "score": 15}, {"name": "player8", "score": -20}
+                ])
+
+            # Compaction only leaves records that have not reached the threshold yet
+            with open(journal_store.journal, "r", encoding="utf-8") as file:
+                self.assertEqual(len(file.readlines()), len(scores) % 4)
+            before = journal_store.read_leaderboards()
+            journal_store.compact()
+            self.assertEqual(os.path.getsize(journal_store.journal), 0)
+            self.assertEqual(journal_store.read_leaderboards(), before)
+            with open(journal_store.filename, "r", encoding="utf-8") as file:
+                self.assertEqual(json.load(file), json_store.read_leaderboards())
+            self.assertFalse(os.path.exists(journal_store.merged))
+
+            # A record cut short by a crash is skipped, and the next record still lands
+            with open(journal_store.journal, "a", encoding="utf-8") as file:
+                file.write('{"id": "torn", "level": "level1.in", "na')
+            journal_store.add_score("level1.in", "late", 1000)
+            self.assertEqual(journal_store.top_scores("level1.in")[0]["name"], "late")
+
+            # A compaction stopped before replacing the snapshot merged nothing
+            write_snapshot = leaderboard_utils._write_snapshot
+
+            def write_sidecar_only(filename: str, data: dict) -> None:
+                if filename != journal_store.merged:
+                    raise OSError("No space left on device")
+                write_snapshot(filename, data)
+
+            leaderboard_utils._write_snapshot = write_sidecar_only
+            try:
+                with self.assertRaises(OSError):
+                    journal_store.compact()
+            finally:
+                leaderboard_utils._write_snapshot = write_snapshot
+            self.assertEqual([entry["name"] for entry in journal_store.top_scores("level1.in")][:2],
+                             ["late", "player6"])
+
+            # Records still in the journal after the snapshot was replaced are not counted twice
+            def crash() -> None:
+                raise OSError("Interrupted")
+
+            journal_store._clear_journal = crash    # type: ignore[method-assign]
+            with self.assertRaises(OSError):
+                journal_store.compact()
+            del journal_store._clear_journal
+            self.assertGreater(os.path.getsize(journal_store.journal), 0)
+            for _ in range(2):
+                names = [entry["name"] for entry in journal_store.top_scores("level1.in")]
+                self.assertEqual(names.count("late"), 1)
+                journal_store.compact()
+            self.assertEqual(os.path.getsize(journal_store.journal), 0)
+            self.assertFalse(os.path.exists(journal_store.merged))
+            with open(journal_store.filename, "r", encoding="utf-8") as file:
+                entries = [entry for level in json.load(file).values() for entry in level]
+            self.assertTrue(all(entry.keys() == {"name", "score"} for entry in entries))
+
+
+    def _sqlite_stores(self) -> tuple[leaderboard_utils.JsonLeaderboardStore,
+                                      leaderboard_utils.SQLiteLeaderboardStore]:
+        """
+        Fills a JSON store and an SQLite store with the same 16 scores.
+
+        a.in gets 12 scores, more than a leaderboard keeps, including a tie for second
+        place. Both stores live in a temporary directory that is removed after the test.
+
+        Returns:
+            tuple: The JSON store and the SQLite store.
+        """
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        json_store = leaderboard_utils.JsonLeaderboardStore(os.path.join(directory.name, "leaderboard.json"))
+        store = leaderboard_utils.SQLiteLeaderboardStore(os.path.join(directory.name, "leaderboard.db"))
+        self.addCleanup(store.close)
+
+        scores = [("a.in", "ana", 30), ("a.in", "ben", 45), ("a.in", "cy", 30), ("a.in", "ana", 50),
+                  ("a.in", "ben", -5), ("a.in", "cy", 12), ("a.in", "ana", 7), ("a.in", "ben", 45),
+                  ("a.in", "cy", 0), ("a.in", "ana", 18), ("a.in", "ben", 22), ("a.in", "cy", 3),
+                  ("b.in", "ana", -20), ("b.in", "cy", 60), ("b.in", "ana", -3), ("c.in", "ben", 15)]
+        for level, player, score in scores:
+            json_store.add_score(level, player, score)
+            store.add_score(level, player, score)
+        return json_store, store
+
+
+    def test_sqlite_leaderboard_store(self) -> None:
+        """
+        Tests the per-level top scores of the `SQLiteLeaderboardStore` class.
+
+        They must match those of the JSON store given the same scores.
+        """
+        json_store, store = self._sqlite_stores()
+        self.assertEqual(store.read_leaderboards(), json_store.read_leaderboards())
+        self.assertEqual(len(store.read_leaderboards()["a.in"]), 10)
+        self.assertEqual(store.top_scores("a.in", 3), [
+            {"name": "ana", "score": 50}, {"name": "ben", "score": 45}, {"name": "ben", "score": 45}
+        ])
+        for level in ("a.in", "b.in", "c.in"):
+            self.assertEqual(store.top_scores(level, 3), json_store.top_scores(level, 3))
+        self.assertEqual(store.top_scores("missing.in"), [])
+
+
+    def test_sqlite_player_queries(self) -> None:
+        """
+        Tests the per-player queries and global rankings of the `SQLiteLeaderboardStore` class.
+
+        Every score must be kept in the player's history, and the rankings must order the
+        players by the sum of their best score on each level.
+        """
+        _, store = self._sqlite_stores()
+        self.assertEqual(store.player_best_scores("ana"), {"a.in": 50, "b.in": -3})
+        self.assertEqual(store.player_best_scores("ben"), {"a.in": 45, "c.in": 15})
+        self.assertEqual(store.player_best_scores("cy"), {"a.in": 30, "b.in": 60})
+        self.assertEqual(store.player_best_scores("dee"), {})
+        history = store.player_history("ana")
+        self.assertEqual([(entry["level"], entry["score"]) for entry in history],
+                         [("a.in", 30), ("a.in", 50), ("a.in", 7), ("a.in", 18), ("b.in", -20), ("b.in", -3)])
+
+        self.assertEqual(store.global_rankings(), [
+            {"name": "cy", "total": 90, "levels": 2},
+            {"name": "ben", "total": 60, "levels": 2},
+            {"name": "ana", "total": 47, "levels": 2},
+        ])
+        self.assertEqual(len(store.global_rankings(limit=1)), 1)
+
+
+    def test_sqlite_import_json(self) -> None:
+        """
+        Tests the `import_json` method of the `SQLiteLeaderboardStore` class.
+
+        Importing must put the JSON top scores into an empty database, and only once.
+        """
+        json_store, store = self._sqlite_stores()
+        imported = leaderboard_utils.SQLiteLeaderboardStore(os.path.join(os.path.dirname(store.filename), "imported.db"))
+        self.addCleanup(imported.close)
+        self.assertEqual(imported.import_json(json_store.filename), 10 + 3 + 1)
+        self.assertEqual(imported.import_json(json_store.filename), 0)
+        self.assertEqual(imported.read_leaderboards(), json_store.read_leaderboards())
+
+
+    def test_default_store(self) -> None:
+        """
+        Tests the `default_store` function of the `leaderboard_utils` module.
+
+        Every call must share the store of the kind chosen by the environment variable,
+        so that games do not each open a new store, and unknown kinds must be rejected.
+        """
+        kind = os.environ.get(leaderboard_utils.STORE_ENV_VAR)
+        try:
+            os.environ[leaderboard_utils.STORE_ENV_VAR] = "json"
+            store = leaderboard_utils.default_store()
+            self.assertIsInstance(store, leaderboard_utils.JsonLeaderboardStore)
+            self.assertIs(leaderboard_utils.default_store(), store)
+            self.assertIs(leaderboard_utils.Leaderboard("level1.in").store, store)
+            os.environ[leaderboard_utils.STORE_ENV_VAR] = "journal"
+            self.assertIsInstance(leaderboard_utils.default_store(), leaderboard_utils.JournalLeaderboardStore)
+            os.environ[leaderboard_utils.STORE_ENV_VAR] = "abacus"
+            with self.assertRaises(ValueError):
+                leaderboard_utils.default_store()
+        finally:
+            if kind is None:
+                os.environ.pop(leaderboard_utils.STORE_ENV_VAR, None)
+            else:
+                os.environ[leaderboard_utils.STORE_ENV_VAR] = kind
+
+
+    def test_level_index(self) -> None:
+        """
+        Tests the `LevelIndex` class of the `level_index` module.
+
+        This verifies the metadata of indexed levels, that refreshing only reads new and
+        changed files, that the index persists between instances, and name search.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            for name in ("level1.in", "level2.in", "cs11.in"):
+                with open(name, "r", encoding="utf-8") as source:
+                    with open(os.path.join(directory, name), "w", encoding="utf-8") as copy:
+                        copy.write(source.read())
+            with open(os.path.join(directory, "broken.in"), "w", encoding="utf-8") as file:
+                file.write("not a level")
+
+            reads: list[str] = []
+            read_level_info = level_index.read_level_info
+
+            def counting_read(path: str, size: int, mtime_ns: int) -> level_index.LevelInfo | None:
+                reads.append(os.path.basename(path))
+                return read_level_info(path, size, mtime_ns)
+
+            level_index.read_level_info = counting_read
+            try:
+                index = level_index.LevelIndex(directory)
+                self.assertTrue(index.refresh())
+                self.assertEqual(sorted(reads), ["broken.in", "cs11.in", "level1.in", "level2.in"])
+                self.assertEqual([level.name for level in index.search()], ["cs11.in", "level1.in", "level2.in"])
+
+                level1 = index.search("LEVEL1")[0]
+                grid = game_utils.Grid(filename=level1.path)
+                self.assertEqual((level1.rows, level1.cols), (len(grid.level_state), len(grid.level_state[0])))
+                self.assertEqual((level1.max_moves, level1.eggs, level1.nests), (grid.max_moves, 2, 2))
+                for level in index.search():
+                    grid = game_utils.Grid(filename=level.path)
+                    self.assertEqual((level.rows, level.cols), (len(grid.level_state), len(grid.level_state[0])))
+
+                # A new instance loads the saved index, and only reads files that changed
+                reads.clear()
+                index = level_index.LevelIndex(directory)
+                self.assertFalse(index.refresh())
+                self.assertEqual(reads, ["broken.in"])
+
+                reads.clear()
+                level2 = os.path.join(directory, "level2.in")
+                with open(level2, "a", encoding="utf-8") as file:
+                    file.write("\n")
+                os.remove(os.path.join(directory, "cs11.in"))
+                self.assertTrue(index.refresh())
+                self.assertEqual(sorted(reads), ["broken.in", "level2.in"])
+                self.assertEqual([level.name for level in index.search("")], ["level1.in", "level2.in"])
+                self.assertEqual(index.search("cs"), [])
+            finally:
+                level_index.read_level_info = read_level_info
+
+
+    def test_level_format(self) -> None:
+        """
+        Tests the packed level format of the `level_format` module.
+
+        This verifies that levels survive a round trip through the packed format (including
+        unknown tiles), that packed levels open as grids that play like text levels, and
+        that invalid files are rejected.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            generated = benchmark.generate_level(17, 41, 0.2, seed=5)
+            generated[1] = generated[1][:1] + 'X' + generated[1][2:]     # An unknown tile
+            custom = os.path.join(directory, "generated.in")
+            with open(custom, "w", encoding="utf-8") as file:
+                file.write("\n".join([str(len(generated)), "12"] + generated))
+
+            for source in ("level1.in", "level2.in", "cs11.in", custom):
+                packed = os.path.join(directory, "level.eggr")
+                unpacked = os.path.join(directory, "level.in")
+                level_format.pack_level(source, packed)
+                self.assertTrue(level_format.is_packed(packed))
+                self.assertFalse(level_format.is_packed(source))
+                level_format.unpack_level(packed, unpacked)
+
+                expected = game_utils.Grid(filename=source)
+                for grid in (level_format.load_packed(packed), level_format.open_level(packed),
+                             game_utils.Grid(filename=unpacked)):
+                    self.assertEqual(grid.level_state, expected.level_state)
+                    self.assertEqual(grid.max_moves, expected.max_moves)
+
+                # A packed grid plays, and undoes, like the text level
+                grid = level_format.load_packed(packed)
+                self.assertEqual(grid.engine, "compact")
+                for m in 'rbl':
+                    for game in (grid, expected):
+                        game.moves.append(game_utils.Move(m))
+                        game.roll()
+                    self.assertEqual((grid.level_state, grid.points), (expected.level_state, expected.points))
+                grid.level_states.undo()
+                self.assertEqual(grid.level_states[-1][0], grid.level_state)
+
+            with open(os.path.join(directory, "empty.eggr"), "wb"):
+                pass
+            for invalid in ("level1.in", os.path.join(directory, "empty.eggr")):
+                with self.assertRaises(ValueError):
+                    level_format.load_packed(invalid)
+
+
+    def test_landing_table(self) -> None:
+        """
+        Tests the slide landing tables of both engines.
+
+        This verifies the landing cell of each direction on a small grid, that filling
+        nests and undoing moves keep the tables, that the tables are rebuilt when an
+        obstacle is added, and where eggs sharing a landing cell end up.
+        """
+        level = ['🟩🥚🧱🟩', '🪹🟩🟩🍳', '🥚🟩🥚🟩']
+        grid = game_utils.CompactGrid(grid_data=(level, 5))
+        self.assertEqual(grid._landing_table(0, 1)[0], 1)      # Stopped by the wall
+        self.assertEqual(grid._landing_table(0, -1)[6], 5)     # Stopped by the nest
+        self.assertEqual(grid._landing_table(0, 1)[9], ~11)    # Stopped by the edge
+        self.assertEqual(grid._landing_table(-1, 0)[9], ~1)
+        self.assertEqual(grid._landing_table(1, 0)[0], 0)
+
+        emoji_grid = game_utils.Grid(grid_data=(level, 5))
+        self.assertEqual(emoji_grid._landing_table(0, 1)[0][0], ((0, 1), False))
+        self.assertEqual(emoji_grid._landing_table(0, -1)[1][2], ((1, 1), False))
+        self.assertEqual(emoji_grid._landing_table(0, 1)[2][1], ((2, 3), True))
+        self.assertEqual(emoji_grid._landing_table(-1, 0)[2][1], ((0, 1), True))
+        self.assertEqual(emoji_grid._landing_table(1, 0)[0][0], ((0, 0), False))
+
+        for grid in [grid, emoji_grid]:
+            tables = dict(grid._landings)
+            for m in 'fl':      # Forward fills the nest
+                grid.moves.append(game_utils.Move(m))
+                grid.roll(resolution="slide")
+            self.assertEqual(grid.level_state[1][0], '🪺')
+            grid.level_states.undo()
+            grid.level_states.undo()
+            self.assertEqual(grid._landings, tables)
+            grid._set_position((1, 1), '🧱')
+            self.assertEqual(grid._landings, {})
+        self.assertEqual(grid._landing_table(0, -1)[1][2], ((1, 2), False))
+
+        for engine in ["emoji", "compact"]:
+            stepped = game_utils.Grid(grid_data=(['🥚🥚🟩🪹', '🟩🥚🍳🟩', '🥚🟩🟩🧱'], 4), engine=engine)
+            slid = game_utils.Grid(grid_data=(['🥚🥚🟩🪹', '🟩🥚🍳🟩', '🥚🟩🟩🧱'], 4), engine=engine)
+            for game in [stepped, slid]:
+                game.moves.append(game_utils.Move('r'))
+            stepped.roll()
+            slid.roll(resolution="slide")
+            # One egg fills the nest and the next stops against it; one falls into the pan
+            self.assertEqual(slid.level_state, [list('🟩🟩🥚🪺'), list('🟩🟩🍳🟩'), list('🟩🟩🥚🧱')])
+            self.assertEqual((slid.level_state, slid.points), (stepped.level_state, stepped.points))
+            self.assertEqual(slid.points, game_utils.calculate_points(4, slid.moves) - 5)
+
+            for game in [stepped, slid]:
+                game._set_position((2, 1), '🧱')
+                game.moves.append(game_utils.Move('l'))
+            stepped.roll()
+            slid.roll(resolution="slide")
+            self.assertEqual(slid.level_state, [list('🥚🟩🟩🪺'), list('🟩🟩🍳🟩'), list('🟩🧱🥚🧱')])
+            self.assertEqual(slid.level_state, stepped.level_state)
+
+            game = game_utils.Grid(grid_data=(['🟩🥚🥚🥚🧱'], 1), engine=engine)
+            game.moves.append(game_utils.Move('l'))
+            game.roll(resolution="slide")
+            self.assertEqual(game.level_state, [list('🥚🥚🥚🟩🧱')])    # Stacked against the edge
+
+
+    def test_egg_index(self) -> None:
+        """
+        Tests the egg index kept by the emoji engine.
+
+        A small grid is rolled (with both resolutions), undone, edited, and reassigned;
+        after every change, the index must list the expected eggs, in the same order as a
+        scan of the whole grid.
+        """
+        index = game_utils.EggIndex([['🥚', '🟩'], ['🥚', '🥚']])
+        self.assertEqual(len(index), 3)
+        self.assertEqual(index.ordered(game_utils.Move('r')), [(1, 1), (1, 0), (0, 0)])
+        index.remove((1, 0))
+        self.assertEqual(index.ordered(), [(0, 0), (1, 1)])
+        with self.assertRaises(KeyError):
+            index.remove((0, 1))
+
+        def scan(grid: game_utils.Grid) -> list[tuple[int, int]]:
+            return [(r, c) for r, row in enumerate(grid.level_state) for c, cell in enumerate(row) if cell == '🥚']
+
+        grid = game_utils.Grid(grid_data=(['🥚🟩🪹', '🟩🥚🟩', '🥚🍳🥚'], 10))
+
+        def roll(m: str, resolution: str, expected: list[tuple[int, int]]) -> None:
+            grid.moves.append(game_utils.Move(m))
+            grid.roll(resolution=resolution)
+            self.assertEqual((grid.eggs.ordered(), scan(grid)), (expected, expected))
+
+        def undo(expected: list[tuple[int, int]]) -> None:
+            grid.moves.pop()
+            grid.level_states.undo()
+            self.assertEqual((grid.eggs.ordered(), scan(grid)), (expected, expected))
+
+        roll('r', "step", [(1, 2), (2, 2)])      # One egg fills the nest, one falls into the pan
+        roll('f', "slide", [(1, 2), (2, 2)])     # Blocked by the filled nest
+        undo([(1, 2), (2, 2)])
+        grid._set_position((0, 0), '🥚')
+        self.assertEqual(grid.eggs.ordered(), [(0, 0), (1, 2), (2, 2)])
+        roll('l', "slide", [(0, 0), (1, 0)])
+        undo([(0, 0), (1, 2), (2, 2)])
+        roll('b', "step", [(1, 2), (2, 0), (2, 2)])
+        self.assertEqual(len(grid.eggs), 3)
+        grid.level_state = grid.level_states[0][0]
+        self.assertEqual(grid.eggs.ordered(), [(0, 0), (1, 1), (2, 0), (2, 2)])
+        grid._set_position((1, 1), '🍳')
+        grid._set_position((2, 0), '🟩')
+        roll('b', "slide", [(2, 0), (2, 2)])     # The egg at (1, 1) was replaced by a pan
+
+
+    def test_egg_index_edited_in_place(self) -> None:
+        """
+        Tests that the egg index of the emoji engine follows cells edited in place.
+
+        Eggs removed, added, or moved by writing into `level_state` directly (a cell, a
+        slice of a row, or a whole row) must be seen by `is_present`, `eggs` and
+        `_find_eggs`, and by the next roll.
+        """
+        grid = game_utils.Grid(filename="level1.in")
+        grid.level_state[1][5] = '🟩'
+        grid.level_state[1][6] = '🟩'
+        self.assertFalse(grid.is_present('🥚'))
+        self.assertEqual(len(grid.eggs), 0)
+        self.assertEqual(grid._find_eggs(), [])
+
+        grid.level_state[2][3] = '🥚'
+        self.assertTrue(grid.is_present('🥚'))
+        self.assertEqual(grid._find_eggs(game_utils.Move('l')), [(2, 3)])
+
+        grid.level_state[2][1:3] = ['🥚', '🥚']
+        self.assertEqual(grid._find_eggs(game_utils.Move('r')), [(2, 3), (2, 2), (2, 1)])
+
+        row = ['🧱', '🥚', '🟩', '🟩', '🟩', '🟩', '🟩', '🧱']
+        grid.level_state[1] = row
+        row[2] = '🥚'   # The row was copied into the grid, so this edit is not seen
+        self.assertEqual(grid._find_eggs(), [(1, 1), (2, 1), (2, 2), (2, 3)])
+
+        grid.moves.append(game_utils.Move('f'))
+        grid.roll()
+        self.assertEqual(grid._find_eggs(), [(1, 1), (1, 2), (1, 3), (2, 1)])   # (2, 1) is blocked by (1, 1)
+        self.assertEqual(grid.level_state[2][1:4], ['🥚', '🟩', '🟩'])
+
+        copy = grid.copy_grid()
+        copy[1][1] = '🟩'
+        self.assertEqual(len(grid.eggs), 4)
+
+
+    def test_parallel_solver(self) -> None:
+        """
+        Tests the `ParallelSolver` class of the `solver` module.
+
+        The parallel search must find the same score and moves as the sequential solver,
+        on small hand-written grids (some with moves already played) and on a shipped level
+        searched by several processes.
+        """
+        # (level, max moves, moves already played, best score, best moves)
+        cases: list[tuple[list[str], int, str, int, str]] = [
+            (['🥚🟩🟩', '🧱🧱🟩', '🪹🟩🟩'], 3, '', 11, 'rbl'),
+            (['🥚🟩🟩', '🧱🧱🟩', '🪹🟩🟩'], 3, 'r', 11, 'bl'),
+            (['🪹🥚🥚🪹', '🟩🧱🟩🍳'], 4, '', 27, 'lr'),
+            (['🪹🥚🥚🪹', '🟩🧱🟩🍳'], 4, 'b', 24, 'lfr'),  # One egg has to be brought back up
+            (['🍳🥚🟩'], 2, '', 0, ''),
+        ]
+        for level, max_moves, played, score, moves in cases:
+            grid = game_utils.Grid(grid_data=(level, max_moves))
+            for m in played:
+                grid.moves.append(game_utils.Move(m))
+                grid.roll()
+            solution = solver.ParallelSolver(grid, workers=1).solve()
+            self.assertEqual(solution, solver.Solution(score, moves))
+            self.assertEqual(solution, solver.Solver(grid).solve())
+
+        self.assertEqual(solver.solve_level("level2.in", workers=2), solver.solve_level("level2.in"))
+
+
+    def test_solver_cli(self) -> None:
+        """
+        Tests the command line of the `solver` module.
+
+        `--workers` must take a number, so that it never swallows the level that follows it,
+        and the parallel search must print the same solution as the sequential one.
+        """
+        expected = solver.solve_level("level1.in")
+        for argv in (["level1.in"], ["--workers", "1", "level1.in"], ["level1.in", "--workers", "1"]):
+            with self.subTest(argv=argv):
+                output = io.StringIO()
+                with contextlib.redirect_stdout(output):
+                    solver.main(argv)
+                self.assertEqual(
+                    output.getvalue(), f"level1.in: {expected.score} points with moves '{expected.moves}'\n"
+                )
+
+        with contextlib.redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+            solver.main(["--workers", "level1.in"])
+
+
+    def test_level_generator(self) -> None:
+        """
+        Tests the `level_generator` module.
+
+        Generated levels must have the requested tiles, be reproducible from their seed,
+        and play as verified: replaying the reported moves from the written file reaches
+        the reported score and fills every nest. Impossible shapes are rejected.
+        """
+        spec = level_generator.LevelSpec(
+            rows=6, cols=7, eggs=2, nests=2, pans=1, walls=2, max_moves=6
+        )
+        layout = level_generator.random_layout(spec, 7)
+        self.assertEqual(layout, level_generator.random_layout(spec, 7))
+        self.assertEqual((len(layout), len(layout[0])), (spec.rows, spec.cols))
+        self.assertEqual(''.join(layout).count('🥚'), 2)
+        self.assertEqual(''.join(layout).count('🧱'), 2 * spec.rows + 2 * spec.cols - 4 + spec.walls)
+
+        levels = level_generator.generate_levels(spec, 2, workers=1, max_attempts=500)
+        self.assertEqual(len(levels), 2)
+        self.assertEqual(levels, level_generator.generate_levels(spec, 2, workers=1, max_attempts=500))
+        with tempfile.TemporaryDirectory() as directory:
+            for level, path in zip(levels, level_generator.write_levels(levels, directory)):
+                self.assertGreaterEqual(len(level.moves), spec.min_moves)
+                self.assertTrue(0 <= level.difficulty <= 1)
+                grid = game_utils.Grid(filename=str(path))
+                self.assertEqual(grid.level_state, [list(row) for row in level.rows])
+                for m in level.moves:
+                    grid.moves.append(game_utils.Move(m))
+                    grid.roll()
+                self.assertEqual(grid.points, level.score)
+                self.assertEqual(sum(row.count('🪺') for row in grid.level_state), 2)
+
+        with self.assertRaises(ValueError):
+            level_generator.generate_levels(level_generator.LevelSpec(rows=4, cols=4, eggs=3, nests=2), 1)
+
+
+    def test_instrumentation(self) -> None:
+        """
+        Tests the `instrumentation` module.
+
+        While enabled, rolls, egg searches, journal records, and localization loads (also
+        through the modules that imported `load_localization`) must be counted and written
+        to the report. Disabling restores the original functions.
+        """
+        original_apply_move = game_utils.Grid._apply_move
+        original_localization = terminal_utils.load_localization
+        instrumentation.enable(report_file=None)
+        try:
+            self.assertTrue(instrumentation.enabled())
+            self.assertIsNot(egg_roll.load_localization, original_localization)
+            grid = game_utils.Grid(grid_data=(self.initial_grids["grid_cs11"], 15))
+            compact = game_utils.Grid(grid_data=(self.initial_grids["grid_cs11"], 15), engine="compact")
+            moves = ['b', 'f', 'l']
+            for m in moves:
+                grid.moves.append(game_utils.Move(m))
+                grid.roll()
+                compact.moves.append(game_utils.Move(m))
+                compact.roll()
+            grid.is_present('🍳')
+            grid.level_state[1][1] = '🥚'
+            grid.is_present('🥚')
+            egg_roll.load_localization()
+            instrumentation.count("custom", 3)
+
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, "profile.json")
+                instrumentation.write_report(path)
+                with open(path, "r", encoding="utf-8") as file:
+                    hooks = json.load(file)["hooks"]
+        finally:
+            instrumentation.disable()
+
+        self.assertEqual(hooks["game_utils.MoveJournal.record"]["calls"], 2 * len(moves))
+        self.assertEqual(hooks["game_utils.Grid._apply_move"]["calls"], hooks["game_utils.Grid._find_eggs"]["calls"])
+        snapshots = hooks["game_utils.Grid._snapshot"]["calls"] + hooks["game_utils.CompactGrid._snapshot"]["calls"]
+        self.assertEqual(hooks["game_utils.Grid.iter_roll"]["items"], snapshots)
+        self.assertEqual(hooks["terminal_utils.load_localization"]["calls"], 1)
+        self.assertEqual(hooks["custom"]["items"], 3)
+        self.assertEqual(hooks["game_utils.Grid.is_present"]["cells_scanned"], 15 * 15)
+        self.assertEqual(hooks["game_utils.EggIndex.ordered"]["sorts"], hooks["game_utils.EggIndex.ordered"]["calls"])
+        # The index is built when the grid is loaded, then rebuilt after the edit above
+        self.assertEqual(hooks["game_utils.EggIndex.rebuild"]["cells_scanned"], 2 * 15 * 15)
+        egg_searches = hooks["game_utils.CompactGrid._egg_indices"]
+        self.assertEqual(egg_searches["cells_scanned"], egg_searches["calls"] * 15 * 15)
+        self.assertLessEqual(egg_searches["sorts"], egg_searches["calls"])
+        self.assertGreater(egg_searches["sorts"], 0)     # Only left and right tilts need a sort
+        self.assertLess(egg_searches["sorts"], egg_searches["calls"])
+        self.assertFalse(instrumentation.enabled())
+        self.assertIs(game_utils.Grid._apply_move, original_apply_move)
+        self.assertIs(egg_roll.load_localization, original_localization)
+
+
+    def test_async_game(self) -> None:
+        """
+        Tests the `async_game` module.
+
+        Two sessions share one event loop. All of their input is typed at once, so every
+        animation must be skipped instead of taking the full tilt duration, and each game
+        must end with the same points as replaying its moves. The asynchronous scheduler
+        must still pace frames over the tilt when no input is waiting.
+        """
+        frames = [{(0, i): '🥚', (0, i - 1): '🟩'} for i in range(1, 31)]
+        expected = terminal_utils._merge_frames(frames, terminal_utils.merge_changes)
+        drawn: list[dict[tuple[int, int], str]] = []
+        scheduler = terminal_utils.FrameScheduler(tilt_duration=0.1, frame_budget=0.02)
+        start = time.monotonic()
+        asyncio.run(scheduler.play_async(frames, drawn.append, terminal_utils.merge_changes))
+        self.assertGreaterEqual(time.monotonic() - start, 0.1)
+        self.assertEqual(terminal_utils._merge_frames(drawn, terminal_utils.merge_changes), expected)
+
+        movesets = ["fr", "lbl"]
+
+        async def play(store: leaderboard_utils.LeaderboardStore) -> list[GameState]:
+            sessions = []
+            for i, moves in enumerate(movesets):
+                reader = asyncio.StreamReader()
+                # One line per move, a name in case the game ended, then leave the level
+                reader.feed_data(('\n'.join(moves) + f"\nreturn\nplayer{i}\nn\n").encode())
+                reader.feed_eof()
+                sessions.append(async_game.GameSession(
+                    "level1.in", reader, io.StringIO(),
+                    terminal_utils.FrameScheduler(tilt_duration=10), store=store, width=80, height=24
+                ))
+            states = await async_game.run_sessions(sessions)
+            for session, moves, points in zip(sessions, movesets, [0, 15]):
+                assert session.game is not None
+                self.assertEqual(session.game.points, points)
+                self.assertEqual(session.game.points, egg_roll.replay("level1.in", moves)["points"])
+            return states
+
+        with tempfile.TemporaryDirectory() as directory:
+            store = leaderboard_utils.JsonLeaderboardStore(os.path.join(directory, "leaderboard.json"))
+            start = time.monotonic()
+            self.assertEqual(asyncio.run(play(store)), [GameState.RETURN, GameState.RETURN])
+            self.assertLess(time.monotonic() - start, 5)
+
+
+    def test_level_cache(self) -> None:
+        """
+        Tests the `LevelCache` class of the `game_server` module.
+
+        Every level opened from the cache must be a fresh compact grid, unaffected by the
+        moves played on the grids opened before it.
+        """
+        levels = game_server.LevelCache(["level1.in", "cs11.in"])
+        self.assertEqual(levels.names(), ["level1.in", "cs11.in"])
+        grid = levels.open("cs11.in")
+        self.assertEqual(grid.engine, "compact")
+        grid.moves.append(game_utils.Move('f'))
+        grid.roll()
+        self.assertEqual(levels.open("cs11.in").level_state, game_utils.Grid(filename="cs11.in").level_state)
+
+
+    def test_async_game_in_progress(self) -> None:
+        """
+        Tests the `game_in_progress` property of the `GameSession` class.
+
+        It must hand over the game of a player who left the level before it ended, so
+        that it can be saved, and nothing once the game has ended.
+        """
+        async def play(lines: str, store: leaderboard_utils.LeaderboardStore) -> async_game.GameSession:
+            reader = asyncio.StreamReader()
+            reader.feed_data(lines.encode())
+            reader.feed_eof()
+            session = async_game.GameSession(
+                "level1.in", reader, io.StringIO(), terminal_utils.FrameScheduler(instant=True),
+                store=store, width=80, height=24
+            )
+            await session.run()
+            return session
+
+        with tempfile.TemporaryDirectory() as directory:
+            store = leaderboard_utils.JsonLeaderboardStore(os.path.join(directory, "leaderboard.json"))
+            left = asyncio.run(play("b\nreturn\n", store))
+            finished = asyncio.run(play("l\nb\nl\nf\nplayer\nn\n", store))
+
+        self.assertIs(left.game_in_progress, left.game)
+        assert left.game is not None
+        self.assertEqual(''.join(move.move_string for move in left.game.moves), 'b')
+        self.assertIsNone(finished.game_in_progress)
+        self.assertIsNotNone(finished.game)
+
+
+    def test_game_server(self) -> None:
+        """
+        Tests the `game_server` module.
+
+        Two clients connect to the same server at once, each choosing its own language
+        and level. Each must be answered in its own language, reach the same points as
+        replaying its moves, and be disconnected once it exits.
+        """
+        levels = game_server.LevelCache(["level1.in", "cs11.in"])
+        clients = [("en", "lbl"), ("tl", "rb")]
+
+        async def connect(port: int, language: str, moves: str) -> str:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(f"{language}\n9\n2\n{moves}\nexit\n".encode())
+            output = await reader.read()
+            writer.close()
+            return output.decode()
+
+        async def serve(store: leaderboard_utils.LeaderboardStore) -> list[str]:
+            server = game_server.GameServer(levels, store, tilt_duration=0.05)
+            listener = await server.start("127.0.0.1", 0)
+            port = listener.sockets[0].getsockname()[1]
+            async with listener:
+                outputs = await asyncio.gather(*(connect(port, *client) for client in clients))
+            self.assertEqual((server.active, server.served), (0, 2))
+            return list(outputs)
+
+        with tempfile.TemporaryDirectory() as directory:
+            store = leaderboard_utils.JsonLeaderboardStore(os.path.join(directory, "leaderboard.json"))
+            outputs = asyncio.run(serve(store))
+
+        for (language, moves), output, points in zip(clients, outputs, [24, 0]):
+            loc = terminal_utils.load_localization(language)
+            self.assertEqual(egg_roll.replay("cs11.in", moves)["points"], points)
+            self.assertIn(str(loc["prompt_enter_moves_or_cmd"]), output)
+            self.assertIn(str(loc["error_invalid_choice"]).format(choice=9), output)
+            self.assertRegex(output, re.escape(f"{loc['game_points']}{points}") + r"\D")
+            self.assertIn(str(loc["exit_goodbye"]), output)
+        self.assertNotIn(str(terminal_utils.load_localization("tl")["exit_goodbye"]), outputs[0])
+
+
+    def test_game_server_store(self) -> None:
+        """
+        Tests that the `game_server` module saves scores off the event loop.
+
+        A client that finishes a level must find its score on the leaderboard, and the
+        store must only be called from the server's store thread.
+        """
+        solution = solver.solve_level("level1.in")
+        threads = []
+
+        class RecordingStore(leaderboard_utils.JsonLeaderboardStore):
+            def add_score(self, level_name: str, player_name: str, score: int) -> None:
+                threads.append(threading.current_thread())
+                super().add_score(level_name, player_name, score)
+
+        async def play(store: leaderboard_utils.LeaderboardStore) -> str:
+            server = game_server.GameServer(game_server.LevelCache(["level1.in"]), store, instant=True)
+            listener = await server.start("127.0.0.1", 0)
+            async with listener:
+                reader, writer = await asyncio.open_connection("127.0.0.1", listener.sockets[0].getsockname()[1])
+                writer.write(f"en\n1\n{solution.moves}\nbot\nn\nexit\n".encode())
+                output = await reader.read()
+                writer.close()
+            return output.decode()
+
+        with tempfile.TemporaryDirectory() as directory:
+            store = RecordingStore(os.path.join(directory, "leaderboard.json"))
+            output = asyncio.run(play(store))
+            self.assertEqual(store.top_scores("level1.in"), [{"name": "bot", "score": solution.score}])
+        self.assertIn("bot", output)
+        self.assertEqual(len(threads), 1)
+        self.assertIsNot(threads[0], threading.main_thread())
+
+
+    def test_load_test(self) -> None:
+        """
+        Tests the `load_test` module.
+
+        Three bots play seeded random and solver moves against an in-process server.
+        Every move must be timed without errors, and the report must be valid JSON with
+        ordered latency percentiles.
+        """
+        summary = load_test._latency_summary([i / 1000 for i in range(1, 101)])
+        self.assertEqual((summary["p50"], summary["p90"], summary["p99"], summary["max"]), (50, 90, 99, 100))
+        self.assertIsNone(load_test._latency_summary([])["p50"])
+
+        levels = game_server.LevelCache(["level1.in", "level2.in"])
+        for source in load_test.MOVE_SOURCES:
+            clients, seed = 3, 7
+            report = asyncio.run(load_test.run_load_test(levels, clients, source, seed, tilt_duration=0.01))
+            plays = load_test.move_strings(levels, clients, source, seed)
+            self.assertEqual([level for level, _ in plays], ["level1.in", "level2.in", "level1.in"])
+            self.assertEqual(report["errors"], {})
+            self.assertLessEqual(report["moves"], sum(len(moves) for _, moves in plays))
+            self.assertGreater(report["frames"], 0)
+            self.assertGreaterEqual(report["memory_per_session_bytes"], 0)  # Less the bots' own memory
+            latency = report["latency_ms"]
+            self.assertLessEqual(latency["p50"], latency["p90"])
+            self.assertLessEqual(latency["p99"], latency["max"])
+            self.assertEqual(json.loads(json.dumps(report))["config"]["clients"], clients)
+
+
+    def _played_game(self) -> tuple[game_utils.Grid, str]:
+        """
+        Plays 13 moves on cs11.in, which earn 22 points without ending the level.
+
+        Returns:
+            tuple[game_utils.Grid, str]: The game, and the moves played on it.
+        """
+        moves = "rbflrbflrfblr"
+        game = game_utils.Grid(filename="cs11.in")
+        for m in moves:
+            game.moves.append(game_utils.Move(m))
+            game.roll()
+        return game, moves
+
+
+    def test_pack_moves(self) -> None:
+        """
+        Tests the `pack_moves` and `unpack_moves` functions of the `save_state` module.
+
+        Moves must be packed in two bits each, whatever their case, and unpacked unchanged.
+        """
+        self.assertEqual(save_state.pack_moves(""), b"")
+        self.assertEqual(save_state.pack_moves("fblr"), bytes([0b11_10_01_00]))    # First move in the low bits
+        self.assertEqual(save_state.pack_moves("FbLrR"), bytes([0b11_10_01_00, 0b11]))
+        for moves in ["", "f", "rrrrb", "lbrflbrflbrf"]:
+            self.assertEqual(save_state.unpack_moves(save_state.pack_moves(moves.upper()), len(moves)), moves)
+            self.assertEqual(len(save_state.pack_moves(moves)), (len(moves) + 3) // 4)
+
+
+    def test_save_state(self) -> None:
+        """
+        Tests the `capture` and `restore` functions of the `save_state` module.
+
+        A game saved after 13 moves must fit in a few bytes per move, and resuming
+        it on either engine must rebuild the same grid, points and moves, with the moves
+        still undoable.
+        """
+        game, moves = self._played_game()
+        state = save_state.capture(game, "cs11.in", checkpoint_interval=4)
+        data = state.to_bytes()
+        self.assertEqual(len(data), 48 + 4 + 3 * 8)   # Header, packed moves, three checkpoints
+        self.assertEqual(state.points, 22)
+        self.assertEqual(save_state.SaveState.from_bytes(data), state)
+
+        resumed = save_state.restore("cs11.in", state)
+        self.assertEqual(resumed.engine, game.engine)
+        self.assertEqual((resumed.level_state, resumed.points), (game.level_state, game.points))
+        self.assertEqual(''.join(move.move_string for move in resumed.moves), moves)
+        compact = save_state.restore("cs11.in", state, engine="compact")
+        self.assertEqual(compact.engine, "compact")
+        self.assertEqual((compact.level_state, compact.points), (game.level_state, game.points))
+        resumed.moves.pop()
+        resumed.level_states.undo()
+        self.assertEqual((resumed.level_state, resumed.points), game.level_states[-2])
+
+
+    def test_restore_engine(self) -> None:
+        """
+        Tests that `restore` replays the moves on the compact engine.
+
+        The game must then be handed over on the requested engine, with every state of
+        its undo history (across journal checkpoints) the same as in the original game.
+        """
+        moves = 'rbrflbrfblrflbf' * 3
+        game = game_utils.Grid(filename="labyrinth.in")
+        for m in moves:
+            game.moves.append(game_utils.Move(m))
+            game.roll()
+        state = save_state.capture(game, "labyrinth.in", checkpoint_interval=16)
+
+        engines, open_level = [], save_state.open_level
+        save_state.open_level = lambda filename, engine="emoji": engines.append(engine) or open_level(filename, engine)
+        try:
+            resumed = {engine: save_state.restore("labyrinth.in", state, engine) for engine in game_utils.ENGINES}
+        finally:
+            save_state.open_level = open_level
+        self.assertEqual(engines, ["compact", "compact"])
+
+        history = [game.level_states[i] for i in range(len(moves) + 1)]
+        for engine, grid in resumed.items():
+            self.assertEqual(grid.engine, engine)
+            self.assertEqual(''.join(move.move_string for move in grid.moves), moves)
+            self.assertEqual([grid.level_states[i] for i in range(len(moves) + 1)], history)
+            self.assertEqual(sorted(grid.level_states.checkpoints), [0, 20, 40])
+            grid.moves.pop()
+            grid.level_states.undo()
+            self.assertEqual((grid.level_state, grid.points), history[-2])
+
+
+    def test_save_state_rejected(self) -> None:
+        """
+        Tests that the `save_state` module rejects saves that do not match their level.
+
+        Saves of another level, truncated saves, and saves whose checkpoints or points
+        do not match the replayed moves must raise a ValueError.
+        """
+        game, moves = self._played_game()
+        state = save_state.capture(game, "cs11.in", checkpoint_interval=4)
+        data = state.to_bytes()
+        with self.assertRaises(ValueError):
+            save_state.restore("level1.in", state)
+        with self.assertRaises(ValueError):
+            save_state.restore("cs11.in", save_state.SaveState(state.level_hash, moves, state.points + 1))
+        with self.assertRaises(ValueError):
+            save_state.SaveState.from_bytes(data[:-1])
+        with self.assertRaises(ValueError):
+            save_state.SaveState.from_bytes(data[:20])
+        state.checkpoints[-1] = (state.checkpoints[-1][0], state.checkpoints[-1][1] ^ 1)
+        with self.assertRaises(ValueError):
+            save_state.restore("cs11.in", state)
+
+
+    def test_save_files(self) -> None:
+        """
+        Tests the save files of the `save_state` module.
+
+        A saved game must be found and loaded again until it is deleted, and the level
+        must be hashed only once per save.
+        """
+        game, _ = self._played_game()
+        save_dir = save_state.SAVE_DIR
+        with tempfile.TemporaryDirectory() as directory:
+            save_state.SAVE_DIR = Path(directory)
+            try:
+                self.assertIsNone(save_state.load_game("cs11.in"))
+                hashes = []
+                level_hash = save_state.level_hash
+                save_state.level_hash = lambda filename: hashes.append(filename) or level_hash(filename)
+                try:
+                    save_state.save_game(game, "cs11.in")
+                finally:
+                    save_state.level_hash = level_hash
+                self.assertEqual(hashes, ["cs11.in"])
+                self.assertTrue(save_state.has_save("cs11.in"))
+                self.assertEqual(save_state.load_game("cs11.in").level_state, game.level_state)
+                save_state.delete_save("cs11.in")
+                self.assertFalse(save_state.has_save("cs11.in"))
+            finally:
+                save_state.SAVE_DIR = save_dir
+
+
+    def test_save_files_of_identical_levels(self) -> None:
+        """
+        Tests that two level files with the same contents keep separate saves.
+
+        Saving or deleting the game of one must not touch the save of the other.
+        """
+        save_dir = save_state.SAVE_DIR
+        with tempfile.TemporaryDirectory() as directory:
+            save_state.SAVE_DIR = Path(directory) / "saves"
+            levels = [os.path.join(directory, name) for name in ("level1.in", "copy.in")]
+            for level in levels:
+                shutil.copyfile("level1.in", level)
+            try:
+                games = []
+                for level, m in zip(levels, "bf"):
+                    game = game_utils.Grid(filename=level)
+                    game.moves.append(game_utils.Move(m))
+                    game.roll()
+                    games.append(game)
+                save_state.save_game(games[0], levels[0])
+                self.assertFalse(save_state.has_save(levels[1]))
+                save_state.save_game(games[1], levels[1])
+                for level, m in zip(levels, "bf"):
+                    resumed = save_state.load_game(level)
+                    assert resumed is not None
+                    self.assertEqual(resumed.moves, [game_utils.Move(m)])
+                save_state.delete_save(levels[0])
+                self.assertEqual([save_state.has_save(level) for level in levels], [False, True])
+            finally:
+                save_state.SAVE_DIR = save_dir
+
+
+    def test_save_failure_reported(self) -> None:
+        """
+        Tests that leaving a level reports a game that could not be saved.
+
+        The player must be told, in their language, that the game was not saved, instead
+        of being told that it was.
+        """
+        game = game_utils.Grid(filename="level1.in")
+        game.moves.append(game_utils.Move('b'))
+        game.roll()
+        loc = terminal_utils.load_localization()
+        save_dir, display_main_menu = save_state.SAVE_DIR, egg_roll.display_main_menu
+        with tempfile.TemporaryDirectory() as directory:
+            blocker = Path(directory) / "saves"
+            blocker.write_text("not a directory")
+            save_state.SAVE_DIR = blocker / "saves"
+            egg_roll.display_main_menu = lambda: None
+            output = io.StringIO()
+            try:
+                with contextlib.redirect_stdout(output):
+                    egg_roll.update_game(GameState.RETURN, "level1.in", game)
+            finally:
+                save_state.SAVE_DIR, egg_roll.display_main_menu = save_dir, display_main_menu
+        self.assertIn(str(loc["error_game_not_saved"]).split("(")[0].strip(), output.getvalue())
+        self.assertNotIn(str(loc["game_saved"]), output.getvalue())
+
+
+    def test_tournament(self) -> None:
+        """
+        Tests the `tournament` module.
+
+        Every bot must finish every level the way a player would, the solver bot must
+        reach the solver's best score, and the results must not depend on the number
+        of worker processes.
+        """
+        levels = tournament.load_levels(["level1.in", "level2.in"])
+        seeds = 2
+        results = tournament.run_tournament(levels, seeds=seeds, workers=2)
+        self.assertEqual(len(results), len(levels) * (2 * seeds + 1))
+
+        for result in results:
+            rows, max_moves = levels[result.level]
+            replayed = egg_roll.replay(result.level, result.moves)
+            self.assertEqual(result.points, replayed["points"])
+            self.assertEqual(result.end_reason, replayed["end_reason"])
+            self.assertLessEqual(len(result.moves), max_moves)
+            if result.bot == "solver":
+                self.assertEqual(result.points, solver.solve_level(result.level).score)
+
+        def outcomes(results: list[tournament.GameResult]) -> list[tuple[str, str, int, int, str]]:
+            return [(r.bot, r.level, r.seed, r.points, r.moves) for r in results]
+
+        self.assertEqual(outcomes(tournament.run_tournament(levels, seeds=seeds, workers=1)), outcomes(results))
+        summary = tournament.summarize(results)
+        self.assertEqual(len(summary), 3 * len(levels))
+        self.assertEqual(sum(row["games"] for row in summary), len(results))
+        for row in summary:
+            self.assertEqual(row["no_more_eggs"] + row["ran_out_of_moves"] + row["stopped"], row["games"])
+            self.assertLessEqual(row["worst_points"], row["mean_points"])
+            self.assertLessEqual(row["mean_points"], row["best_points"])
+        with self.assertRaises(ValueError):
+            tournament.run_tournament(levels, bots=("clever",))
+
+        # The greedy bot takes the only tilt that fills a nest, then avoids the pan
+        for engine in ["emoji", "compact"]:
+            game = game_utils.Grid(grid_data=(['🥚🟩🪹', '🟩🧱🧱', '🍳🟩🥚'], 4), engine=engine)
+            moves = tournament.bot_moves("greedy", game, Random(0))
+            self.assertEqual(next(moves), 'r')
+            game.moves.append(game_utils.Move('r'))
+            game.roll(resolution="slide")
+            self.assertIn(next(moves), 'fbr')
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "results.csv")
+            tournament.write_csv(results, path)
+            with open(path, "r", encoding="utf-8") as file:
+                self.assertEqual(len(file.read().splitlines()), len(results) + 1)
+
+
     def test_calculate_points(self) -> None:
         """
         Tests the `calculate_points` function of the game_utils module.
@@ -0,0 +1,341 @@
+"""
+Copyright 2025 Renz Jared Rolle.
+
+Licensed under the GNU General Public License, Version 3 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://github.com/renzjared/egg-roll/blob/main/LICENSE
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+@author Renz Jared Rolle <rgrolle@up.edu.ph>
+"""
+
+import argparse
+import csv
+import json
+import os
+import random
+import sys
+import time
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Iterator
+
+from egg_roll import EndReason
+from game_utils import CompactGrid, Grid, Move
+from level_format import open_level
+from solver import MOVE_ORDER, Solver
+from terminal_utils import create_table
+
+BOTS: tuple[str, ...] = ("greedy", "random", "solver")
+DETERMINISTIC_BOTS = frozenset({"solver"})  # Bots that play every seed the same way, so only play it once
+JOBS_PER_WORKER = 4     # Jobs handed to a worker at a time
+LevelData = tuple[list[str], int]       # The rows and maximum moves of a level
+
+_worker_levels: dict[str, LevelData] = {}     # The levels of the tournament, loaded once per process
+
+
+@dataclass
+class GameResult:
+    """The outcome of one game played by a bot."""
+    bot: str                    #: The bot that played
+    level: str                  #: The level played
+    seed: int                   #: The seed of the bot's random choices
+    points: int                 #: The final points
+    moves: str                  #: The moves played
+    end_reason: str | None      #: Why the game ended (an EndReason value), or None if the bot stopped
+    seconds: float              #: How long the game took to play, including the bot's thinking
+
+
+def load_levels(paths: list[str]) -> dict[str, LevelData]:
+    """Reads every level of the tournament once.
+
+    Args:
+        paths (list[str]): The level files (text or packed).
+
+    Returns:
+        dict[str, LevelData]: The rows and maximum moves of every level, by path.
+    """
+    levels = {}
+    for path in paths:
+        grid = open_level(path)
+        levels[path] = ([''.join(row) for row in grid.level_state], grid.max_moves)
+    return levels
+
+
+def bot_moves(bot: str, game: Grid, rng: random.Random) -> Iterator[str]:
+    """Yields the moves a bot chooses, one at a time, as the game goes on.
+
+    - "random" picks any tilt.
+    - "greedy" picks the tilt that earns the most points right away, breaking ties at random.
+    - "solver" plays the best solution of the level, then stops.
+
+    Args:
+        bot (str): The bot (see BOTS).
+        game (Grid): The game being played. Each move is chosen after the previous one
+            was played on it.
+        rng (random.Random): The source of the bot's random choices.
+
+    Yields:
+        str: The next move ('f', 'b', 'l' or 'r').
+
+    Raises:
+        ValueError: If the bot is unknown.
+    """
+    if bot == "random":
+        while True:
+            yield rng.choice(MOVE_ORDER)
+    elif bot == "greedy":
+        # One scratch grid for the whole game: every tilt is applied to a copy of the
+        # game's board, the way `Solver.expand` does, instead of building a grid per move
+        scratch = CompactGrid(grid_data=(list(game._rows()), game.max_moves))
+        tilts = [Move(m) for m in MOVE_ORDER]
+        while True:
+            if isinstance(game, CompactGrid) and game.palette == scratch.palette:
+                board = bytes(game.board)
+            else:
+                scratch._load_rows(list(game._rows()))
+                board = bytes(scratch.board)
+            scratch.moves = game.moves + tilts[:1]  # Only the number of moves matters for scoring
+            scores = []
+            for move in tilts:
+                scratch.board[:] = board
+                points_change, _ = scratch._slide_to_rest(move)
+                scores.append(points_change)
+            best = max(scores)
+            yield rng.choice([m for m, score in zip(MOVE_ORDER, scores) if score == best])
+    elif bot == "solver":
+        yield from Solver(game).solve().moves
+    else:
+        raise ValueError(f"Unknown bot: {bot}")
+
+
+def play_game(bot: str, level: str, rows: list[str], max_moves: int, seed: int = 0) -> GameResult:
+    """Lets a bot play a level from start to finish, headless.
+
+    Tilts are resolved straight to their final grid with the compact engine, and the
+    game ends the way it does for a player: when there are no more eggs, or no more moves.
+
+    Args:
+        bot (str): The bot (see BOTS).
+        level (str): The name of the level.
+        rows (list[str]): The rows of the level.
+        max_moves (int): The maximum number of moves allowed.
+        seed (int): The seed of the bot's random choices.
+
+    Returns:
+        GameResult: The outcome of the game.
+    """
+    start = time.perf_counter()
+    game = Grid(grid_data=(list(rows), max_moves), filename=level, engine="compact")
+    end_reason: EndReason | None = None
+    moves = bot_moves(bot, game, random.Random(f"{bot}:{level}:{seed}"))
+    while end_reason is None:
+        if not game.is_present('🥚'):
+            end_reason = EndReason.NO_MORE_EGGS
+        elif len(game.moves) >= game.max_moves:
+            end_reason = EndReason.RAN_OUT_OF_MOVES
+        else:
+            m = next(moves, None)
+            if m is None:
+                break   # The bot chose to stop
+            game.moves.append(Move(m))
+            for _ in game.iter_roll(frames="delta", skip_intermediate=True):
+                pass
+    return GameResult(
+        bot, level, seed, game.points, ''.join(move.move_string for move in game.moves),
+        end_reason.value if end_reason else None, time.perf_counter() - start
+    )
+
+
+def run_tournament(
+        levels: dict[str, LevelData],
+        bots: tuple[str, ...] = BOTS,
+        seeds: int = 10,
+        workers: int | None = None
+) -> list[GameResult]:
+    """Plays every bot on every level with every seed, across a process pool.
+
+    Deterministic bots play each level once. The levels are sent to each worker once,
+    when it starts, and the results are returned in job order, so they do not depend
+    on the number of workers.
+
+    Args:
+        levels (dict[str, LevelData]): The levels, as returned by `load_levels`.
+        bots (tuple[str, ...]): The bots taking part.
+        seeds (int): The number of seeds each bot plays every level with.
+        workers (int | None): The number of worker processes. Defaults to one per CPU.
+            With a single worker, the games are played in this process.
+
+    Returns:
+        list[GameResult]: The outcome of every game, by bot, then level, then seed.
+
+    Raises:
+        ValueError: If a bot is unknown.
+    """
+    unknown = [bot for bot in bots if bot not in BOTS]
+    if unknown:
+        raise ValueError(f"Unknown bot: {unknown[0]}")
+    jobs = [
+        (bot, level, seed)
+        for bot in bots
+        for level in levels
+        for seed in range(1 if bot in DETERMINISTIC_BOTS else seeds)
+    ]
+    workers = max(1, workers or os.cpu_count() or 1)
+    if workers == 1:
+        _init_worker(levels)
+        return [_play_job(job) for job in jobs]
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(levels,)) as executor:
+        return list(executor.map(_play_job, jobs, chunksize=JOBS_PER_WORKER))
+
+
+def _init_worker(levels: dict[str, LevelData]) -> None:
+    """Stores the levels of the tournament in a worker process.
+
+    Args:
+        levels (dict[str, LevelData]): The levels, as returned by `load_levels`.
+    """
+    global _worker_levels
+    _worker_levels = levels
+
+
+def _play_job(job: tuple[str, str, int]) -> GameResult:
+    """Plays one game of the tournament.
+
+    Args:
+        job (tuple[str, str, int]): The bot, level and seed.
+
+    Returns:
+        GameResult: The outcome of the game.
+    """
+    bot, level, seed = job
+    rows, max_moves = _worker_levels[level]
+    return play_game(bot, level, rows, max_moves, seed)
+
+
+def summarize(results: list[GameResult]) -> list[dict[str, Any]]:
+    """Aggregates the results of each bot on each level.
+
+    Args:
+        results (list[GameResult]): The outcome of every game.
+
+    Returns:
+        list[dict[str, Any]]: For every bot and level (in the order first played): the
+        number of games, the mean, best and worst points, and how many games ended
+        because no eggs were left, because the moves ran out, or because the bot
+        stopped (the solver bot stops once it has played its solution). These three
+        counts add up to the number of games.
+    """
+    groups: dict[tuple[str, str], list[GameResult]] = {}
+    for result in results:
+        groups.setdefault((result.bot, result.level), []).append(result)
+    return [
+        {
+            "bot": bot,
+            "level": level,
+            "games": len(games),
+            "mean_points": sum(game.points for game in games) / len(games),
+            "best_points": max(game.points for game in games),
+            "worst_points": min(game.points for game in games),
+            "no_more_eggs": sum(game.end_reason == EndReason.NO_MORE_EGGS.value for game in games),
+            "ran_out_of_moves": sum(game.end_reason == EndReason.RAN_OUT_OF_MOVES.value for game in games),
+            "stopped": sum(game.end_reason is None for game in games),
+        }
+        for (bot, level), games in groups.items()
+    ]
+
+
+def summary_table(summary: list[dict[str, Any]]) -> str:
+    """Formats the summary of a tournament as a table.
+
+    Args:
+        summary (list[dict[str, Any]]): The summary returned by `summarize`.
+
+    Returns:
+        str: The formatted table.
+    """
+    headers: list[str | list[str]] = [
+        "Bot", "Level", "Games", "Mean", "Best", "Worst", "No eggs left", "Out of moves", "Stopped"
+    ]
+    data: list[list[str | int]] = [
+        [row["bot"], row["level"], row["games"], f"{row['mean_points']:.1f}", row["best_points"],
+         row["worst_points"], row["no_more_eggs"], row["ran_out_of_moves"], row["stopped"]]
+        for row in summary
+    ]
+    return create_table(data, headers, "Egg Roll Bot Tournament")
+
+
+def write_csv(results: list[GameResult], filename: str) -> None:
+    """Writes the outcome of every game as CSV, one row per game.
+
+    Args:
+        results (list[GameResult]): The outcome of every game.
+        filename (str): The CSV file to write.
+    """
+    with open(filename, "w", encoding="utf-8", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=list(GameResult.__dataclass_fields__))
+        writer.writeheader()
+        writer.writerows(asdict(result) for result in results)
+
+
+def write_json(results: list[GameResult], filename: str) -> None:
+    """Writes the summary and the outcome of every game as JSON.
+
+    Args:
+        results (list[GameResult]): The outcome of every game.
+        filename (str): The JSON file to write.
+    """
+    report = {"summary": summarize(results), "games": [asdict(result) for result in results]}
+    with open(filename, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=4, ensure_ascii=False)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Runs a tournament of bots over the given levels and prints its summary.
+
+    Args:
+        argv (list[str] | None): The command-line arguments. Defaults to sys.argv[1:].
+    """
+    parser = argparse.ArgumentParser(description="Let scripted bots play every Egg Roll level and compare them.")
+    parser.add_argument(
+        "levels", nargs="*",
+        help="level files to play (defaults to every .in file in the current directory)"
+    )
+    parser.add_argument("--bots", default=",".join(BOTS),
+                        help=f"comma-separated bots taking part (default: {','.join(BOTS)})")
+    parser.add_argument("--seeds", type=int, default=10,
+                        help="games each random bot plays on every level (default: 10)")
+    parser.add_argument("--workers", type=int, help="the number of processes (default: one per CPU)")
+    parser.add_argument("--csv", metavar="FILE", help="also write the outcome of every game as CSV")
+    parser.add_argument("--json", metavar="FILE", help="also write the summary and every game as JSON")
+    args = parser.parse_args(argv)
+
+    paths: list[str] = args.levels or sorted(str(level) for level in Path("").glob("*.in"))
+    if not paths:
+        print("[Error] No level files found.")
+        sys.exit(1)
+    if args.seeds < 1:
+        parser.error("--seeds must be at least 1")
+
+    try:
+        results = run_tournament(load_levels(paths), tuple(args.bots.split(",")), args.seeds, args.workers)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.csv:
+        write_csv(results, args.csv)
+    if args.json:
+        write_json(results, args.json)
+    print(summary_table(summarize(results)))
+
+
+if __name__ == "__main__":
+    main()